@@ -0,0 +1,3 @@
+"""
+Shared modules used by several services.
+"""
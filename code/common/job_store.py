@@ -0,0 +1,367 @@
+"""
+Job Store Module
+Storage for batch job status and results, shared by the OCR service and the
+NLP pipeline, with pluggable backends:
+- In-memory store for single-process deployments
+- SQLite store that survives restarts and can be shared between workers
+
+A job has a status record and either a single result document, replaced
+as the job progresses (save_result), or a list of result records appended
+as chunks finish (append_results). Both can be read back while the job is
+still running. Finished jobs are evicted after a TTL.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class JobStore:
+    """Base class for batch job stores."""
+    
+    name = "base"
+    
+    def __init__(self, result_ttl: int = 3600):
+        """
+        Initialize the job store.
+        
+        Args:
+            result_ttl: Seconds to keep a finished job before eviction
+        """
+        self.result_ttl = result_ttl
+    
+    def create_job(self, job_id: str, status: Dict[str, Any]):
+        """
+        Register a new job.
+        
+        Args:
+            job_id: Job identifier
+            status: Initial status record
+        """
+        raise NotImplementedError
+    
+    def update_job(self, job_id: str, **fields):
+        """
+        Update fields of a job status record.
+        
+        Setting a finished status starts the result TTL.
+        
+        Args:
+            job_id: Job identifier
+            **fields: Status fields to update
+        """
+        raise NotImplementedError
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job status record.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Status record, or None if the job is unknown or evicted
+        """
+        raise NotImplementedError
+    
+    def save_result(self, job_id: str, result: Dict[str, Any]):
+        """
+        Store the result document of a job, replacing any earlier one.
+        
+        Args:
+            job_id: Job identifier
+            result: JSON-serializable job result
+        """
+        raise NotImplementedError
+    
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the result document of a job.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Job result, or None if none has been saved
+        """
+        raise NotImplementedError
+    
+    def append_results(self, job_id: str, results: List[Dict[str, Any]]):
+        """
+        Append result records of a job.
+        
+        Args:
+            job_id: Job identifier
+            results: JSON-serializable result records in order
+        """
+        raise NotImplementedError
+    
+    def get_results(self, job_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored result records of a job.
+        
+        Args:
+            job_id: Job identifier
+            offset: Number of results to skip
+            limit: Maximum number of results (None = all)
+        
+        Returns:
+            Result records in the order they were appended
+        """
+        raise NotImplementedError
+    
+    def evict_expired(self) -> int:
+        """
+        Remove finished jobs older than the result TTL.
+        
+        Returns:
+            Number of jobs removed
+        """
+        raise NotImplementedError
+
+
+class InMemoryJobStore(JobStore):
+    """Job store kept in process memory."""
+    
+    name = "memory"
+    
+    def __init__(self, result_ttl: int = 3600, max_jobs: int = 100):
+        """
+        Initialize the in-memory store.
+        
+        Args:
+            result_ttl: Seconds to keep a finished job before eviction
+            max_jobs: Maximum number of finished jobs to keep
+        """
+        super().__init__(result_ttl)
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._documents = {}
+        self._results = {}
+        self._finished_at = OrderedDict()  # Oldest finished job first
+        self._lock = threading.Lock()
+    
+    def create_job(self, job_id: str, status: Dict[str, Any]):
+        with self._lock:
+            self._jobs[job_id] = dict(status, job_id=job_id)
+            self._results[job_id] = []
+    
+    def update_job(self, job_id: str, **fields):
+        with self._lock:
+            if job_id not in self._jobs:
+                return
+            
+            self._jobs[job_id].update(fields)
+            if fields.get('status') in FINISHED_STATUSES:
+                self._finished_at[job_id] = time.time()
+                
+                while len(self._finished_at) > self.max_jobs:
+                    evicted_id, _ = self._finished_at.popitem(last=False)
+                    self._remove(evicted_id)
+        
+        self.evict_expired()
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.evict_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def save_result(self, job_id: str, result: Dict[str, Any]):
+        with self._lock:
+            if job_id in self._jobs:
+                self._documents[job_id] = result
+    
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.evict_expired()
+        with self._lock:
+            return self._documents.get(job_id)
+    
+    def append_results(self, job_id: str, results: List[Dict[str, Any]]):
+        with self._lock:
+            if job_id in self._results:
+                self._results[job_id].extend(results)
+    
+    def get_results(self, job_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            results = self._results.get(job_id, [])
+            end = None if limit is None else offset + limit
+            return results[offset:end]
+    
+    def _remove(self, job_id: str):
+        """Remove a job and its results (caller holds the lock)."""
+        self._jobs.pop(job_id, None)
+        self._documents.pop(job_id, None)
+        self._results.pop(job_id, None)
+        self._finished_at.pop(job_id, None)
+    
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.result_ttl
+        
+        with self._lock:
+            expired = [job_id for job_id, finished in self._finished_at.items() if finished < cutoff]
+            for job_id in expired:
+                self._remove(job_id)
+        
+        return len(expired)
+
+
+class SQLiteJobStore(JobStore):
+    """Job store persisted in a SQLite database."""
+    
+    name = "sqlite"
+    
+    def __init__(self, db_path: str, result_ttl: int = 3600):
+        """
+        Initialize the SQLite store.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            result_ttl: Seconds to keep a finished job before eviction
+        """
+        super().__init__(result_ttl)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                result TEXT,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (job_id, position)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs (finished_at)")
+        self._conn.commit()
+    
+    def create_job(self, job_id: str, status: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status) VALUES (?, ?)",
+                (job_id, json.dumps(dict(status, job_id=job_id), default=str))
+            )
+            self._conn.commit()
+    
+    def update_job(self, job_id: str, **fields):
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            
+            status = json.loads(row[0])
+            status.update(fields)
+            finished_at = time.time() if fields.get('status') in FINISHED_STATUSES else None
+            
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = COALESCE(?, finished_at) WHERE job_id = ?",
+                (json.dumps(status, default=str), finished_at, job_id)
+            )
+            self._conn.commit()
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.evict_expired()
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def save_result(self, job_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET result = ? WHERE job_id = ?",
+                (json.dumps(result, default=str), job_id)
+            )
+            self._conn.commit()
+    
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.evict_expired()
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+    
+    def append_results(self, job_id: str, results: List[Dict[str, Any]]):
+        with self._lock:
+            start = self._conn.execute(
+                "SELECT COUNT(*) FROM job_results WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO job_results (job_id, position, result) VALUES (?, ?, ?)",
+                [(job_id, start + i, json.dumps(result, default=str)) for i, result in enumerate(results)]
+            )
+            self._conn.commit()
+    
+    def get_results(self, job_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM job_results WHERE job_id = ? AND position >= ? "
+                "ORDER BY position LIMIT ?",
+                (job_id, offset, -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.result_ttl
+        
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM job_results WHERE job_id IN (SELECT job_id FROM jobs WHERE finished_at < ?)",
+                (cutoff,)
+            )
+            cursor = self._conn.execute("DELETE FROM jobs WHERE finished_at < ?", (cutoff,))
+            self._conn.commit()
+        
+        if cursor.rowcount:
+            logger.debug(f"Evicted {cursor.rowcount} expired batch jobs")
+        return cursor.rowcount
+
+
+def create_job_store(store_config: Dict[str, Any]) -> JobStore:
+    """
+    Create a job store from a service's job store configuration.
+    
+    Args:
+        store_config: Job store configuration dictionary ('backend',
+            'sqlite_path', 'result_ttl', 'max_jobs')
+    
+    Returns:
+        Job store instance
+    """
+    backend = store_config.get('backend', 'memory')
+    
+    if backend == 'sqlite':
+        db_path = store_config.get('sqlite_path', 'jobs.db')
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        return SQLiteJobStore(
+            db_path,
+            result_ttl=store_config.get('result_ttl', 3600)
+        )
+    
+    if backend == 'memory':
+        return InMemoryJobStore(
+            result_ttl=store_config.get('result_ttl', 3600),
+            max_jobs=store_config.get('max_jobs', 100)
+        )
+    
+    raise ValueError(f"Unsupported job store backend: {backend}")
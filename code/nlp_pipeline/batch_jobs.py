@@ -0,0 +1,183 @@
+"""
+Batch Jobs Module
+Runs batch processing jobs in a worker pool off the event loop. Texts are
+processed in chunks; after each chunk the results are appended to the job
+store and the job progress is updated, and cancellation requests are honoured.
+"""
+
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+
+class BatchJobManager:
+    """
+    Executor for chunked batch jobs.
+    
+    The process function receives a chunk of texts, the requested tasks and
+    the job's language hint (None to detect per text), and must return one JSON-serializable result per text in the same order.
+    """
+    
+    def __init__(self, store: JobStore, process_fn: Callable[[List[str], List[str], Optional[str]], List[Dict[str, Any]]],
+                 chunk_size: int = 32, max_workers: int = 2):
+        """
+        Initialize the job manager.
+        
+        Args:
+            store: Job store for status and results
+            process_fn: Function processing a chunk of texts
+            chunk_size: Texts processed between progress updates
+            max_workers: Jobs processed concurrently
+        """
+        self.store = store
+        self.process_fn = process_fn
+        self.chunk_size = max(1, chunk_size)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-job")
+        self._futures = {}
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, texts: List[str], tasks: List[str], language: Optional[str] = None) -> str:
+        """
+        Queue a batch job.
+        
+        Args:
+            texts: Texts to process
+            tasks: Tasks to perform on each text
+            language: Language code of all texts (auto-detect if None)
+        
+        Returns:
+            Job identifier
+        """
+        job_id = f"batch_{uuid.uuid4().hex}"
+        self.store.create_job(job_id, {
+            'status': 'queued',
+            'tasks': tasks,
+            'language': language,
+            'total': len(texts),
+            'processed': 0,
+            'progress': 0.0,
+            'created_at': datetime.now().isoformat()
+        })
+        
+        with self._lock:
+            self._cancel_events[job_id] = threading.Event()
+            future = self._executor.submit(self._run, job_id, texts, tasks, language)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        
+        return job_id
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+        
+        A running job stops after its current chunk; results of the chunks
+        already processed are kept.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            False if the job is not active in this process
+        """
+        with self._lock:
+            cancel_event = self._cancel_events.get(job_id)
+            future = self._futures.get(job_id)
+        if cancel_event is None:
+            return False
+        
+        cancel_event.set()
+        if future is not None and future.cancel():
+            # Never started, so the worker will not record the cancellation
+            self.store.update_job(job_id, status='cancelled', completed_at=datetime.now().isoformat())
+        
+        logger.info(f"Cancellation requested for batch job {job_id}")
+        return True
+    
+    def active_jobs(self) -> int:
+        """Get the number of queued and running jobs."""
+        with self._lock:
+            return len(self._futures)
+    
+    def _forget(self, job_id: str):
+        """Drop the bookkeeping of a finished job."""
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+    
+    def _run(self, job_id: str, texts: List[str], tasks: List[str], language: Optional[str]):
+        """Process a job chunk by chunk (runs in the worker pool)."""
+        cancel_event = self._cancel_events[job_id]
+        start_time = time.time()
+        processed = 0
+        
+        self.store.update_job(job_id, status='processing', started_at=datetime.now().isoformat())
+        logger.info(f"Starting batch job {job_id} with {len(texts)} texts")
+        
+        try:
+            for start in range(0, len(texts), self.chunk_size):
+                if cancel_event.is_set():
+                    self.store.update_job(
+                        job_id,
+                        status='cancelled',
+                        processing_time=time.time() - start_time,
+                        completed_at=datetime.now().isoformat()
+                    )
+                    logger.info(f"Batch job {job_id} cancelled after {processed}/{len(texts)} texts")
+                    return
+                
+                chunk = texts[start:start + self.chunk_size]
+                chunk_results = self.process_fn(chunk, tasks, language)
+                
+                self.store.append_results(job_id, [
+                    {
+                        'text_index': start + i,
+                        'text_length': len(text),
+                        'results': result
+                    }
+                    for i, (text, result) in enumerate(zip(chunk, chunk_results))
+                ])
+                
+                processed += len(chunk)
+                self.store.update_job(
+                    job_id,
+                    processed=processed,
+                    progress=processed / len(texts)
+                )
+            
+            self.store.update_job(
+                job_id,
+                status='completed',
+                progress=1.0,
+                processing_time=time.time() - start_time,
+                completed_at=datetime.now().isoformat()
+            )
+            logger.info(f"Batch job {job_id} completed in {time.time() - start_time:.2f}s")
+        
+        except Exception as e:
+            logger.error(f"Batch job {job_id} failed: {e}")
+            self.store.update_job(
+                job_id,
+                status='failed',
+                error_message=str(e),
+                processing_time=time.time() - start_time,
+                completed_at=datetime.now().isoformat()
+            )
+    
+    def shutdown(self):
+        """Cancel active jobs and stop the worker pool."""
+        with self._lock:
+            job_ids = list(self._futures)
+        for job_id in job_ids:
+            self.cancel(job_id)
+        
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,203 @@
+"""
+Micro-batching Module
+Coalesces concurrent single-text inference requests into batched model calls.
+Requests are queued and grouped until the batch is full or the oldest request
+has waited for the latency deadline, then run as one call and the results are
+fanned back out to the waiting requests.
+"""
+
+import time
+import asyncio
+import logging
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """A queued input waiting for its batch."""
+    
+    __slots__ = ('text', 'future', 'enqueued_at')
+    
+    def __init__(self, text: str, future: asyncio.Future):
+        self.text = text
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Request-coalescing layer in front of a batch inference function.
+    
+    The batch function receives a list of texts and must return one result
+    per text in the same order. It runs in a dedicated thread so the event
+    loop keeps accepting requests while a batch is being processed.
+    """
+    
+    def __init__(self, name: str, batch_fn: Callable[[List[str]], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 10.0,
+                 sort_by_length: bool = True, window: int = 1000):
+        """
+        Initialize the batcher.
+        
+        Args:
+            name: Name used in logs and metrics
+            batch_fn: Function running inference on a list of texts
+            max_batch_size: Maximum texts per batch (1 disables coalescing)
+            max_wait_ms: Maximum time the oldest request waits for a batch to fill
+            sort_by_length: Pass texts sorted by length to reduce padding
+            window: Number of recent requests kept for wait time percentiles
+        """
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.sort_by_length = sort_by_length
+        
+        self._pending = deque()
+        self._item_added = None
+        self._worker = None
+        self._loop = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batcher-{name}")
+        
+        # Metrics
+        self._batch_sizes = Counter()
+        self._queue_waits = deque(maxlen=window)
+        self._inference_times = deque(maxlen=window)
+        self._requests = 0
+        self._errors = 0
+    
+    def _ensure_worker(self):
+        """Start the batching worker on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._item_added = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+    
+    async def submit(self, text: str) -> Any:
+        """
+        Queue a text for inference and wait for its result.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Result of the batch function for this text
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._requests += 1
+        self._pending.append(_PendingRequest(text, future))
+        self._item_added.set()
+        return await future
+    
+    async def _run(self):
+        """Form batches from the queue until cancelled."""
+        while True:
+            while not self._pending:
+                self._item_added.clear()
+                await self._item_added.wait()
+            
+            # Wait for the batch to fill until the oldest request's deadline
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                self._item_added.clear()
+                try:
+                    await asyncio.wait_for(self._item_added.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            
+            batch_size = min(len(self._pending), self.max_batch_size)
+            await self._process([self._pending.popleft() for _ in range(batch_size)])
+    
+    async def _process(self, batch: List[_PendingRequest]):
+        """Run one batch and deliver the results."""
+        # Requests whose caller went away are dropped
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+        
+        started = time.monotonic()
+        for request in batch:
+            self._queue_waits.append(started - request.enqueued_at)
+        self._batch_sizes[len(batch)] += 1
+        
+        if self.sort_by_length:
+            batch.sort(key=lambda request: len(request.text))
+        
+        try:
+            results = await self._loop.run_in_executor(
+                self._executor, self.batch_fn, [request.text for request in batch]
+            )
+        except Exception as e:
+            logger.error(f"Batch inference error in {self.name}: {e}")
+            self._errors += 1
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._inference_times.append(time.monotonic() - started)
+        
+        for request, result in zip(batch, results):
+            if not request.future.done():
+                request.future.set_result(result)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get batching metrics.
+        
+        Returns:
+            Request and batch counts, batch size histogram, queue wait and
+            inference time statistics in milliseconds
+        """
+        waits = np.array(self._queue_waits) * 1000
+        inference_times = np.array(self._inference_times) * 1000
+        batches = sum(self._batch_sizes.values())
+        
+        return {
+            'requests': self._requests,
+            'batches': batches,
+            'errors': self._errors,
+            'queue_depth': len(self._pending),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'mean_batch_size': (
+                sum(size * count for size, count in self._batch_sizes.items()) / batches if batches else 0.0
+            ),
+            'batch_size_histogram': {str(size): count for size, count in sorted(self._batch_sizes.items())},
+            'queue_wait_ms': {
+                'mean': float(waits.mean()) if waits.size else 0.0,
+                'p50': float(np.percentile(waits, 50)) if waits.size else 0.0,
+                'p95': float(np.percentile(waits, 95)) if waits.size else 0.0,
+                'max': float(waits.max()) if waits.size else 0.0
+            },
+            'inference_ms': {
+                'mean': float(inference_times.mean()) if inference_times.size else 0.0,
+                'p95': float(np.percentile(inference_times, 95)) if inference_times.size else 0.0
+            }
+        }
+    
+    async def close(self):
+        """Stop the worker and fail requests that are still queued."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        
+        while self._pending:
+            request = self._pending.popleft()
+            if not request.future.done():
+                request.future.set_exception(RuntimeError(f"{self.name} batcher was closed"))
+        
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,323 @@
+"""
+NLP Pipeline Benchmarks
+
+Command-line benchmarks for performance-sensitive parts of the NLP pipeline.
+
+Usage:
+    python benchmark.py patterns [--files a.txt b.txt ...] [--size-mb 1.0] [--repeat 3]
+    python benchmark.py backends [--task text|ner] [--data sample.csv] [--backends pytorch quantized onnx]
+    python benchmark.py dataframe [--rows 10000 100000 1000000] [--language en] [--chunk-size 10000]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from entity_extractor import EntityExtractor
+
+
+SAMPLE_LINES = [
+    "INVOICE #10482 Date: 03/14/2024 Due: 2024-04-13",
+    "Bill To: Acme Corporation, 123 Main Street, Springfield",
+    "Contact: john.doe@example.com Phone: (555) 123-4567",
+    "Item Qty Unit Price Amount",
+    "Consulting services 12 150.00 1800.00",
+    "Subtotal $1,800.00 Tax EUR 144.00",
+    "Total amount due: $1,944.00 (USD 1944)",
+    "Payment terms: net 30, Monday through Friday",
+    "Remit to 45 Harbor Blvd Suite 300, call +44 2071234567",
+    "Annual contract value 2.5 million payable on March 3, 2024",
+]
+
+
+def make_ocr_text(size_mb: float, seed: int = 0) -> str:
+    """
+    Build synthetic OCR output of roughly the given size.
+    
+    Args:
+        size_mb: Target size in megabytes
+        seed: Random seed
+    
+    Returns:
+        Text with invoice-like lines and OCR-style character noise
+    """
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    lines = []
+    size = 0
+    
+    while size < target:
+        line = rng.choice(SAMPLE_LINES)
+        if rng.random() < 0.2:
+            # Typical OCR confusions
+            line = line.replace('l', '1').replace('O', '0')
+        lines.append(line)
+        size += len(line) + 1
+    
+    return '\n'.join(lines)
+
+
+def legacy_extract_patterns(extractor: EntityExtractor, text: str) -> List[Dict[str, Any]]:
+    """Pattern extraction as done before the compiled matcher (one re.finditer per raw pattern)."""
+    entities = []
+    for entity_type, patterns in extractor.custom_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                if extractor._validate_entity(match.group(), entity_type):
+                    entities.append({
+                        'text': match.group(),
+                        'label': entity_type,
+                        'start': match.start(),
+                        'end': match.end(),
+                        'confidence': 0.9,
+                        'source': 'pattern'
+                    })
+    return entities
+
+
+def benchmark_patterns(args):
+    """Compare legacy per-pattern scanning with the compiled pattern matcher."""
+    if args.files:
+        texts = []
+        for path in args.files:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                texts.append(f.read())
+        text = '\n'.join(texts)
+    else:
+        text = make_ocr_text(args.size_mb)
+    
+    extractor = EntityExtractor()
+    
+    expected = legacy_extract_patterns(extractor, text)
+    actual = extractor.extract_entities_patterns(text)
+    if actual != expected:
+        print(f"WARNING: matcher found {len(actual)} entities, legacy scan found {len(expected)}")
+    
+    print(f"Benchmarking {len(text) / (1024 * 1024):.2f} MB of text, "
+          f"{len(extractor.pattern_matcher)} patterns, {len(expected)} entities")
+    print(f"{'method':<38}{'best (s)':>10}{'MB/s':>8}")
+    
+    def legacy_document():
+        # extract_all_entities used to scan three times (entities, dates, amounts)
+        for _ in range(3):
+            legacy_extract_patterns(extractor, text)
+    
+    cases = [
+        ('legacy scan', lambda: legacy_extract_patterns(extractor, text)),
+        ('compiled scan (shared per document)', lambda: extractor.extract_entities_patterns(text)),
+        ('legacy per document (3 scans)', legacy_document),
+    ]
+    
+    megabytes = len(text) / (1024 * 1024)
+    for name, run in cases:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{name:<38}{best:>10.3f}{megabytes / best:>8.2f}")
+
+
+def make_export_dataframe(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic export with one short OCR text per row.
+    
+    Args:
+        rows: Number of rows
+        seed: Random seed
+    
+    Returns:
+        DataFrame with 'id' and 'text' columns
+    """
+    rng = random.Random(seed)
+    texts = [' '.join(rng.sample(SAMPLE_LINES, 2)) for _ in range(rows)]
+    return pd.DataFrame({'id': np.arange(rows), 'text': texts})
+
+
+def legacy_extract_from_dataframe(extractor: EntityExtractor, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+    """DataFrame extraction as done before the columnar path (row dictionaries via iterrows)."""
+    results = []
+    texts = [str(text) for text in df[text_column]]
+    all_entities = extractor.extract_all_entities_batch(texts)
+    
+    for (idx, row), entities in zip(df.iterrows(), all_entities):
+        result_row = row.to_dict()
+        for entity_type, entity_list in entities.items():
+            result_row[f'{entity_type}_count'] = len(entity_list)
+            # Dates and amounts carry 'original_text' (the old code raised KeyError on them)
+            result_row[f'{entity_type}_text'] = ', '.join(e.get('text', e.get('original_text')) for e in entity_list)
+        results.append(result_row)
+    
+    return pd.DataFrame(results)
+
+
+def benchmark_dataframe(args):
+    """Compare row-by-row and columnar DataFrame entity extraction."""
+    extractor = EntityExtractor()
+    
+    print(f"{'rows':>10}{'legacy (s)':>12}{'columnar (s)':>14}{'+language (s)':>15}{'rows/s':>10}")
+    
+    for rows in args.rows:
+        df = make_export_dataframe(rows)
+        
+        legacy_time = None
+        if rows <= args.legacy_max_rows:
+            start = time.perf_counter()
+            expected = legacy_extract_from_dataframe(extractor, df, 'text')
+            legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        actual = extractor.extract_from_dataframe(df, 'text', chunk_size=args.chunk_size)
+        columnar_time = time.perf_counter() - start
+        
+        if legacy_time is not None and not actual.reset_index(drop=True).equals(expected[actual.columns]):
+            print(f"WARNING: columnar result differs from the legacy result at {rows} rows")
+        
+        start = time.perf_counter()
+        extractor.extract_from_dataframe(df, 'text', language=args.language, chunk_size=args.chunk_size)
+        language_time = time.perf_counter() - start
+        
+        legacy = f"{legacy_time:.2f}" if legacy_time is not None else '-'
+        print(f"{rows:>10}{legacy:>12}{columnar_time:>14.2f}{language_time:>15.2f}{rows / language_time:>10.0f}")
+
+
+def load_labelled_sample(path: str, text_column: str, label_column: str) -> Tuple[List[str], Optional[List[str]]]:
+    """
+    Load a labelled sample from a CSV file.
+    
+    Args:
+        path: CSV file path
+        text_column: Column with the input texts
+        label_column: Column with the expected labels (optional in the file)
+        
+    Returns:
+        Tuple of (texts, labels or None)
+    """
+    df = pd.read_csv(path)
+    texts = df[text_column].astype(str).tolist()
+    labels = df[label_column].astype(str).tolist() if label_column in df.columns else None
+    return texts, labels
+
+
+def entity_f1(predicted: List[set], reference: List[set]) -> float:
+    """Micro F1 of predicted entity sets against reference entity sets."""
+    true_positives = sum(len(p & r) for p, r in zip(predicted, reference))
+    false_positives = sum(len(p - r) for p, r in zip(predicted, reference))
+    false_negatives = sum(len(r - p) for p, r in zip(predicted, reference))
+    total = 2 * true_positives + false_positives + false_negatives
+    return 2 * true_positives / total if total else 1.0
+
+
+def benchmark_backends(args):
+    """Compare accuracy and throughput of the transformer inference backends."""
+    from classifier import TextClassifier, AdvancedEntityClassifier
+    from model_registry import ModelRegistry
+    
+    if args.data:
+        texts, labels = load_labelled_sample(args.data, args.text_column, args.label_column)
+    else:
+        texts, labels = SAMPLE_LINES * 10, None
+    
+    print(f"Benchmarking {args.task} backends on {len(texts)} texts, batch size {args.batch_size}")
+    print(f"Agreement is measured against the '{args.backends[0]}' backend"
+          f"{' (entity F1)' if args.task == 'ner' else ''}")
+    print(f"{'backend':<12}{'load (s)':>10}{'texts/s':>10}{'accuracy':>10}{'agreement':>11}")
+    
+    reference = None
+    for backend in args.backends:
+        # A separate registry per backend so models are not shared between runs
+        registry = ModelRegistry()
+        if args.task == 'text':
+            classifier = TextClassifier(
+                args.model or 'distilbert-base-uncased', args.num_labels, registry=registry,
+                backend=backend, onnx_cache_dir=args.onnx_cache_dir
+            )
+            run_batch = lambda batch: [r['predicted_label'] for r in classifier.classify_batch(batch, len(batch))]
+        else:
+            classifier = AdvancedEntityClassifier(
+                args.model or 'dbmdz/bert-large-cased-finetuned-conll03-english', registry=registry,
+                backend=backend, onnx_cache_dir=args.onnx_cache_dir
+            )
+            run_batch = lambda batch: [
+                {(e['start'], e['end'], e['entity_group']) for e in entities}
+                for entities in classifier.classify_entities_batch(batch)
+            ]
+        
+        start = time.perf_counter()
+        registry.get(classifier.model_key)
+        load_time = time.perf_counter() - start
+        
+        # Warm up before timing
+        run_batch(texts[:args.batch_size])
+        
+        predictions = []
+        start = time.perf_counter()
+        for i in range(0, len(texts), args.batch_size):
+            predictions.extend(run_batch(texts[i:i + args.batch_size]))
+        throughput = len(texts) / (time.perf_counter() - start)
+        
+        accuracy = '-'
+        if labels and args.task == 'text':
+            accuracy = f"{np.mean([p == l for p, l in zip(predictions, labels)]):.3f}"
+        
+        if reference is None:
+            reference = predictions
+        if args.task == 'text':
+            agreement = np.mean([p == r for p, r in zip(predictions, reference)])
+        else:
+            agreement = entity_f1(predictions, reference)
+        
+        print(f"{backend:<12}{load_time:>10.2f}{throughput:>10.1f}{accuracy:>10}{agreement:>11.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NLP pipeline benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    patterns_parser = subparsers.add_parser("patterns", help="Compare entity pattern scanning speed")
+    patterns_parser.add_argument("--files", nargs="*", help="OCR text files (synthetic text if omitted)")
+    patterns_parser.add_argument("--size-mb", type=float, default=1.0, help="Size of the synthetic text")
+    patterns_parser.add_argument("--repeat", type=int, default=3, help="Runs per method (best is reported)")
+    patterns_parser.set_defaults(func=benchmark_patterns)
+    
+    backends_parser = subparsers.add_parser("backends", help="Compare transformer inference backends")
+    backends_parser.add_argument("--task", choices=["text", "ner"], default="text",
+                                 help="Text classification or named entity recognition model")
+    backends_parser.add_argument("--data", help="CSV sample (synthetic unlabelled texts if omitted)")
+    backends_parser.add_argument("--text-column", default="text", help="CSV column with texts")
+    backends_parser.add_argument("--label-column", default="label",
+                                 help="CSV column with expected model labels (text task)")
+    backends_parser.add_argument("--model", help="Model name or path (configured default if omitted)")
+    backends_parser.add_argument("--num-labels", type=int, default=2, help="Labels of the text classifier")
+    backends_parser.add_argument("--backends", nargs="+", default=["pytorch", "quantized", "onnx"],
+                                 help="Backends to compare, the first is the agreement reference")
+    backends_parser.add_argument("--batch-size", type=int, default=16, help="Texts per forward pass")
+    backends_parser.add_argument("--onnx-cache-dir", help="Directory for exported ONNX models")
+    backends_parser.set_defaults(func=benchmark_backends)
+    
+    dataframe_parser = subparsers.add_parser("dataframe", help="Compare DataFrame entity extraction speed")
+    dataframe_parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000],
+                                  help="DataFrame sizes to benchmark")
+    dataframe_parser.add_argument("--legacy-max-rows", type=int, default=100000,
+                                  help="Largest size also run through the row-by-row path")
+    dataframe_parser.add_argument("--language", default="en",
+                                  help="Language passed to the columnar path instead of per-row detection")
+    dataframe_parser.add_argument("--chunk-size", type=int, default=10000, help="Rows processed at a time")
+    dataframe_parser.set_defaults(func=benchmark_dataframe)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,91 @@ import pandas as pd
 from sklearn.metrics import classification_report, confusion_matrix
 import logging
 from datetime import datetime
+import os
 import json
 import re
+import asyncio
+import tempfile
+from functools import partial
+
+from batching import MicroBatcher
+from model_registry import ModelRegistry, get_registry
+
+# Optional imports for the ONNX Runtime backend
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForTokenClassification
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    ORTModelForSequenceClassification = None
+    ORTModelForTokenClassification = None
 
 logger = logging.getLogger(__name__)
 
+INFERENCE_BACKENDS = ('pytorch', 'quantized', 'onnx')
+
+
+def load_inference_model(model_name: str, task: str, backend: str = 'pytorch',
+                         onnx_cache_dir: str = None, **model_kwargs):
+    """
+    Load a transformer model with the selected inference backend.
+    
+    Args:
+        model_name: Pre-trained model name or path
+        task: 'sequence-classification' or 'token-classification'
+        backend: 'pytorch' (fp32), 'quantized' (dynamic int8 Linear layers, CPU only)
+            or 'onnx' (ONNX Runtime, falls back to 'pytorch' if optimum is not installed)
+        onnx_cache_dir: Directory where exported ONNX models are kept between restarts
+        **model_kwargs: Extra from_pretrained arguments (e.g. num_labels)
+        
+    Returns:
+        Model usable with a transformers pipeline
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unsupported inference backend: {backend}")
+    
+    if task == 'sequence-classification':
+        auto_class, ort_class = AutoModelForSequenceClassification, ORTModelForSequenceClassification
+    else:
+        auto_class, ort_class = AutoModelForTokenClassification, ORTModelForTokenClassification
+    
+    if backend == 'onnx':
+        if ONNX_AVAILABLE:
+            return _load_onnx_model(model_name, auto_class, ort_class, onnx_cache_dir, **model_kwargs)
+        logger.warning("optimum[onnxruntime] is not installed. Falling back to pytorch backend.")
+        backend = 'pytorch'
+    
+    model = auto_class.from_pretrained(model_name, **model_kwargs)
+    
+    if backend == 'quantized':
+        # Weights of Linear layers are stored as int8, activations are quantized on the fly
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    
+    model.eval()
+    return model
+
+
+def _load_onnx_model(model_name: str, auto_class, ort_class, onnx_cache_dir: str = None, **model_kwargs):
+    """Load an exported ONNX model from the cache, exporting it on first use."""
+    cache_name = re.sub(r'[^\w.-]', '_', model_name)
+    if model_kwargs:
+        cache_name += '_' + '_'.join(f"{key}-{value}" for key, value in sorted(model_kwargs.items()))
+    export_dir = os.path.join(onnx_cache_dir or os.path.join(tempfile.gettempdir(), 'nlp_pipeline_onnx'), cache_name)
+    
+    if os.path.exists(os.path.join(export_dir, 'model.onnx')):
+        return ort_class.from_pretrained(export_dir)
+    
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+    
+    # Export from the PyTorch model so arguments like num_labels are applied
+    model = auto_class.from_pretrained(model_name, **model_kwargs)
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        model.save_pretrained(checkpoint_dir)
+        ort_model = ort_class.from_pretrained(checkpoint_dir, export=True)
+        ort_model.save_pretrained(export_dir)
+    
+    return ort_model
+
 
 class TextClassifier:
     """
@@ -28,47 +108,88 @@ class TextClassifier:
     Supports custom classification tasks and fine-tuning.
     """
     
-    def __init__(self, model_name: str = "distilbert-base-uncased", num_labels: int = 2):
+    def __init__(self, model_name: str = "distilbert-base-uncased", num_labels: int = 2,
+                 registry: ModelRegistry = None, max_batch_size: int = 16, max_wait_ms: float = 10.0,
+                 backend: str = 'pytorch', onnx_cache_dir: str = None):
         """
         Initialize the TextClassifier.
         
+        The model is loaded on first use and shared with other classifiers
+        using the same model and number of labels.
+        
         Args:
             model_name: Pre-trained model name or path
             num_labels: Number of classification labels
+            registry: Model registry (defaults to the process-wide registry)
+            max_batch_size: Maximum concurrent requests coalesced by classify_text_async
+            max_wait_ms: Maximum time a request waits for its batch to fill
+            backend: Inference backend ('pytorch', 'quantized' or 'onnx')
+            onnx_cache_dir: Directory for exported ONNX models
+            
+        Raises:
+            ValueError: If the backend is not supported
         """
+        # Models load lazily, so check the backend before the first request does
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unsupported inference backend: {backend}")
+        
         self.model_name = model_name
         self.num_labels = num_labels
-        self.tokenizer = None
-        self.model = None
-        self.classifier_pipeline = None
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.backend = backend
+        self.onnx_cache_dir = onnx_cache_dir
+        # Quantized and ONNX models run on the CPU
+        use_cuda = torch.cuda.is_available() and backend == 'pytorch'
+        self.device = torch.device('cuda' if use_cuda else 'cpu')
+        self.registry = registry or get_registry()
+        self.model_key = f"text-classifier:{model_name}:{num_labels}:{backend}"
         
         logger.info(f"Initializing classifier with model: {model_name}")
-        self._load_model()
+        self.registry.register(self.model_key, self._load_model, evictable=False)
+        
+        self.batcher = MicroBatcher(
+            "text_classifier",
+            lambda texts: self.classify_batch(texts, batch_size=len(texts)),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
     
-    def _load_model(self):
+    def _load_model(self) -> Dict[str, Any]:
         """Load the pre-trained model and tokenizer."""
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                self.model_name, num_labels=self.num_labels
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = load_inference_model(
+                self.model_name, 'sequence-classification', self.backend,
+                onnx_cache_dir=self.onnx_cache_dir, num_labels=self.num_labels
             )
-            self.model.to(self.device)
+            model.to(self.device)
             
             # Create pipeline for easy inference
-            self.classifier_pipeline = pipeline(
+            classifier_pipeline = pipeline(
                 "text-classification",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                device=0 if torch.cuda.is_available() else -1
+                model=model,
+                tokenizer=tokenizer,
+                device=0 if self.device.type == 'cuda' else -1
             )
             
-            logger.info(f"Model loaded successfully on {self.device}")
+            logger.info(f"Model loaded successfully on {self.device} ({self.backend} backend)")
+            return {'tokenizer': tokenizer, 'model': model, 'pipeline': classifier_pipeline}
             
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
     
+    @property
+    def tokenizer(self):
+        return self.registry.get(self.model_key)['tokenizer']
+    
+    @property
+    def model(self):
+        return self.registry.get(self.model_key)['model']
+    
+    @property
+    def classifier_pipeline(self):
+        return self.registry.get(self.model_key)['pipeline']
+    
     def classify_text(self, text: str) -> Dict[str, Any]:
         """
         Classify a single text.
@@ -105,6 +226,18 @@ class TextClassifier:
                 'error': str(e)
             }
     
+    async def classify_text_async(self, text: str) -> Dict[str, Any]:
+        """
+        Classify a single text, batched with concurrent requests.
+        
+        Args:
+            text: Input text to classify
+            
+        Returns:
+            Classification result with labels and probabilities
+        """
+        return await self.batcher.submit(text)
+    
     def classify_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
         """
         Classify multiple texts in batches.
@@ -122,7 +255,7 @@ class TextClassifier:
             batch = texts[i:i + batch_size]
             
             try:
-                batch_results = self.classifier_pipeline(batch)
+                batch_results = self.classifier_pipeline(batch, batch_size=len(batch))
                 
                 for text, result in zip(batch, batch_results):
                     if isinstance(result, list):
@@ -248,48 +381,103 @@ class AdvancedEntityClassifier:
     Advanced entity classification using Named Entity Recognition models.
     """
     
-    def __init__(self, model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english"):
+    def __init__(self, model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english",
+                 registry: ModelRegistry = None, max_batch_size: int = 16, max_wait_ms: float = 10.0,
+                 backend: str = 'pytorch', onnx_cache_dir: str = None,
+                 window_overlap: int = 128, window_batch_size: int = 16, max_length: int = 512):
         """
         Initialize the AdvancedEntityClassifier.
         
+        The model is loaded on first use and shared through the model registry.
+        Texts longer than the model's maximum sequence length are split into
+        overlapping token windows instead of being truncated.
+        
         Args:
             model_name: Pre-trained NER model name
+            registry: Model registry (defaults to the process-wide registry)
+            max_batch_size: Maximum concurrent requests coalesced by classify_entities_async
+            max_wait_ms: Maximum time a request waits for its batch to fill
+            backend: Inference backend ('pytorch', 'quantized' or 'onnx')
+            onnx_cache_dir: Directory for exported ONNX models
+            window_overlap: Tokens shared by consecutive windows of long texts (0 = truncate)
+            window_batch_size: Windows per forward pass
+            max_length: Maximum sequence length of the model, the window size
+            
+        Raises:
+            ValueError: If the backend is not supported or the window overlap
+                is not below half of max_length
         """
-        self.model_name = model_name
-        self.tokenizer = None
-        self.model = None
-        self.ner_pipeline = None
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        # Models load lazily, so check the settings before the first request does
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unsupported inference backend: {backend}")
+        if not 0 <= window_overlap < max_length // 2:
+            raise ValueError(f"NER window overlap must be between 0 and {max_length // 2 - 1} "
+                             f"for {max_length}-token windows, got {window_overlap}")
         
-        self._load_model()
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_cache_dir = onnx_cache_dir
+        self.window_overlap = window_overlap
+        self.window_batch_size = window_batch_size
+        # Quantized and ONNX models run on the CPU
+        use_cuda = torch.cuda.is_available() and backend == 'pytorch'
+        self.device = torch.device('cuda' if use_cuda else 'cpu')
+        self.registry = registry or get_registry()
+        self.model_key = f"ner:{model_name}:{backend}"
+        
+        self.registry.register(self.model_key, self._load_model, evictable=False)
+        
+        self.batcher = MicroBatcher(
+            "entity_classifier",
+            self.classify_entities_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
     
-    def _load_model(self):
+    def _load_model(self) -> Dict[str, Any]:
         """Load the NER model and tokenizer."""
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
-            self.model.to(self.device)
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = load_inference_model(
+                self.model_name, 'token-classification', self.backend,
+                onnx_cache_dir=self.onnx_cache_dir
+            )
+            model.to(self.device)
             
-            self.ner_pipeline = pipeline(
+            ner_pipeline = pipeline(
                 "ner",
-                model=self.model,
-                tokenizer=self.tokenizer,
+                model=model,
+                tokenizer=tokenizer,
                 aggregation_strategy="simple",
-                device=0 if torch.cuda.is_available() else -1
+                device=0 if self.device.type == 'cuda' else -1
             )
             
-            logger.info(f"NER model loaded successfully")
+            logger.info(f"NER model loaded successfully ({self.backend} backend)")
+            return {'tokenizer': tokenizer, 'model': model, 'pipeline': ner_pipeline}
             
         except Exception as e:
             logger.error(f"Error loading NER model: {e}")
             # Fallback to simple pipeline
             try:
-                self.ner_pipeline = pipeline("ner", aggregation_strategy="simple")
+                ner_pipeline = pipeline("ner", aggregation_strategy="simple")
                 logger.info("Loaded fallback NER pipeline")
+                return {'tokenizer': None, 'model': None, 'pipeline': ner_pipeline}
             except Exception as e2:
                 logger.error(f"Could not load any NER model: {e2}")
                 raise
     
+    @property
+    def tokenizer(self):
+        return self.registry.get(self.model_key)['tokenizer']
+    
+    @property
+    def model(self):
+        return self.registry.get(self.model_key)['model']
+    
+    @property
+    def ner_pipeline(self):
+        return self.registry.get(self.model_key)['pipeline']
+    
     def classify_entities(self, text: str) -> List[Dict[str, Any]]:
         """
         Classify entities in the text.
@@ -304,30 +492,104 @@ class AdvancedEntityClassifier:
             raise ValueError("NER model not loaded")
         
         try:
-            entities = self.ner_pipeline(text)
-            
-            results = []
-            for entity in entities:
-                results.append({
-                    'word': entity['word'],
-                    'entity_group': entity['entity_group'],
-                    'score': entity['score'],
-                    'start': entity['start'],
-                    'end': entity['end']
-                })
-            
-            return results
+            entities = self.ner_pipeline(text, **self._pipeline_kwargs(self.window_batch_size))
+            return self._format_entities(entities)
             
         except Exception as e:
             logger.error(f"Entity classification error: {e}")
             return []
     
-    def extract_sensitive_information(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+    def classify_entities_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Classify entities in several texts with batched forward passes.
+        
+        If the batched call fails, each text is classified on its own so
+        the failure is confined to the texts that cause it.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            List of classified entities per text
+        """
+        if not self.ner_pipeline:
+            raise ValueError("NER model not loaded")
+        
+        try:
+            batch_size = max(len(texts), self.window_batch_size)
+            batch_entities = self.ner_pipeline(texts, **self._pipeline_kwargs(batch_size))
+            return [self._format_entities(entities) for entities in batch_entities]
+            
+        except Exception as e:
+            # One bad text must not blank the results of the whole batch
+            logger.error(f"Batch entity classification error, retrying per text: {e}")
+            return [self.classify_entities(text) for text in texts]
+    
+    async def classify_entities_async(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Classify entities in the text, batched with concurrent requests.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            List of classified entities with confidence scores
+        """
+        return await self.batcher.submit(text)
+    
+    def _pipeline_kwargs(self, batch_size: int) -> Dict[str, Any]:
+        """
+        Get NER pipeline call arguments.
+        
+        With a stride the pipeline tokenizes long texts into overlapping
+        windows of the model's maximum length, runs the windows in batches and
+        merges entities found in several windows, keeping offsets relative to
+        the whole text.
+        
+        Args:
+            batch_size: Windows per forward pass
+            
+        Returns:
+            Keyword arguments for the pipeline call
+        """
+        kwargs = {'batch_size': batch_size}
+        if not self.window_overlap:
+            return kwargs
+        
+        tokenizer = self.ner_pipeline.tokenizer
+        if not tokenizer.is_fast:
+            logger.warning("NER tokenizer has no offset mapping, long texts are truncated")
+        elif self.window_overlap >= tokenizer.model_max_length // 2:
+            logger.warning(f"NER window overlap {self.window_overlap} is too large for "
+                           f"{tokenizer.model_max_length}-token windows, long texts are truncated")
+        else:
+            kwargs['stride'] = self.window_overlap
+        
+        return kwargs
+    
+    def _format_entities(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert NER pipeline output to entity dictionaries."""
+        results = []
+        for entity in entities:
+            results.append({
+                'word': entity['word'],
+                'entity_group': entity['entity_group'],
+                'score': entity['score'],
+                'start': entity['start'],
+                'end': entity['end']
+            })
+        
+        return results
+    
+    def extract_sensitive_information(self, text: str,
+                                      entities: List[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract sensitive information types (PII, financial, etc.).
         
         Args:
             text: Input text
+            entities: Result of classify_entities for the text, to avoid running
+                the model again
             
         Returns:
             Dictionary with sensitive information categories
@@ -339,7 +601,8 @@ class AdvancedEntityClassifier:
             'identification': []
         }
         
-        entities = self.classify_entities(text)
+        if entities is None:
+            entities = self.classify_entities(text)
         
         for entity in entities:
             entity_group = entity['entity_group'].upper()
@@ -381,22 +644,95 @@ class DataClassificationPipeline:
         # Initialize components
         self.text_classifier = TextClassifier(
             model_name=self.config.get('text_model', 'distilbert-base-uncased'),
-            num_labels=self.config.get('num_labels', 2)
+            num_labels=self.config.get('num_labels', 2),
+            max_batch_size=self.config.get('max_batch_size', 16),
+            max_wait_ms=self.config.get('max_wait_ms', 10.0),
+            backend=self.config.get('backend', 'pytorch'),
+            onnx_cache_dir=self.config.get('onnx_cache_dir')
         )
         
         self.entity_classifier = AdvancedEntityClassifier(
-            model_name=self.config.get('entity_model', 'dbmdz/bert-large-cased-finetuned-conll03-english')
+            model_name=self.config.get('entity_model', 'dbmdz/bert-large-cased-finetuned-conll03-english'),
+            max_batch_size=self.config.get('max_batch_size', 16),
+            max_wait_ms=self.config.get('max_wait_ms', 10.0),
+            backend=self.config.get('backend', 'pytorch'),
+            onnx_cache_dir=self.config.get('onnx_cache_dir'),
+            window_overlap=self.config.get('window_overlap', 128),
+            window_batch_size=self.config.get('window_batch_size', 16),
+            max_length=self.config.get('max_length', 512)
         )
         
         logger.info("DataClassificationPipeline initialized")
     
-    def classify_data(self, text: str, classification_tasks: List[str] = None) -> Dict[str, Any]:
+    async def classify_data_async(self, text: str, classification_tasks: List[str] = None) -> Dict[str, Any]:
+        """
+        Perform comprehensive data classification without blocking the event loop.
+        
+        Model inference (NER and the text model) goes through the classifiers'
+        micro-batchers. The rule-based tasks, and NER retried without batching
+        if the batched call failed, run in the default executor.
+        
+        Args:
+            text: Input text to classify
+            classification_tasks: List of tasks to perform
+            
+        Returns:
+            Complete classification results
+        """
+        tasks = classification_tasks or ['document_type', 'sentiment', 'entities', 'metadata']
+        
+        entities = None
+        text_classification = None
+        inference = {}
+        if {'entities', 'sensitive_info'} & set(tasks):
+            inference['entities'] = self.entity_classifier.classify_entities_async(text)
+        if 'text_classification' in tasks:
+            inference['text_classification'] = self.text_classifier.classify_text_async(text)
+        
+        results = await asyncio.gather(*inference.values(), return_exceptions=True)
+        for name, result in zip(inference, results):
+            if isinstance(result, Exception):
+                # classify_data retries without batching and reports the error
+                logger.error(f"Batched {name} inference error: {result}")
+            elif name == 'entities':
+                entities = result
+            else:
+                text_classification = result
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(
+            self.classify_data, text, classification_tasks,
+            entities=entities, text_classification=text_classification
+        ))
+    
+    def batching_metrics(self) -> Dict[str, Any]:
+        """Get micro-batching metrics of the model-backed classifiers."""
+        return {
+            'text_classifier': self.text_classifier.batcher.metrics(),
+            'entity_classifier': self.entity_classifier.batcher.metrics()
+        }
+    
+    async def close(self):
+        """Stop the micro-batching workers."""
+        await self.text_classifier.batcher.close()
+        await self.entity_classifier.batcher.close()
+    
+    def classify_data(self, text: str, classification_tasks: List[str] = None,
+                      entities: List[Dict[str, Any]] = None,
+                      text_classification: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Perform comprehensive data classification.
         
+        Document type and sentiment are rule-based. The 'text_classification'
+        task (not run by default) reports the text model's prediction.
+        
         Args:
             text: Input text to classify
             classification_tasks: List of tasks to perform
+            entities: NER result for the text if already computed (e.g. by
+                classify_entities_async)
+            text_classification: Text model result if already computed (e.g.
+                by classify_text_async)
             
         Returns:
             Complete classification results
@@ -434,9 +770,15 @@ class DataClassificationPipeline:
                     'negative_score': neg_score
                 }
             
+            if 'text_classification' in classification_tasks:
+                results['classification_tasks']['text_classification'] = \
+                    text_classification or self.text_classifier.classify_text(text)
+            
+            if entities is None and {'entities', 'sensitive_info'} & set(classification_tasks):
+                entities = self.entity_classifier.classify_entities(text)
+            
             if 'entities' in classification_tasks:
-                results['classification_tasks']['entities'] = \
-                    self.entity_classifier.classify_entities(text)
+                results['classification_tasks']['entities'] = entities
             
             if 'metadata' in classification_tasks:
                 results['classification_tasks']['metadata'] = \
@@ -444,7 +786,7 @@ class DataClassificationPipeline:
             
             if 'sensitive_info' in classification_tasks:
                 results['classification_tasks']['sensitive_info'] = \
-                    self.entity_classifier.extract_sensitive_information(text)
+                    self.entity_classifier.extract_sensitive_information(text, entities)
             
         except Exception as e:
             logger.error(f"Classification pipeline error: {e}")
@@ -452,33 +794,66 @@ class DataClassificationPipeline:
         
         return results
     
+    def classify_data_batch(self, texts: List[str], classification_tasks: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Perform comprehensive data classification on several texts.
+        
+        Model inference runs once for all texts: one batched NER call and,
+        for the 'text_classification' task, one batched text model call.
+        
+        Args:
+            texts: Input texts
+            classification_tasks: List of tasks to perform (classify_data defaults if None)
+            
+        Returns:
+            Classification results per text, in input order
+        """
+        tasks = classification_tasks or ['document_type', 'sentiment', 'entities', 'metadata']
+        batch_entities = [None] * len(texts)
+        batch_text_classification = [None] * len(texts)
+        
+        if texts and {'entities', 'sensitive_info'} & set(tasks):
+            try:
+                batch_entities = self.entity_classifier.classify_entities_batch(texts)
+            except Exception as e:
+                # classify_data retries per text and reports the error
+                logger.error(f"Batch entity classification error: {e}")
+        
+        if texts and 'text_classification' in tasks:
+            batch_text_classification = self.text_classifier.classify_batch(texts, batch_size=len(texts))
+        
+        return [
+            self.classify_data(text, tasks, entities=entities, text_classification=text_classification)
+            for text, entities, text_classification in zip(texts, batch_entities, batch_text_classification)
+        ]
+    
     def classify_batch_dataframe(self, df: pd.DataFrame, text_column: str, 
-                                output_column: str = None) -> pd.DataFrame:
+                                output_column: str = None, classification_tasks: List[str] = None,
+                                batch_size: int = 32) -> pd.DataFrame:
         """
         Classify data in a DataFrame.
         
+        Model inference runs once per batch of rows (see classify_data_batch)
+        instead of once per row.
+        
         Args:
             df: Input DataFrame
             text_column: Name of text column
             output_column: Name for output column (optional)
+            classification_tasks: List of tasks to perform (classify_data defaults if None)
+            batch_size: Rows per inference batch
             
         Returns:
             DataFrame with classification results
         """
         output_column = output_column or 'classification_results'
+        texts = [str(text) for text in df[text_column]]
         
-        results = []
-        
-        for idx, row in df.iterrows():
-            text = str(row[text_column])
-            classification = self.classify_data(text)
-            
-            result_row = row.to_dict()
-            result_row[output_column] = classification
-            
-            results.append(result_row)
+        classifications = []
+        for start in range(0, len(texts), batch_size):
+            classifications.extend(self.classify_data_batch(texts[start:start + batch_size], classification_tasks))
         
-        return pd.DataFrame(results)
+        return df.assign(**{output_column: classifications})
     
     def generate_classification_report(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -30,18 +30,61 @@ MODEL_CONFIG = {
         },
         "entity_classifier": {
             "model_name": os.getenv("ENTITY_CLASSIFIER_MODEL", "dbmdz/bert-large-cased-finetuned-conll03-english"),
-            "aggregation_strategy": "simple"
-        }
+            "aggregation_strategy": "simple",
+            # Long texts are split into overlapping windows of the model's maximum
+            # length instead of being truncated (0 = truncate)
+            "window_overlap": int(os.getenv("NER_WINDOW_OVERLAP", 128)),
+            "window_batch_size": int(os.getenv("NER_WINDOW_BATCH_SIZE", 16)),
+            "max_length": int(os.getenv("MAX_SEQUENCE_LENGTH", 512))
+        },
+        # pytorch (fp32), quantized (dynamic int8, CPU) or onnx (ONNX Runtime, needs optimum[onnxruntime])
+        "backend": os.getenv("INFERENCE_BACKEND", "pytorch"),
+        "onnx_cache_dir": os.getenv("ONNX_CACHE_DIR", "/tmp/nlp_pipeline/onnx")
+    },
+    "spacy_pipe": {
+        "batch_size": int(os.getenv("SPACY_BATCH_SIZE", 64)),
+        "n_process": int(os.getenv("SPACY_N_PROCESS", 1)),
+        "disable": ["parser", "lemmatizer", "tagger"]  # Not needed for NER
     },
     "batch_size": int(os.getenv("BATCH_SIZE", 32)),
+    # Concurrent /classify requests are coalesced into batched forward passes
+    "micro_batching": {
+        "max_batch_size": int(os.getenv("MICRO_BATCH_SIZE", 16)),  # 1 disables coalescing
+        "max_wait_ms": float(os.getenv("MICRO_BATCH_WAIT_MS", 10))
+    },
+    # Models load on first use; least recently used language models are
+    # unloaded when their resident size exceeds the budget (0 = unlimited)
+    "memory_budget_mb": float(os.getenv("MODEL_MEMORY_BUDGET_MB", 0)),
     "device": os.getenv("DEVICE", "auto")  # auto, cpu, cuda
 }
 
+# Batch Job Configuration
+BATCH_CONFIG = {
+    "max_texts": int(os.getenv("BATCH_MAX_TEXTS", 10000)),
+    "chunk_size": int(os.getenv("BATCH_CHUNK_SIZE", 32)),  # Texts between progress updates
+    "max_workers": int(os.getenv("BATCH_WORKERS", 2)),  # Jobs processed concurrently
+    "result_page_size": 500,  # Results read from the store per query when streaming
+    "poll_interval": 0.5,  # Seconds between checks when following a running job
+    "job_store": {
+        "backend": os.getenv("BATCH_JOB_STORE", "memory"),  # memory, sqlite
+        "sqlite_path": os.getenv("BATCH_JOB_STORE_PATH", "/tmp/nlp_pipeline/jobs.db"),
+        "result_ttl": int(os.getenv("BATCH_RESULT_TTL", 3600)),  # Keep finished jobs for 1 hour
+        "max_jobs": 100  # Memory backend bound on finished jobs
+    }
+}
+
 # Entity Extraction Configuration
 ENTITY_CONFIG = {
     "supported_languages": ["en", "es", "fr", "de"],
     "confidence_threshold": 0.7,
     "enable_custom_patterns": True,
+    # Distinct date/amount strings whose normalized value is cached
+    "normalization_cache_size": int(os.getenv("NORMALIZATION_CACHE_SIZE", 4096)),
+    # Language detection reads this many leading characters and caches by their hash
+    "language_detection": {
+        "sample_chars": int(os.getenv("LANGUAGE_SAMPLE_CHARS", 1000)),
+        "cache_size": int(os.getenv("LANGUAGE_CACHE_SIZE", 10000))
+    },
     "default_patterns": {
         "DATE": [
             r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
@@ -142,6 +185,7 @@ DATABASE_CONFIG = {
 ALL_CONFIGS = {
     "api": API_CONFIG,
     "models": MODEL_CONFIG,
+    "batch": BATCH_CONFIG,
     "entities": ENTITY_CONFIG,
     "classification": CLASSIFICATION_CONFIG,
     "forms": FORM_CONFIG,
@@ -4,17 +4,21 @@ Handles named entity recognition using spaCy and custom patterns.
 Supports dates, amounts, names, addresses, and custom entities.
 """
 
+import os
 import re
 import spacy
 import nltk
 import pandas as pd
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 from datetime import datetime
 from collections import defaultdict
-import dateparser
-from langdetect import detect, LangDetectError
+from functools import lru_cache
 import logging
 
+from model_registry import ModelRegistry, get_registry
+from normalization import ValueNormalizer
+from language_detection import LanguageDetector
+
 # Download required NLTK data
 try:
     nltk.download('punkt', quiet=True)
@@ -26,44 +30,200 @@ except:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _spacy_model_installed(model_name: str) -> bool:
+    """Check whether a spaCy model name refers to an installed package or a model directory."""
+    return spacy.util.is_package(model_name) or os.path.isdir(model_name)
+
+
+class PatternMatcher:
+    """
+    Compiled matcher for a set of entity regex patterns.
+    
+    Patterns are compiled once when they are added and kept grouped by entity
+    type, so a scan reports matches in the same order as iterating over the
+    raw pattern lists.
+    """
+    
+    def __init__(self, flags: int = re.IGNORECASE):
+        """
+        Initialize the matcher.
+        
+        Args:
+            flags: Regex flags used for every pattern
+        """
+        self.flags = flags
+        self._patterns = []
+    
+    def __len__(self) -> int:
+        return len(self._patterns)
+    
+    def add(self, entity_type: str, pattern: str) -> bool:
+        """
+        Compile and register a pattern.
+        
+        Args:
+            entity_type: Entity label reported for matches
+            pattern: Regular expression pattern
+            
+        Returns:
+            False if the pattern was already registered for the entity type
+            
+        Raises:
+            re.error: If the pattern is not a valid regular expression
+        """
+        position = len(self._patterns)
+        for index, (label, source, _) in enumerate(self._patterns):
+            if label == entity_type:
+                if source == pattern:
+                    return False
+                position = index + 1
+        
+        # Insert after the other patterns of the same type
+        self._patterns.insert(position, (entity_type, pattern, re.compile(pattern, self.flags)))
+        return True
+    
+    def scan(self, text: str) -> List[tuple]:
+        """
+        Find all pattern matches in text.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            List of (entity_type, match) tuples
+        """
+        return [
+            (entity_type, match)
+            for entity_type, _, compiled in self._patterns
+            for match in compiled.finditer(text)
+        ]
+    
+    def scan_many(self, texts: List[str]) -> Iterator[tuple]:
+        """
+        Find all pattern matches in many texts, one pattern at a time.
+        
+        For each text, matches are reported in the same order as scan().
+        
+        Args:
+            texts: Input texts
+            
+        Yields:
+            (entity_type, text index, matched text) tuples
+        """
+        for entity_type, _, compiled in self._patterns:
+            finditer = compiled.finditer
+            for index, text in enumerate(texts):
+                for match in finditer(text):
+                    yield entity_type, index, match.group()
+
+
 class EntityExtractor:
     """
     Advanced entity extraction using spaCy, NLTK, and custom patterns.
     Supports multiple languages and custom entity definitions.
     """
     
-    def __init__(self, languages: List[str] = None):
+    # Components not needed for named entity recognition
+    DEFAULT_DISABLED_COMPONENTS = ['parser', 'lemmatizer', 'tagger']
+    
+    FALLBACK_SPACY_MODEL = "en_core_web_sm"
+    
+    # Result categories of extract_all_entities
+    ENTITY_CATEGORIES = ['persons', 'organizations', 'locations', 'dates', 'amounts',
+                         'phones', 'emails', 'addresses', 'other']
+    SPACY_LABEL_CATEGORIES = {
+        'PERSON': 'persons', 'PER': 'persons',
+        'ORG': 'organizations', 'ORGANIZATION': 'organizations',
+        'GPE': 'locations', 'LOC': 'locations', 'LOCATION': 'locations'
+    }
+    PATTERN_LABEL_CATEGORIES = {
+        'DATE': 'dates', 'MONEY': 'amounts',
+        'PHONE': 'phones', 'EMAIL': 'emails', 'ADDRESS': 'addresses'
+    }
+    
+    def __init__(self, languages: List[str] = None, batch_size: int = 64, n_process: int = 1,
+                 disable_components: List[str] = None, spacy_models: Dict[str, str] = None,
+                 registry: ModelRegistry = None, normalizer: ValueNormalizer = None,
+                 language_detector: LanguageDetector = None):
         """
         Initialize the EntityExtractor.
         
         Args:
-            languages: List of language codes to load spaCy models for
+            languages: List of language codes to use spaCy models for
+            batch_size: Documents per nlp.pipe batch in batch extraction
+            n_process: Worker processes per nlp.pipe call in batch extraction
+            disable_components: spaCy components skipped in batch extraction
+            spacy_models: spaCy model name per language (defaults to '<lang>_core_web_sm')
+            registry: Model registry (defaults to the process-wide registry)
+            normalizer: Memoizing date/amount normalizer, may be shared between extractors
+            language_detector: Caching language detector, may be shared between extractors
         """
         self.languages = languages or ['en']
-        self.nlp_models = {}
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.disable_components = (
+            self.DEFAULT_DISABLED_COMPONENTS if disable_components is None else disable_components
+        )
+        self.spacy_model_names = {
+            lang: (spacy_models or {}).get(lang, f"{lang}_core_web_sm") for lang in self.languages
+        }
+        self.registry = registry or get_registry()
+        self.normalizer = normalizer or ValueNormalizer()
+        self.language_detector = language_detector or LanguageDetector()
         self.custom_patterns = defaultdict(list)
+        self.pattern_matcher = PatternMatcher()
         self.entity_mappings = {}
+        self._unavailable_languages = set()
         
-        # Initialize spaCy models
-        self._load_spacy_models()
+        # Register spaCy models, they are loaded on first use
+        self._register_spacy_models()
         
         # Define default entity patterns
         self._setup_default_patterns()
     
-    def _load_spacy_models(self):
-        """Load spaCy models for supported languages."""
-        for lang in self.languages:
+    def _register_spacy_models(self):
+        """Register spaCy models for supported languages without loading them."""
+        model_names = set(self.spacy_model_names.values()) | {self.FALLBACK_SPACY_MODEL}
+        for model_name in model_names:
+            self.registry.register(f"spacy:{model_name}", lambda model_name=model_name: spacy.load(model_name))
+    
+    def get_nlp(self, language: str):
+        """
+        Get the spaCy model for a language, loading it on first use.
+        
+        Unsupported languages and languages whose model is not installed use
+        the English model.
+        
+        Args:
+            language: Language code
+            
+        Returns:
+            spaCy Language pipeline
+            
+        Raises:
+            OSError: If neither the language model nor the English model can be loaded
+        """
+        if language in self.spacy_model_names and language not in self._unavailable_languages:
+            model_name = self.spacy_model_names[language]
             try:
-                model_name = f"{lang}_core_web_sm"
-                nlp = spacy.load(model_name)
-                self.nlp_models[lang] = nlp
-                logger.info(f"Loaded spaCy model: {model_name}")
+                return self.registry.get(f"spacy:{model_name}")
             except OSError:
                 logger.warning(f"spaCy model '{model_name}' not found. Using English fallback.")
-                try:
-                    self.nlp_models[lang] = spacy.load("en_core_web_sm")
-                except OSError:
-                    logger.error("Could not load any spaCy model!")
+                self._unavailable_languages.add(language)
+        
+        try:
+            return self.registry.get(f"spacy:{self.FALLBACK_SPACY_MODEL}")
+        except OSError:
+            logger.error("Could not load any spaCy model!")
+            raise
+    
+    def loaded_languages(self) -> List[str]:
+        """Get the languages whose spaCy model is currently loaded."""
+        return [
+            lang for lang, model_name in self.spacy_model_names.items()
+            if lang not in self._unavailable_languages and self.registry.is_loaded(f"spacy:{model_name}")
+        ]
     
     def _setup_default_patterns(self):
         """Setup default entity patterns for common entities."""
@@ -108,6 +268,10 @@ class EntityExtractor:
         self.custom_patterns['PHONE'] = phone_patterns
         self.custom_patterns['EMAIL'] = email_patterns
         self.custom_patterns['ADDRESS'] = address_patterns
+        
+        for entity_type, patterns in self.custom_patterns.items():
+            for pattern in patterns:
+                self.pattern_matcher.add(entity_type, pattern)
     
     def add_custom_pattern(self, entity_type: str, pattern: str, description: str = ""):
         """
@@ -117,7 +281,14 @@ class EntityExtractor:
             entity_type: Type of entity (e.g., 'CUSTOM_FIELD')
             pattern: Regular expression pattern
             description: Description of the pattern
+            
+        Raises:
+            re.error: If the pattern is not a valid regular expression
         """
+        if not self.pattern_matcher.add(entity_type, pattern):
+            logger.debug(f"Pattern for {entity_type} is already registered")
+            return
+        
         self.custom_patterns[entity_type].append(pattern)
         logger.info(f"Added custom pattern for {entity_type}: {description}")
     
@@ -131,11 +302,58 @@ class EntityExtractor:
         Returns:
             Language code (e.g., 'en', 'es', 'fr')
         """
-        try:
-            return detect(text)
-        except LangDetectError:
-            logger.warning("Could not detect language. Defaulting to English.")
-            return 'en'
+        return self.language_detector.detect(text)
+    
+    def _resolve_languages(self, texts: List[str], languages: List[str] = None,
+                           language: str = None) -> List[str]:
+        """
+        Get the language used to pick the spaCy model for each text.
+        
+        Detection is skipped when the caller provides languages or when every
+        language would use the same model.
+        
+        Args:
+            texts: Input texts
+            languages: Language code per text
+            language: Language code of all texts
+            
+        Returns:
+            Language code per text
+        """
+        if languages is not None:
+            self.language_detector.record_skipped('hint', len(texts))
+            return languages
+        
+        if language:
+            self.language_detector.record_skipped('hint', len(texts))
+            return [language] * len(texts)
+        
+        single_language = self._single_model_language()
+        if single_language:
+            self.language_detector.record_skipped('single_model', len(texts))
+            return [single_language] * len(texts)
+        
+        return [self.detect_language(text) for text in texts]
+    
+    def _single_model_language(self) -> Optional[str]:
+        """
+        Get a language to use for every text if all texts would use the fallback spaCy model.
+        
+        Only languages whose own model is loaded in the registry, or can be
+        loaded, count; the others use the fallback model anyway.
+        """
+        available = [lang for lang in self.languages if self._has_own_model(lang)]
+        if all(self.spacy_model_names[lang] == self.FALLBACK_SPACY_MODEL for lang in available):
+            return available[0] if available else 'en'
+        return None
+    
+    def _has_own_model(self, language: str) -> bool:
+        """Check whether a language's spaCy model is loaded or loadable, rather than replaced by the fallback."""
+        if language in self._unavailable_languages:
+            return False
+        
+        model_name = self.spacy_model_names[language]
+        return self.registry.is_loaded(f"spacy:{model_name}") or _spacy_model_installed(model_name)
     
     def extract_entities_spacy(self, text: str, language: str = None) -> List[Dict[str, Any]]:
         """
@@ -148,15 +366,53 @@ class EntityExtractor:
         Returns:
             List of extracted entities
         """
-        if not language:
-            language = self.detect_language(text)
+        language = self._resolve_languages([text], language=language)[0]
+        return self._doc_entities(self.get_nlp(language)(text))
+    
+    def extract_entities_spacy_batch(self, texts: List[str], languages: List[str] = None,
+                                     batch_size: int = None, n_process: int = None,
+                                     language: str = None) -> List[List[Dict[str, Any]]]:
+        """
+        Extract entities from many texts using spaCy's nlp.pipe.
         
-        if language not in self.nlp_models:
-            language = 'en'  # fallback
+        Texts are grouped by language so each model processes its own stream,
+        and components not needed for NER are disabled.
         
-        nlp = self.nlp_models[language]
-        doc = nlp(text)
+        Args:
+            texts: Input texts
+            languages: Language code per text (auto-detect if None)
+            batch_size: Documents per batch (defaults to the extractor setting)
+            n_process: Worker processes (defaults to the extractor setting)
+            language: Language code of all texts, used when languages is None
+            
+        Returns:
+            List of extracted entities per text, in input order
+        """
+        languages = self._resolve_languages(texts, languages, language)
+        
+        # Group texts by model, languages falling back to the same model share a stream
+        groups = {}
+        for index, (text, language) in enumerate(zip(texts, languages)):
+            nlp = self.get_nlp(language)
+            groups.setdefault(id(nlp), (nlp, []))[1].append(index)
+        
+        results = [[] for _ in texts]
+        
+        for nlp, indices in groups.values():
+            disable = [name for name in self.disable_components if name in nlp.pipe_names]
+            docs = nlp.pipe(
+                (texts[index] for index in indices),
+                batch_size=batch_size or self.batch_size,
+                n_process=n_process or self.n_process,
+                disable=disable
+            )
+            for index, doc in zip(indices, docs):
+                results[index] = self._doc_entities(doc)
         
+        return results
+    
+    def _doc_entities(self, doc) -> List[Dict[str, Any]]:
+        """Convert the entities of a spaCy Doc to entity dictionaries."""
         entities = []
         for ent in doc.ents:
             entities.append({
@@ -182,20 +438,17 @@ class EntityExtractor:
         """
         entities = []
         
-        for entity_type, patterns in self.custom_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    # Validate the match to reduce false positives
-                    if self._validate_entity(match.group(), entity_type):
-                        entities.append({
-                            'text': match.group(),
-                            'label': entity_type,
-                            'start': match.start(),
-                            'end': match.end(),
-                            'confidence': 0.9,
-                            'source': 'pattern'
-                        })
+        for entity_type, match in self.pattern_matcher.scan(text):
+            # Validate the match to reduce false positives
+            if self._validate_entity(match.group(), entity_type):
+                entities.append({
+                    'text': match.group(),
+                    'label': entity_type,
+                    'start': match.start(),
+                    'end': match.end(),
+                    'confidence': 0.9,
+                    'source': 'pattern'
+                })
         
         return entities
     
@@ -228,12 +481,14 @@ class EntityExtractor:
         
         return True  # Default validation
     
-    def extract_dates(self, text: str) -> List[Dict[str, Any]]:
+    def extract_dates(self, text: str, pattern_entities: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Extract and normalize dates from text.
         
         Args:
             text: Input text
+            pattern_entities: Result of extract_entities_patterns for the text,
+                to avoid scanning it again
             
         Returns:
             List of extracted and normalized dates
@@ -241,9 +496,12 @@ class EntityExtractor:
         date_entities = []
         
         # Get date entities from patterns
-        for ent in self.extract_entities_patterns(text):
+        if pattern_entities is None:
+            pattern_entities = self.extract_entities_patterns(text)
+        
+        for ent in pattern_entities:
             if ent['label'] == 'DATE':
-                parsed_date = dateparser.parse(ent['text'])
+                parsed_date = self.normalizer.parse_date(ent['text'])
                 if parsed_date:
                     date_entities.append({
                         'original_text': ent['text'],
@@ -256,35 +514,28 @@ class EntityExtractor:
         
         return date_entities
     
-    def extract_amounts(self, text: str) -> List[Dict[str, Any]]:
+    def extract_amounts(self, text: str, pattern_entities: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Extract and normalize monetary amounts from text.
         
         Args:
             text: Input text
+            pattern_entities: Result of extract_entities_patterns for the text,
+                to avoid scanning it again
             
         Returns:
             List of extracted and normalized amounts
         """
         amount_entities = []
         
-        for ent in self.extract_entities_patterns(text):
+        if pattern_entities is None:
+            pattern_entities = self.extract_entities_patterns(text)
+        
+        for ent in pattern_entities:
             if ent['label'] == 'MONEY':
-                # Extract numeric value
-                numeric_match = re.search(r'[\d,]+(?:\.\d{2})?', ent['text'])
-                if numeric_match:
-                    numeric_value = float(numeric_match.group().replace(',', ''))
-                    
-                    # Detect currency
-                    currency = 'USD'  # default
-                    currency_match = re.search(r'(USD|EUR|GBP|JPY|CNY|AUD|CAD|\$)', ent['text'], re.IGNORECASE)
-                    if currency_match:
-                        currency_symbol = currency_match.group()
-                        if currency_symbol == '$':
-                            currency = 'USD'
-                        else:
-                            currency = currency_match.group().upper()
-                    
+                amount = self.normalizer.normalize_amount(ent['text'])
+                if amount:
+                    numeric_value, currency = amount
                     amount_entities.append({
                         'original_text': ent['text'],
                         'amount': numeric_value,
@@ -311,85 +562,201 @@ class EntityExtractor:
         if not text.strip():
             return {}
         
-        # Detect language if not provided
-        if not language:
-            language = self.detect_language(text)
+        # Extract using spaCy
+        spacy_entities = self.extract_entities_spacy(text, language)
+        
+        return self._combine_entities(text, spacy_entities)
+    
+    def extract_all_entities_with_language(self, text: str,
+                                           language: str = None) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """
+        Extract all entities from text and report the language used.
+        
+        Language detection runs in the calling thread, so callers on an
+        event loop can run detection and extraction off the loop together.
+        
+        Args:
+            text: Input text
+            language: Language code (auto-detect if None)
+            
+        Returns:
+            Tuple of (entities in the format of extract_all_entities, language code used)
+        """
+        language = self._resolve_languages([text], language=language)[0]
+        if not text.strip():
+            return {}, language
+        
+        spacy_entities = self._doc_entities(self.get_nlp(language)(text))
+        return self._combine_entities(text, spacy_entities), language
+    
+    def extract_all_entities_batch(self, texts: List[str], languages: List[str] = None,
+                                   batch_size: int = None, n_process: int = None,
+                                   language: str = None) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Extract all entities from many texts, running spaCy in batches.
+        
+        Args:
+            texts: Input texts
+            languages: Language code per text (auto-detect if None)
+            batch_size: Documents per nlp.pipe batch
+            n_process: Worker processes for nlp.pipe
+            language: Language code of all texts, used when languages is None
+            
+        Returns:
+            List of results in the format of extract_all_entities, in input order
+        """
+        results = [{} for _ in texts]
+        indices = [index for index, text in enumerate(texts) if text.strip()]
+        if not indices:
+            return results
+        
+        batch_texts = [texts[index] for index in indices]
+        batch_languages = [languages[index] for index in indices] if languages else None
+        spacy_entities = self.extract_entities_spacy_batch(
+            batch_texts, batch_languages, batch_size, n_process, language=language
+        )
+        
+        for index, text, entities in zip(indices, batch_texts, spacy_entities):
+            results[index] = self._combine_entities(text, entities)
+        
+        return results
+    
+    def _combine_entities(self, text: str, spacy_entities: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Combine spaCy entities with pattern matches into categorized results.
+        
+        Args:
+            text: Input text
+            spacy_entities: Entities found by spaCy in the text
+            
+        Returns:
+            Dictionary with entity types as keys and lists of entities as values
+        """
+        # Scan with the patterns once and share the matches
+        pattern_entities = self.extract_entities_patterns(text)
         
         results = {
             'persons': [],
             'organizations': [],
             'locations': [],
-            'dates': self.extract_dates(text),
-            'amounts': self.extract_amounts(text),
+            'dates': self.extract_dates(text, pattern_entities),
+            'amounts': self.extract_amounts(text, pattern_entities),
             'phones': [],
             'emails': [],
             'addresses': [],
             'other': []
         }
         
-        # Extract using spaCy
-        spacy_entities = self.extract_entities_spacy(text, language)
-        
-        # Extract using patterns
-        pattern_entities = self.extract_entities_patterns(text)
-        
         # Categorize spaCy entities
         for ent in spacy_entities:
-            if ent['label'] in ['PERSON', 'PER']:
-                results['persons'].append(ent)
-            elif ent['label'] in ['ORG', 'ORGANIZATION']:
-                results['organizations'].append(ent)
-            elif ent['label'] in ['GPE', 'LOC', 'LOCATION']:
-                results['locations'].append(ent)
-            else:
-                results['other'].append(ent)
-        
-        # Categorize pattern entities
+            results[self.SPACY_LABEL_CATEGORIES.get(ent['label'], 'other')].append(ent)
+        
+        # Categorize pattern entities, dates and amounts are handled above
         for ent in pattern_entities:
-            if ent['label'] == 'PHONE':
-                results['phones'].append(ent)
-            elif ent['label'] == 'EMAIL':
-                results['emails'].append(ent)
-            elif ent['label'] == 'ADDRESS':
-                results['addresses'].append(ent)
-            elif ent['label'] == 'DATE':
-                # Already handled in extract_dates
-                pass
-            elif ent['label'] == 'MONEY':
-                # Already handled in extract_amounts
-                pass
-            else:
-                results['other'].append(ent)
+            category = self.PATTERN_LABEL_CATEGORIES.get(ent['label'], 'other')
+            if category not in ('dates', 'amounts'):
+                results[category].append(ent)
         
         return results
     
-    def extract_from_dataframe(self, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+    def extract_from_dataframe(self, df: pd.DataFrame, text_column: str, language: str = None,
+                               chunk_size: int = 10000) -> pd.DataFrame:
         """
         Extract entities from a DataFrame.
         
+        Adds '<category>_count' and '<category>_text' columns for every
+        category of extract_all_entities (see extract_from_dataframe_chunks).
+        
         Args:
             df: Input DataFrame
             text_column: Name of the column containing text
+            language: Language code of all texts (detected per text if None)
+            chunk_size: Rows processed at a time
             
         Returns:
             DataFrame with extracted entities added as new columns
         """
-        results = []
+        chunks = list(self.extract_from_dataframe_chunks(df, text_column, language, chunk_size))
+        if not chunks:
+            return df.assign(**self._entity_columns([], language))
         
-        for idx, row in df.iterrows():
-            text = str(row[text_column])
-            entities = self.extract_all_entities(text)
-            
-            result_row = row.to_dict()
+        return pd.concat(chunks)
+    
+    def extract_from_dataframe_chunks(self, df: pd.DataFrame, text_column: str, language: str = None,
+                                      chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """
+        Extract entities from a DataFrame chunk by chunk.
+        
+        Only one chunk of intermediate matches is held in memory, so large
+        exports can be written out as the chunks are produced.
+        
+        Args:
+            df: Input DataFrame
+            text_column: Name of the column containing text
+            language: Language code of all texts (detected per text if None)
+            chunk_size: Rows per chunk
             
-            # Add entity counts
-            for entity_type, entity_list in entities.items():
-                result_row[f'{entity_type}_count'] = len(entity_list)
-                result_row[f'{entity_type}_text'] = ', '.join([e['text'] for e in entity_list])
+        Yields:
+            Row chunks of the input with the entity columns added
+        """
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            texts = [str(text) for text in chunk[text_column]]
+            yield chunk.assign(**self._entity_columns(texts, language))
+    
+    def _entity_columns(self, texts: List[str], language: str = None) -> Dict[str, list]:
+        """
+        Build entity count and text columns for a list of texts.
+        
+        Counts and texts match extract_all_entities, but only matched strings
+        are collected: spaCy runs over the texts in batches, each pattern
+        scans the texts in one pass, and validation and date parsing run
+        once per distinct matched string.
+        
+        Args:
+            texts: Input texts
+            language: Language code of all texts (detected per text if None)
             
-            results.append(result_row)
+        Returns:
+            Dictionary of column name to column values
+        """
+        found = {category: [[] for _ in texts] for category in self.ENTITY_CATEGORIES}
+        indices = [index for index, text in enumerate(texts) if text.strip()]
+        batch_texts = [texts[index] for index in indices]
+        
+        if batch_texts:
+            for index, entities in zip(indices, self.extract_entities_spacy_batch(batch_texts, language=language)):
+                for ent in entities:
+                    found[self.SPACY_LABEL_CATEGORIES.get(ent['label'], 'other')][index].append(ent['text'])
+        
+        accepted = {}
+        for entity_type, position, match_text in self.pattern_matcher.scan_many(batch_texts):
+            key = (entity_type, match_text)
+            if key not in accepted:
+                accepted[key] = self._accept_pattern_match(match_text, entity_type)
+            if accepted[key]:
+                category = self.PATTERN_LABEL_CATEGORIES.get(entity_type, 'other')
+                found[category][indices[position]].append(match_text)
+        
+        columns = {}
+        for category in self.ENTITY_CATEGORIES:
+            columns[f'{category}_count'] = [len(matches) for matches in found[category]]
+            columns[f'{category}_text'] = [', '.join(matches) for matches in found[category]]
+        
+        return columns
+    
+    def _accept_pattern_match(self, text: str, entity_type: str) -> bool:
+        """Check whether a pattern match is reported by extract_all_entities."""
+        if not self._validate_entity(text, entity_type):
+            return False
+        
+        if entity_type == 'DATE':
+            return self.normalizer.parse_date(text) is not None
+        
+        if entity_type == 'MONEY':
+            return self.normalizer.normalize_amount(text) is not None
         
-        return pd.DataFrame(results)
+        return True
 
 
 # Form Field Recognition Module
@@ -399,8 +766,15 @@ class FormFieldExtractor(EntityExtractor):
     Identifies common form fields like name, email, phone, address, etc.
     """
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        """
+        Initialize the FormFieldExtractor.
+        
+        Args:
+            **kwargs: EntityExtractor arguments; spaCy models are shared with
+                other extractors through the model registry
+        """
+        super().__init__(**kwargs)
         self.field_patterns = {
             'name_field': [
                 r'(?:name|full.?name|first.?name|last.?name)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
@@ -0,0 +1,19 @@
+"""
+Job Store Module
+Re-exports the job store shared with the OCR service from code/common.
+Service modules import it from here so the parent directory is put on
+sys.path in one place, whichever module is imported first.
+"""
+
+import os
+import sys
+
+_CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CODE_DIR not in sys.path:
+    sys.path.append(_CODE_DIR)
+
+from common.job_store import (  # noqa: E402
+    JobStore, InMemoryJobStore, SQLiteJobStore, create_job_store, FINISHED_STATUSES
+)
+
+__all__ = ['JobStore', 'InMemoryJobStore', 'SQLiteJobStore', 'create_job_store', 'FINISHED_STATUSES']
@@ -0,0 +1,118 @@
+"""
+Language Detection Module
+Cached language detection. Long documents are detected from a bounded
+prefix, and results are cached by a hash of that prefix so repeated texts
+(and repeated calls for the same text) are detected once.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict
+
+from langdetect import DetectorFactory, detect, LangDetectException
+
+logger = logging.getLogger(__name__)
+
+# langdetect samples randomly; a fixed seed makes results reproducible
+DetectorFactory.seed = 0
+
+
+class LanguageDetector:
+    """
+    Language detector with a bounded LRU cache and timing statistics.
+    """
+    
+    def __init__(self, sample_chars: int = 1000, cache_size: int = 10000, default_language: str = 'en'):
+        """
+        Initialize the detector.
+        
+        Args:
+            sample_chars: Characters from the start of a text used for detection
+            cache_size: Maximum cached detection results
+            default_language: Language returned when detection fails
+        """
+        self.sample_chars = sample_chars
+        self.cache_size = cache_size
+        self.default_language = default_language
+        self._cache = OrderedDict()  # Least recently used first
+        self._counters = Counter()
+        self._detection_time = 0.0
+        self._lock = threading.Lock()
+    
+    def detect(self, text: str) -> str:
+        """
+        Detect the language of a text.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Language code (e.g., 'en', 'es', 'fr')
+        """
+        sample = text[:self.sample_chars]
+        key = hashlib.blake2b(sample.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        
+        with self._lock:
+            language = self._cache.get(key)
+            if language is not None:
+                self._cache.move_to_end(key)
+                self._counters['cache_hits'] += 1
+                return language
+        
+        start_time = time.perf_counter()
+        try:
+            language = detect(sample)
+        except LangDetectException:
+            logger.warning(f"Could not detect language. Defaulting to {self.default_language}.")
+            language = self.default_language
+        elapsed = time.perf_counter() - start_time
+        
+        with self._lock:
+            self._counters['detections'] += 1
+            self._detection_time += elapsed
+            self._cache[key] = language
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return language
+    
+    def record_skipped(self, reason: str, count: int = 1):
+        """
+        Count texts whose language was not detected.
+        
+        Args:
+            reason: 'hint' for caller-provided languages, 'single_model' when
+                detection could not change the model used
+            count: Number of texts
+        """
+        with self._lock:
+            self._counters[f'skipped_{reason}'] += count
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get detection statistics.
+        
+        Returns:
+            Detection and cache counts, skipped texts and detection time in milliseconds
+        """
+        with self._lock:
+            detections = self._counters['detections']
+            cache_hits = self._counters['cache_hits']
+            lookups = detections + cache_hits
+            return {
+                'detections': detections,
+                'cache_hits': cache_hits,
+                'cache_hit_rate': cache_hits / lookups if lookups else 0.0,
+                'cached': len(self._cache),
+                'cache_size': self.cache_size,
+                'sample_chars': self.sample_chars,
+                'skipped_hint': self._counters['skipped_hint'],
+                'skipped_single_model': self._counters['skipped_single_model'],
+                'detection_time_ms': {
+                    'total': self._detection_time * 1000,
+                    'mean': self._detection_time * 1000 / detections if detections else 0.0
+                }
+            }
@@ -4,8 +4,8 @@ Provides REST APIs for real-time and batch processing.
 Supports entity extraction, data classification, and form field recognition.
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Query
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
@@ -22,8 +22,14 @@ import asyncio
 from contextlib import asynccontextmanager
 
 # Import our custom modules
+from config import MODEL_CONFIG, BATCH_CONFIG, ENTITY_CONFIG
 from entity_extractor import EntityExtractor, FormFieldExtractor
+from model_registry import get_registry
+from normalization import ValueNormalizer
+from language_detection import LanguageDetector
 from classifier import DataClassificationPipeline, TextClassifier
+from job_store import create_job_store, FINISHED_STATUSES
+from batch_jobs import BatchJobManager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +39,7 @@ logger = logging.getLogger(__name__)
 entity_extractor = None
 form_extractor = None
 classifier_pipeline = None
+batch_jobs = None
 
 # Request/Response Models
 class EntityExtractionRequest(BaseModel):
@@ -49,7 +56,8 @@ class ClassificationRequest(BaseModel):
     text: str = Field(..., description="Text to classify")
     classification_tasks: Optional[List[str]] = Field(
         default=['document_type', 'sentiment', 'entities', 'metadata'],
-        description="List of classification tasks to perform"
+        description="List of classification tasks to perform (document_type, sentiment, entities, "
+                    "metadata, sensitive_info, text_classification)"
     )
 
 class ClassificationResponse(BaseModel):
@@ -63,6 +71,7 @@ class FormFieldRequest(BaseModel):
 class BatchProcessingRequest(BaseModel):
     texts: List[str] = Field(..., description="List of texts to process")
     tasks: List[str] = Field(default=['entities', 'classification'], description="Tasks to perform")
+    language: Optional[str] = Field(None, description="Language code of all texts (auto-detected per text if None)")
 
 class CustomPatternRequest(BaseModel):
     entity_type: str = Field(..., description="Type of entity")
@@ -73,14 +82,48 @@ class CustomPatternRequest(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global entity_extractor, form_extractor, classifier_pipeline
+    global entity_extractor, form_extractor, classifier_pipeline, batch_jobs
     
     logger.info("Initializing NLP pipeline components...")
     
     try:
-        entity_extractor = EntityExtractor(languages=['en', 'es', 'fr', 'de'])
-        form_extractor = FormFieldExtractor()
-        classifier_pipeline = DataClassificationPipeline()
+        # Components only register their models here, they are loaded on first use
+        get_registry().memory_budget_mb = MODEL_CONFIG['memory_budget_mb']
+        
+        # Extractors share parsed dates and amounts
+        normalizer = ValueNormalizer(ENTITY_CONFIG['normalization_cache_size'])
+        language_detector = LanguageDetector(**ENTITY_CONFIG['language_detection'])
+        
+        spacy_pipe = MODEL_CONFIG['spacy_pipe']
+        entity_extractor = EntityExtractor(
+            languages=['en', 'es', 'fr', 'de'],
+            batch_size=spacy_pipe['batch_size'],
+            n_process=spacy_pipe['n_process'],
+            disable_components=spacy_pipe['disable'],
+            spacy_models=MODEL_CONFIG['spacy_models'],
+            normalizer=normalizer,
+            language_detector=language_detector
+        )
+        form_extractor = FormFieldExtractor(
+            spacy_models=MODEL_CONFIG['spacy_models'],
+            normalizer=normalizer,
+            language_detector=language_detector
+        )
+        transformers_config = MODEL_CONFIG['transformers']
+        classifier_pipeline = DataClassificationPipeline(config=dict(
+            MODEL_CONFIG['micro_batching'],
+            backend=transformers_config['backend'],
+            onnx_cache_dir=transformers_config['onnx_cache_dir'],
+            window_overlap=transformers_config['entity_classifier']['window_overlap'],
+            window_batch_size=transformers_config['entity_classifier']['window_batch_size'],
+            max_length=transformers_config['entity_classifier']['max_length']
+        ))
+        batch_jobs = BatchJobManager(
+            create_job_store(BATCH_CONFIG['job_store']),
+            process_batch_chunk,
+            chunk_size=BATCH_CONFIG['chunk_size'],
+            max_workers=BATCH_CONFIG['max_workers']
+        )
         logger.info("All components initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing components: {e}")
@@ -90,6 +133,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down NLP pipeline...")
+    if batch_jobs:
+        batch_jobs.shutdown()
+    if classifier_pipeline:
+        await classifier_pipeline.close()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -125,8 +172,12 @@ async def root():
             "/classify": "Classify text data",
             "/extract-form-fields": "Extract form fields",
             "/process-batch": "Process multiple texts",
+            "/batch-status/{task_id}": "Check batch job progress",
+            "/batch-results/{task_id}": "Stream batch job results as NDJSON",
+            "/batch-cancel/{task_id}": "Cancel a batch job",
             "/add-pattern": "Add custom entity patterns",
-            "/pipeline-status": "Check pipeline status"
+            "/pipeline-status": "Check pipeline status",
+            "/metrics": "Inference batching, normalization and language detection metrics"
         }
     }
 
@@ -167,8 +218,12 @@ async def extract_entities(request: EntityExtractionRequest):
                 for pattern in patterns:
                     entity_extractor.add_custom_pattern(entity_type, pattern)
         
-        # Extract entities
-        entities = entity_extractor.extract_all_entities(request.text, request.language)
+        # Detect the language and extract entities off the event loop; the first
+        # request for a language may load its spaCy model
+        loop = asyncio.get_running_loop()
+        entities, language = await loop.run_in_executor(
+            None, entity_extractor.extract_all_entities_with_language, request.text, request.language
+        )
         
         # Calculate processing time
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -177,7 +232,7 @@ async def extract_entities(request: EntityExtractionRequest):
             entities=entities,
             metadata={
                 "input_length": len(request.text),
-                "language_detected": entity_extractor.detect_language(request.text) if not request.language else request.language,
+                "language_detected": language,
                 "entities_found": sum(len(entity_list) for entity_list in entities.values())
             },
             processing_time=processing_time
@@ -200,8 +255,8 @@ async def classify_text(request: ClassificationRequest):
     start_time = datetime.now()
     
     try:
-        # Perform classification
-        classification_results = classifier_pipeline.classify_data(
+        # Perform classification, model inference is batched with concurrent requests
+        classification_results = await classifier_pipeline.classify_data_async(
             request.text, 
             request.classification_tasks
         )
@@ -261,19 +316,26 @@ async def extract_form_fields(request: FormFieldRequest):
 
 
 @app.post("/process-batch")
-async def process_batch(request: BatchProcessingRequest, background_tasks: BackgroundTasks):
+async def process_batch(request: BatchProcessingRequest):
     """
     Process multiple texts in batch mode.
     Returns a task ID for async processing.
     """
-    task_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="No texts provided")
+    if len(request.texts) > BATCH_CONFIG['max_texts']:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum batch size is {BATCH_CONFIG['max_texts']} texts"
+        )
     
-    # Add background task
-    background_tasks.add_task(process_batch_task, task_id, request.texts, request.tasks)
+    # Texts are processed in the batch worker pool, off the event loop
+    task_id = batch_jobs.submit(request.texts, request.tasks, request.language)
     
     return {
         "task_id": task_id,
         "status": "queued",
+        "total_texts": len(request.texts),
         "message": "Batch processing started. Use task_id to check status.",
         "timestamp": datetime.now().isoformat()
     }
@@ -281,15 +343,67 @@ async def process_batch(request: BatchProcessingRequest, background_tasks: Backg
 
 @app.get("/batch-status/{task_id}")
 async def get_batch_status(task_id: str):
-    """Get status of batch processing task."""
-    # In a real implementation, this would check a database or cache
-    # For now, return a placeholder response
+    """Get status and progress of a batch processing task."""
+    job = batch_jobs.store.get_job(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch task not found")
+    
+    return dict(job, timestamp=datetime.now().isoformat())
+
+
+@app.get("/batch-results/{task_id}")
+async def get_batch_results(
+    task_id: str,
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    follow: bool = Query(False, description="Keep streaming until the task finishes")
+):
+    """
+    Stream the results of a batch processing task as NDJSON, one line per text.
+    Results of finished chunks are available while the task is still running.
+    """
+    if batch_jobs.store.get_job(task_id) is None:
+        raise HTTPException(status_code=404, detail="Batch task not found")
+    
+    page_size = BATCH_CONFIG['result_page_size']
+    
+    async def stream_results():
+        position = offset
+        while True:
+            # Check the status before reading so results appended meanwhile are not missed
+            job = batch_jobs.store.get_job(task_id)
+            finished = job is None or job['status'] in FINISHED_STATUSES
+            
+            while True:
+                results = batch_jobs.store.get_results(task_id, position, page_size)
+                for result in results:
+                    yield json.dumps(result, default=str) + "\n"
+                position += len(results)
+                if len(results) < page_size:
+                    break
+            
+            if finished or not follow:
+                return
+            await asyncio.sleep(BATCH_CONFIG['poll_interval'])
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/batch-cancel/{task_id}")
+async def cancel_batch(task_id: str):
+    """Cancel a queued or running batch processing task."""
+    job = batch_jobs.store.get_job(task_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch task not found")
+    if job['status'] in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Batch task already {job['status']}")
+    if not batch_jobs.cancel(task_id):
+        raise HTTPException(status_code=409, detail="Batch task is not running in this worker")
     
     return {
         "task_id": task_id,
-        "status": "processing",
-        "progress": 0.5,  # Example progress
-        "message": "Batch processing in progress...",
+        "status": "cancelling",
+        "processed": job['processed'],
+        "message": "Processing stops after the current chunk.",
         "timestamp": datetime.now().isoformat()
     }
 
@@ -326,6 +440,7 @@ async def pipeline_status():
             "entity_extractor": {
                 "loaded": entity_extractor is not None,
                 "supported_languages": entity_extractor.languages if entity_extractor else [],
+                "loaded_languages": entity_extractor.loaded_languages() if entity_extractor else [],
                 "custom_patterns": len(entity_extractor.custom_patterns) if entity_extractor else 0
             },
             "form_extractor": {
@@ -335,9 +450,15 @@ async def pipeline_status():
             "classifier": {
                 "loaded": classifier_pipeline is not None,
                 "text_model": classifier_pipeline.text_classifier.model_name if classifier_pipeline else None,
-                "entity_model": classifier_pipeline.entity_classifier.model_name if classifier_pipeline else None
+                "entity_model": classifier_pipeline.entity_classifier.model_name if classifier_pipeline else None,
+                "backend": classifier_pipeline.text_classifier.backend if classifier_pipeline else None
+            },
+            "batch_jobs": {
+                "job_store": batch_jobs.store.name if batch_jobs else None,
+                "active_jobs": batch_jobs.active_jobs() if batch_jobs else 0
             }
         },
+        "models": get_registry().status(),
         "system_info": {
             "timestamp": datetime.now().isoformat(),
             "uptime": "Running",  # Would calculate actual uptime
@@ -346,6 +467,20 @@ async def pipeline_status():
     }
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Get micro-batching metrics (batch size histograms, queue wait times), normalization cache and language detection statistics."""
+    if classifier_pipeline is None or entity_extractor is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
+    
+    return {
+        "batching": classifier_pipeline.batching_metrics(),
+        "normalization": entity_extractor.normalizer.stats(),
+        "language_detection": entity_extractor.language_detector.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @app.post("/process-document")
 async def process_document(file: UploadFile = File(...)):
     """
@@ -403,45 +538,32 @@ async def process_document(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Document processing failed: {str(e)}")
 
 
-# Background task function
-async def process_batch_task(task_id: str, texts: List[str], tasks: List[str]):
-    """
-    Background task for batch processing.
-    In a real implementation, this would:
-    1. Store task status in database/cache
-    2. Process texts in chunks
-    3. Update progress
-    4. Store results when complete
+# Batch job processing
+def process_batch_chunk(texts: List[str], tasks: List[str], language: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    logger.info(f"Starting batch processing task: {task_id}")
+    Process one chunk of a batch job (runs in the batch worker pool).
     
-    try:
-        results = []
+    Args:
+        texts: Texts of the chunk
+        tasks: Tasks to perform on each text
+        language: Language code of all texts (auto-detect if None)
         
-        for i, text in enumerate(texts):
-            text_result = {}
-            
-            if 'entities' in tasks:
-                text_result['entities'] = entity_extractor.extract_all_entities(text)
-            
-            if 'classification' in tasks:
-                text_result['classification'] = classifier_pipeline.classify_data(text)
-            
-            results.append({
-                'text_index': i,
-                'text_length': len(text),
-                'results': text_result
-            })
-            
-            # Simulate progress update
-            progress = (i + 1) / len(texts)
-            logger.info(f"Task {task_id} progress: {progress:.2%}")
-        
-        # In a real implementation, save results to database/cache
-        logger.info(f"Batch processing completed for task: {task_id}")
-        
-    except Exception as e:
-        logger.error(f"Batch processing error for task {task_id}: {e}")
+    Returns:
+        Results per text in input order
+    """
+    results = [{} for _ in texts]
+    
+    if 'entities' in tasks:
+        # Run spaCy over the whole chunk instead of one text at a time
+        for result, entities in zip(results, entity_extractor.extract_all_entities_batch(texts, language=language)):
+            result['entities'] = entities
+    
+    if 'classification' in tasks:
+        # One batched model call per chunk instead of one per text
+        for result, classification in zip(results, classifier_pipeline.classify_data_batch(texts)):
+            result['classification'] = classification
+    
+    return results
 
 
 # Error handlers
@@ -0,0 +1,263 @@
+"""
+Model Registry Module
+Process-wide registry that loads models lazily on first use and shares them
+between components. Rarely used models can be unloaded in least recently used
+order to stay within a memory budget.
+"""
+
+import gc
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def resident_memory_mb() -> Optional[float]:
+    """
+    Get the resident memory of the current process.
+    
+    Returns:
+        Resident set size in megabytes, or None if it cannot be determined
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Registry of lazily loaded, shared models.
+    
+    Each model is registered under a key with a loader function. The first
+    get() call loads it; later calls return the same instance. Load time and
+    the change in resident memory during loading are recorded per model.
+    """
+    
+    def __init__(self, memory_budget_mb: float = 0):
+        """
+        Initialize the registry.
+        
+        Args:
+            memory_budget_mb: Memory allowed for evictable models (0 = unlimited)
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self._loaders = {}
+        self._evictable = {}
+        self._models = OrderedDict()  # Least recently used first
+        self._stats = {}
+        self._loading = {}  # Key -> Future of a load in progress
+        self._lock = threading.RLock()
+    
+    def register(self, key: str, loader: Callable[[], Any], evictable: bool = True) -> bool:
+        """
+        Register a model loader without loading the model.
+        
+        Args:
+            key: Model key, shared by all components using the same model
+            loader: Function returning the loaded model
+            evictable: Whether the model may be unloaded to stay within the budget
+        
+        Returns:
+            False if a loader was already registered for the key
+        """
+        with self._lock:
+            if key in self._loaders:
+                return False
+            
+            self._loaders[key] = loader
+            self._evictable[key] = evictable
+            self._stats[key] = {
+                'loaded': False,
+                'loading': False,
+                'evictable': evictable,
+                'load_count': 0,
+                'load_time': None,
+                'resident_mb': None,
+                'uses': 0,
+                'last_used': None
+            }
+            return True
+    
+    def get(self, key: str) -> Any:
+        """
+        Get a model, loading it on first use.
+        
+        The registry lock is only held to look up or insert entries. The
+        loader runs outside it, so status() and loads of other models are
+        not blocked; concurrent callers of the same cold key wait on a
+        shared per-key future and the loader runs once.
+        
+        Args:
+            key: Model key
+        
+        Returns:
+            Loaded model
+        
+        Raises:
+            KeyError: If no loader is registered for the key
+            Exception: Whatever the loader raised, for every waiting caller
+        """
+        with self._lock:
+            if key not in self._loaders:
+                raise KeyError(f"No model registered for key: {key}")
+            
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._record_use(key)
+                return self._models[key]
+            
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[key] = future
+                self._stats[key]['loading'] = True
+        
+        if not owner:
+            model = future.result()
+            with self._lock:
+                self._record_use(key)
+            return model
+        
+        try:
+            model, load_time, resident_mb = self._load(key)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+                self._stats[key]['loading'] = False
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._models[key] = model
+            stats = self._stats[key]
+            stats.update(
+                loaded=True,
+                loading=False,
+                load_count=stats['load_count'] + 1,
+                load_time=round(load_time, 3),
+                resident_mb=resident_mb
+            )
+            self._loading.pop(key, None)
+            self._record_use(key)
+            evicted = self._evict(keep=key)
+        
+        future.set_result(model)
+        if evicted:
+            gc.collect()
+        return model
+    
+    def _record_use(self, key: str):
+        """Count a use of a model (caller holds the lock)."""
+        stats = self._stats[key]
+        stats['uses'] += 1
+        stats['last_used'] = time.time()
+    
+    def _load(self, key: str):
+        """
+        Run a model's loader without holding the registry lock.
+        
+        The resident memory delta is approximate when other models load
+        at the same time.
+        
+        Returns:
+            Tuple of (model, load time in seconds, resident MB or None)
+        """
+        memory_before = resident_memory_mb()
+        start_time = time.perf_counter()
+        
+        model = self._loaders[key]()
+        
+        load_time = time.perf_counter() - start_time
+        memory_after = resident_memory_mb()
+        logger.info(f"Loaded model '{key}' in {load_time:.2f}s")
+        
+        resident_mb = (
+            round(max(memory_after - memory_before, 0.0), 1)
+            if memory_before is not None and memory_after is not None else None
+        )
+        return model, load_time, resident_mb
+    
+    def _evict(self, keep: str) -> int:
+        """
+        Drop least recently used evictable models while over budget (caller holds the lock).
+        
+        Returns:
+            Number of models dropped; the caller collects garbage after releasing the lock
+        """
+        if not self.memory_budget_mb:
+            return 0
+        
+        evicted = 0
+        for key in list(self._models):
+            if self.evictable_memory_mb() <= self.memory_budget_mb:
+                break
+            if key != keep and self._evictable[key]:
+                logger.info(f"Unloading model '{key}' to stay within {self.memory_budget_mb} MB")
+                del self._models[key]
+                self._stats[key]['loaded'] = False
+                evicted += 1
+        return evicted
+    
+    def unload(self, key: str) -> bool:
+        """
+        Unload a model. It is loaded again on next use.
+        
+        Args:
+            key: Model key
+        
+        Returns:
+            True if the model was loaded
+        """
+        with self._lock:
+            if self._models.pop(key, None) is None:
+                return False
+            
+            self._stats[key]['loaded'] = False
+        
+        gc.collect()
+        return True
+    
+    def is_loaded(self, key: str) -> bool:
+        """Check whether a model is currently loaded."""
+        with self._lock:
+            return key in self._models
+    
+    def evictable_memory_mb(self) -> float:
+        """Get the recorded resident size of loaded evictable models."""
+        with self._lock:
+            return sum(
+                self._stats[key]['resident_mb'] or 0.0
+                for key in self._models if self._evictable[key]
+            )
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+        
+        Returns:
+            Memory budget, resident memory and per-model load statistics
+        """
+        with self._lock:
+            return {
+                'memory_budget_mb': self.memory_budget_mb,
+                'evictable_memory_mb': round(self.evictable_memory_mb(), 1),
+                'process_resident_mb': resident_memory_mb(),
+                'models': {key: dict(stats) for key, stats in self._stats.items()}
+            }
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    return _registry
@@ -0,0 +1,199 @@
+"""
+Normalization Module
+Memoized normalization of matched date and amount strings. Documents repeat
+the same few dates and amounts, so parsed values are kept in bounded LRU
+caches. Dates in the numeric and month-name formats matched by the default
+patterns are parsed by a strict fast path; anything else goes to dateparser.
+"""
+
+import re
+import logging
+import threading
+from collections import Counter
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import dateparser
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9, 'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+}
+
+_YEAR_MONTH_DAY = re.compile(r'(\d{4})([/-])(\d{1,2})\2(\d{1,2})')
+_MONTH_DAY_YEAR = re.compile(r'(\d{1,2})([/-])(\d{1,2})\2(\d{2}|\d{4})')
+_MONTH_NAME_DAY_YEAR = re.compile(r'([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})')
+_DAY_MONTH_NAME_YEAR = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})')
+
+_AMOUNT_NUMBER = re.compile(r'[\d,]+(?:\.\d{2})?')
+_AMOUNT_CURRENCY = re.compile(r'(USD|EUR|GBP|JPY|CNY|AUD|CAD|\$)', re.IGNORECASE)
+
+
+def parse_date_strict(text: str) -> Optional[datetime]:
+    """
+    Parse a date in one of the common unambiguous formats.
+    
+    Numeric dates are read month first and two-digit years pivot at 69, as
+    dateparser does with its default settings. Texts in any other format,
+    and impossible dates in these formats, return None so the caller can
+    fall back to dateparser.
+    
+    Args:
+        text: Date string
+    
+    Returns:
+        Parsed date at midnight, or None
+    """
+    match = _YEAR_MONTH_DAY.fullmatch(text)
+    if match:
+        year, month, day = int(match.group(1)), int(match.group(3)), int(match.group(4))
+    else:
+        match = _MONTH_DAY_YEAR.fullmatch(text)
+        if match:
+            month, day, year = int(match.group(1)), int(match.group(3)), int(match.group(4))
+            if len(match.group(4)) == 2:
+                year += 1900 if year >= 69 else 2000
+        else:
+            match = _MONTH_NAME_DAY_YEAR.fullmatch(text)
+            if match:
+                month, day, year = MONTHS.get(match.group(1).lower()), int(match.group(2)), int(match.group(3))
+            else:
+                match = _DAY_MONTH_NAME_YEAR.fullmatch(text)
+                if not match:
+                    return None
+                day, month, year = int(match.group(1)), MONTHS.get(match.group(2).lower()), int(match.group(3))
+    
+    if month is None:
+        return None
+    
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+class ValueNormalizer:
+    """
+    Memoizing normalizer for date and amount strings.
+    
+    Each distinct string is parsed once until it drops out of the LRU cache.
+    Counters record cache hits and how many dates the fast path parsed.
+    """
+    
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            cache_size: Maximum cached strings per value type
+        """
+        self.cache_size = cache_size
+        self._counters = Counter()
+        self._lock = threading.Lock()
+        self._parse_date_cached = lru_cache(maxsize=cache_size)(self._parse_date)
+        self._normalize_amount_cached = lru_cache(maxsize=cache_size)(self._normalize_amount)
+    
+    def parse_date(self, text: str) -> Optional[datetime]:
+        """
+        Parse a date string.
+        
+        Args:
+            text: Date string
+        
+        Returns:
+            Parsed date, or None if the text is not a date
+        """
+        # Relative dates ('Monday') depend on the current day, so cached values are per day
+        return self._parse_date_cached(text, date.today())
+    
+    def _parse_date(self, text: str, today: date) -> Optional[datetime]:
+        """Parse a date string without the cache."""
+        parsed = parse_date_strict(text)
+        if parsed is not None:
+            self._count('date_fast_path')
+            return parsed
+        
+        self._count('date_dateparser')
+        return dateparser.parse(text)
+    
+    def normalize_amount(self, text: str) -> Optional[Tuple[float, str]]:
+        """
+        Normalize a monetary amount string.
+        
+        Args:
+            text: Amount string
+        
+        Returns:
+            Tuple of (numeric value, currency code), or None if the text has no number
+        """
+        return self._normalize_amount_cached(text)
+    
+    def _normalize_amount(self, text: str) -> Optional[Tuple[float, str]]:
+        """Normalize a monetary amount string without the cache."""
+        numeric_match = _AMOUNT_NUMBER.search(text)
+        if not numeric_match:
+            return None
+        
+        try:
+            numeric_value = float(numeric_match.group().replace(',', ''))
+        except ValueError:
+            return None
+        
+        # Detect currency
+        currency = 'USD'  # default
+        currency_match = _AMOUNT_CURRENCY.search(text)
+        if currency_match and currency_match.group() != '$':
+            currency = currency_match.group().upper()
+        
+        return numeric_value, currency
+    
+    def _count(self, counter: str):
+        """Increment a statistics counter."""
+        with self._lock:
+            self._counters[counter] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get normalization statistics.
+        
+        Returns:
+            Lookups, cache hits and fast path rate per value type
+        """
+        date_info = self._parse_date_cached.cache_info()
+        amount_info = self._normalize_amount_cached.cache_info()
+        
+        with self._lock:
+            fast_path = self._counters['date_fast_path']
+            dateparser_calls = self._counters['date_dateparser']
+        
+        def cache_stats(info) -> Dict[str, Any]:
+            lookups = info.hits + info.misses
+            return {
+                'lookups': lookups,
+                'cache_hits': info.hits,
+                'cache_hit_rate': info.hits / lookups if lookups else 0.0,
+                'cached': info.currsize
+            }
+        
+        return {
+            'cache_size': self.cache_size,
+            'dates': dict(
+                cache_stats(date_info),
+                fast_path=fast_path,
+                dateparser=dateparser_calls,
+                fast_path_rate=fast_path / (fast_path + dateparser_calls) if fast_path + dateparser_calls else 0.0
+            ),
+            'amounts': cache_stats(amount_info)
+        }
+    
+    def clear(self):
+        """Empty the caches and reset the counters."""
+        self._parse_date_cached.cache_clear()
+        self._normalize_amount_cached.cache_clear()
+        with self._lock:
+            self._counters.clear()
@@ -8,19 +8,37 @@ import sys
 import os
 import time
 import json
+import re
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
 # Add the package to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
+    import pandas as pd
+    import spacy
+    import dateparser
+    import torch
+    from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast, pipeline
+    from transformers.modeling_outputs import TokenClassifierOutput
     from entity_extractor import EntityExtractor, FormFieldExtractor
-    from classifier import DataClassificationPipeline
+    from classifier import (
+        DataClassificationPipeline, TextClassifier, AdvancedEntityClassifier, INFERENCE_BACKENDS
+    )
     from config import get_config
+    import model_registry
+    from model_registry import ModelRegistry
+    from batching import MicroBatcher
+    from batch_jobs import BatchJobManager
+    from job_store import InMemoryJobStore, FINISHED_STATUSES
+    from normalization import ValueNormalizer, parse_date_strict
+    from language_detection import LanguageDetector
 except ImportError as e:
-    print(f"Import error: {e}")
-    print("Please install required dependencies: pip install -r requirements.txt")
-    sys.exit(1)
+    raise ImportError(f"{e}. Please install required dependencies: pip install -r requirements.txt") from e
 
 
 class NLPPipelineTester:
@@ -53,6 +71,38 @@ class NLPPipelineTester:
             print(f"✗ Setup failed: {e}")
             return False
     
+    def check(self, test: str, name: str, passed: bool, detail: Any = None):
+        """Record and print the outcome of one check."""
+        print(f"  {'✓' if passed else '✗'} {name}" + (f" ({detail})" if detail is not None and not passed else ""))
+        self.test_results.append({
+            'test': test,
+            'check': name,
+            'detail': detail,
+            'success': bool(passed)
+        })
+    
+    def blank_extractor(self, **kwargs) -> EntityExtractor:
+        """
+        Create an entity extractor backed by a blank English spaCy pipeline.
+        
+        The pipeline is registered under the default English model key of a
+        private registry, so no pretrained spaCy model is needed.
+        """
+        def load_blank_english():
+            nlp = spacy.blank('en')
+            ruler = nlp.add_pipe('entity_ruler')
+            ruler.add_patterns([
+                {'label': 'PERSON', 'pattern': 'John Smith'},
+                {'label': 'PERSON', 'pattern': 'Jane Doe'},
+                {'label': 'ORG', 'pattern': 'Microsoft Corporation'},
+                {'label': 'GPE', 'pattern': 'New York'}
+            ])
+            return nlp
+        
+        registry = kwargs.pop('registry', None) or ModelRegistry()
+        registry.register(f"spacy:{EntityExtractor.FALLBACK_SPACY_MODEL}", load_blank_english)
+        return EntityExtractor(registry=registry, **kwargs)
+    
     def test_entity_extraction(self):
         """Test entity extraction functionality."""
         print("Testing Entity Extraction")
@@ -347,26 +397,671 @@ class NLPPipelineTester:
         
         print()
     
+    def test_pattern_matcher(self):
+        """Test that the compiled pattern matcher finds the same spans as scanning each raw pattern."""
+        print("Testing Pattern Matcher")
+        print("-" * 30)
+        
+        texts = [
+            "John Smith lives at 123 Main Street, New York. Email: john.smith@example.com, Phone: (555) 123-4567.",
+            "Invoice dated 01/15/2024 and March 3, 2024: total $1,500.00 or 1200 EUR, due Friday.",
+            "Call +44 2071234567 or 555.987.6543; office at 9 Tower Lane Suite 4B.",
+            "Product codes AB1234 and cd5678 ship on 2024-02-29.",
+            ""
+        ]
+        
+        try:
+            extractor = self.blank_extractor(languages=['en'])
+            extractor.add_custom_pattern('PRODUCT_CODE', r'[A-Z]{2}\d{4}')
+            # A later pattern of an existing type is grouped with the other patterns of that type
+            extractor.add_custom_pattern('DATE', r'\b\d{4}-\d{2}-\d{2}\b')
+            duplicate_added = extractor.pattern_matcher.add('DATE', r'\b\d{4}-\d{2}-\d{2}\b')
+            self.check('pattern_matcher', "duplicate pattern is not added again", duplicate_added is False)
+            
+            matcher = extractor.pattern_matcher
+            for i, text in enumerate(texts, 1):
+                expected = [
+                    (entity_type, match.start(), match.end())
+                    for entity_type, patterns in extractor.custom_patterns.items()
+                    for pattern in patterns
+                    for match in re.finditer(pattern, text, re.IGNORECASE)
+                ]
+                spans = [(entity_type, match.start(), match.end()) for entity_type, match in matcher.scan(text)]
+                self.check('pattern_matcher', f"text {i}: scan matches per-pattern finditer", spans == expected,
+                           (spans, expected))
+            
+            # scan_many reports the same matches per text as scan
+            found = [[] for _ in texts]
+            for entity_type, index, match_text in matcher.scan_many(texts):
+                found[index].append((entity_type, match_text))
+            expected = [[(entity_type, match.group()) for entity_type, match in matcher.scan(text)] for text in texts]
+            self.check('pattern_matcher', "scan_many matches scan per text", found == expected)
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'pattern_matcher',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_model_registry(self):
+        """Test that each model loads once under concurrency and that eviction is least recently used."""
+        print("Testing Model Registry")
+        print("-" * 30)
+        
+        try:
+            registry = ModelRegistry()
+            loads = []
+            
+            def slow_loader():
+                loads.append(threading.get_ident())
+                time.sleep(0.2)
+                return object()
+            
+            registry.register('slow', slow_loader)
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                models = list(pool.map(lambda _: registry.get('slow'), range(8)))
+            self.check('model_registry', "concurrent gets load once", len(loads) == 1, len(loads))
+            self.check('model_registry', "concurrent gets share the instance", len({id(m) for m in models}) == 1)
+            self.check('model_registry', "uses counted", registry.status()['models']['slow']['uses'] == 8)
+            
+            # A failed load reaches every waiter and is retried on the next get
+            attempts = []
+            
+            def failing_loader():
+                attempts.append(1)
+                time.sleep(0.1)
+                if len(attempts) == 1:
+                    raise OSError("model files missing")
+                return 'loaded'
+            
+            def get_failing(_):
+                try:
+                    return registry.get('failing')
+                except OSError as e:
+                    return e
+            
+            registry.register('failing', failing_loader)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                outcomes = list(pool.map(get_failing, range(4)))
+            self.check('model_registry', "load error raised in every waiter",
+                       len(attempts) == 1 and all(isinstance(o, OSError) for o in outcomes), outcomes)
+            self.check('model_registry', "failed load retried", registry.get('failing') == 'loaded')
+            
+            # Every load appears to add 20 MB of resident memory
+            resident = iter(range(0, 10000, 20))
+            original_resident_memory_mb = model_registry.resident_memory_mb
+            model_registry.resident_memory_mb = lambda: next(resident)
+            try:
+                registry = ModelRegistry(memory_budget_mb=50)
+                for key in ('a', 'b', 'c', 'd'):
+                    registry.register(key, lambda key=key: key)
+                registry.register('pinned', lambda: 'pinned', evictable=False)
+                
+                registry.get('pinned')
+                registry.get('a')
+                registry.get('b')
+                registry.get('a')  # b is now least recently used
+                registry.get('c')
+                loaded = [key for key in ('pinned', 'a', 'b', 'c', 'd') if registry.is_loaded(key)]
+                self.check('model_registry', "least recently used model evicted", loaded == ['pinned', 'a', 'c'], loaded)
+                
+                registry.get('b')
+                loaded = [key for key in ('pinned', 'a', 'b', 'c', 'd') if registry.is_loaded(key)]
+                stats = registry.status()
+                self.check('model_registry', "evicted model reloaded on use",
+                           loaded == ['pinned', 'b', 'c'] and stats['models']['b']['load_count'] == 2, loaded)
+                self.check('model_registry', "within budget", stats['evictable_memory_mb'] <= 50,
+                           stats['evictable_memory_mb'])
+            finally:
+                model_registry.resident_memory_mb = original_resident_memory_mb
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'model_registry',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_micro_batching(self):
+        """Test that the micro-batcher flushes at the batch size and at the deadline and propagates errors."""
+        print("Testing Micro-batching")
+        print("-" * 30)
+        
+        async def run_batcher(batcher, texts):
+            started = time.monotonic()
+            results = await asyncio.gather(*(batcher.submit(text) for text in texts), return_exceptions=True)
+            elapsed = time.monotonic() - started
+            metrics = batcher.metrics()
+            await batcher.close()
+            return results, elapsed, metrics
+        
+        try:
+            batches = []
+            
+            def upper_batch(texts):
+                batches.append(list(texts))
+                return [text.upper() for text in texts]
+            
+            # A full batch is flushed without waiting for the deadline
+            batcher = MicroBatcher("size", upper_batch, max_batch_size=4, max_wait_ms=10000)
+            texts = ['ccc', 'a', 'dddd', 'bb']
+            results, elapsed, metrics = asyncio.run(run_batcher(batcher, texts))
+            self.check('micro_batching', "full batch flushed before the deadline", elapsed < 5, f"{elapsed:.2f}s")
+            self.check('micro_batching', "one batch of four", metrics['batch_size_histogram'] == {'4': 1},
+                       metrics['batch_size_histogram'])
+            self.check('micro_batching', "texts sorted by length", batches[-1] == ['a', 'bb', 'ccc', 'dddd'], batches)
+            self.check('micro_batching', "results returned to their requests",
+                       results == [text.upper() for text in texts], results)
+            
+            # A partial batch is flushed when the oldest request reaches the deadline
+            batcher = MicroBatcher("deadline", upper_batch, max_batch_size=100, max_wait_ms=100)
+            results, elapsed, metrics = asyncio.run(run_batcher(batcher, ['x', 'y', 'z']))
+            self.check('micro_batching', "partial batch flushed at the deadline",
+                       0.09 <= elapsed < 5 and metrics['batch_size_histogram'] == {'3': 1},
+                       (f"{elapsed:.2f}s", metrics['batch_size_histogram']))
+            self.check('micro_batching', "partial batch results", results == ['X', 'Y', 'Z'], results)
+            
+            # A failing batch raises the error in every waiting request
+            def failing_batch(texts):
+                raise RuntimeError("inference failed")
+            
+            batcher = MicroBatcher("failing", failing_batch, max_batch_size=3, max_wait_ms=10000)
+            results, _, metrics = asyncio.run(run_batcher(batcher, ['p', 'q', 'r']))
+            self.check('micro_batching', "error raised in every request",
+                       all(isinstance(result, RuntimeError) for result in results), results)
+            self.check('micro_batching', "error counted", metrics['errors'] == 1, metrics['errors'])
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'micro_batching',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_inference_backend(self):
+        """Test that the inference backend is validated when a classifier is created."""
+        print("Testing Inference Backend")
+        print("-" * 30)
+        
+        try:
+            for classifier_class in (TextClassifier, AdvancedEntityClassifier):
+                try:
+                    classifier_class(registry=ModelRegistry(), backend='tensorrt')
+                    rejected = False
+                except ValueError:
+                    rejected = True
+                self.check('inference_backend', f"{classifier_class.__name__} rejects unknown backend", rejected)
+                
+                registry = ModelRegistry()
+                keys = {classifier_class(registry=registry, backend=backend).model_key for backend in INFERENCE_BACKENDS}
+                self.check('inference_backend', f"{classifier_class.__name__} accepts every backend without loading",
+                           len(keys) == len(INFERENCE_BACKENDS) and not any(registry.is_loaded(key) for key in keys),
+                           keys)
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'inference_backend',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def tiny_ner_pipeline(self, model_max_length: int = 16):
+        """
+        Build a NER pipeline around a tiny local BERT tagger.
+        
+        The tagger labels every 'alice' token B-PER and everything else O,
+        so window merging can be checked without a pretrained model.
+        """
+        words = ['alice', 'met', 'the', 'team', 'at', 'noon', 'and', 'left', 'early']
+        vocab_dir = tempfile.mkdtemp()
+        vocab_file = os.path.join(vocab_dir, 'vocab.txt')
+        with open(vocab_file, 'w') as f:
+            f.write('\n'.join(['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + words))
+        tokenizer = BertTokenizerFast(vocab_file, model_max_length=model_max_length)
+        
+        config = BertConfig(
+            vocab_size=len(words) + 5, hidden_size=8, num_hidden_layers=1, num_attention_heads=1,
+            intermediate_size=8, max_position_embeddings=model_max_length,
+            id2label={0: 'O', 1: 'B-PER'}, label2id={'O': 0, 'B-PER': 1}
+        )
+        model = BertForTokenClassification(config).eval()
+        person_id = tokenizer.convert_tokens_to_ids('alice')
+        
+        def tag_forward(input_ids=None, **kwargs):
+            logits = torch.zeros(*input_ids.shape, 2)
+            logits[..., 0] = 1.0
+            logits[..., 1] = (input_ids == person_id).float() * 2
+            return TokenClassifierOutput(logits=logits)
+        
+        model.forward = tag_forward
+        return pipeline('ner', model=model, tokenizer=tokenizer, aggregation_strategy='simple', device=-1)
+    
+    def test_ner_windows(self):
+        """Test that long texts are split into overlapping NER windows and entities are merged."""
+        print("Testing NER Windows")
+        print("-" * 30)
+        
+        class RecordingPipeline:
+            """Pass calls through to a pipeline and record the keyword arguments."""
+            
+            def __init__(self, ner_pipeline):
+                self.ner_pipeline = ner_pipeline
+                self.tokenizer = ner_pipeline.tokenizer
+                self.calls = []
+            
+            def __call__(self, inputs, **kwargs):
+                self.calls.append(kwargs)
+                return self.ner_pipeline(inputs, **kwargs)
+        
+        def entity_classifier(window_overlap, **kwargs):
+            registry = ModelRegistry()
+            recorder = RecordingPipeline(self.tiny_ner_pipeline())
+            registry.register("ner:tiny-tagger:pytorch", lambda: {'tokenizer': recorder.tokenizer, 'model': None,
+                                                                   'pipeline': recorder})
+            classifier = AdvancedEntityClassifier(model_name='tiny-tagger', registry=registry,
+                                                  window_overlap=window_overlap, window_batch_size=4, **kwargs)
+            return classifier, recorder
+        
+        try:
+            for window_overlap in (-1, 256):
+                try:
+                    AdvancedEntityClassifier(registry=ModelRegistry(), window_overlap=window_overlap, max_length=512)
+                    rejected = False
+                except ValueError:
+                    rejected = True
+                self.check('ner_windows', f"overlap {window_overlap} rejected for 512-token windows", rejected)
+            
+            # 'alice' every 42 characters: six entities spread over many 16-token windows
+            text = ' '.join(['the team met at noon and alice left early'] * 6)
+            expected = [(start, start + 5) for start in range(len(text)) if text.startswith('alice', start)]
+            
+            tokenizer = self.tiny_ner_pipeline().tokenizer
+            windows = tokenizer(text, truncation=True, stride=4, return_overflowing_tokens=True)['input_ids']
+            person_id = tokenizer.convert_tokens_to_ids('alice')
+            tokens_seen = sum(window.count(person_id) for window in windows)
+            
+            classifier, recorder = entity_classifier(4)
+            entities = classifier.classify_entities(text)
+            spans = [(e['start'], e['end']) for e in entities]
+            self.check('ner_windows', "pipeline called with stride and batch size",
+                       recorder.calls == [{'batch_size': 4, 'stride': 4}], recorder.calls)
+            self.check('ner_windows', "windows overlap on entities", tokens_seen > len(expected), tokens_seen)
+            self.check('ner_windows', "entities in overlaps merged, offsets in the whole text",
+                       spans == expected and all(e['entity_group'] == 'PER' for e in entities), spans)
+            
+            batch_entities = classifier.classify_entities_batch([text, 'alice left'])
+            self.check('ner_windows', "batched texts windowed separately",
+                       [len(entities) for entities in batch_entities] == [len(expected), 1]
+                       and recorder.calls[-1] == {'batch_size': 4, 'stride': 4}, recorder.calls[-1])
+            
+            # An overlap that the tokenizer's windows cannot hold truncates instead
+            classifier, recorder = entity_classifier(8)
+            entities = classifier.classify_entities(text)
+            self.check('ner_windows', "overlap too large for the tokenizer truncates",
+                       recorder.calls == [{'batch_size': 4}] and len(entities) == 1, recorder.calls)
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'ner_windows',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_batch_jobs(self):
+        """Test chunked batch job progress, cancellation and failure."""
+        print("Testing Batch Jobs")
+        print("-" * 30)
+        
+        def wait_for_status(store, job_id, timeout=10.0):
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                job = store.get_job(job_id)
+                if job['status'] in FINISHED_STATUSES:
+                    return job
+                time.sleep(0.01)
+            return store.get_job(job_id)
+        
+        manager = None
+        try:
+            store = InMemoryJobStore()
+            progress_seen = []
+            submitted = threading.Event()
+            
+            def process_chunk(texts, tasks, language):
+                submitted.wait(10)
+                progress_seen.append(store.get_job(job_id)['processed'])
+                return [{'length': len(text), 'language': language} for text in texts]
+            
+            manager = BatchJobManager(store, process_chunk, chunk_size=3, max_workers=1)
+            texts = [f"text {i}" * (i + 1) for i in range(10)]
+            job_id = manager.submit(texts, ['entities'], language='en')
+            submitted.set()
+            job = wait_for_status(store, job_id)
+            results = store.get_results(job_id)
+            self.check('batch_jobs', "job completed", job['status'] == 'completed' and job['progress'] == 1.0, job)
+            self.check('batch_jobs', "progress updated after every chunk", progress_seen == [0, 3, 6, 9], progress_seen)
+            self.check('batch_jobs', "results appended in order",
+                       [r['text_index'] for r in results] == list(range(10))
+                       and [r['results']['length'] for r in results] == [len(text) for text in texts]
+                       and all(r['results']['language'] == 'en' for r in results), results[:2])
+            manager.shutdown()
+            
+            # Cancel a running job after its first chunk, and a queued job before it starts
+            store = InMemoryJobStore()
+            first_chunk_started = threading.Event()
+            release_first_chunk = threading.Event()
+            chunks_run = []
+            
+            def blocking_chunk(texts, tasks, language):
+                chunks_run.append(list(texts))
+                first_chunk_started.set()
+                release_first_chunk.wait(10)
+                return [{} for _ in texts]
+            
+            manager = BatchJobManager(store, blocking_chunk, chunk_size=2, max_workers=1)
+            running_id = manager.submit(['a', 'b', 'c', 'd', 'e'], ['entities'])
+            queued_id = manager.submit(['f', 'g'], ['entities'])
+            first_chunk_started.wait(10)
+            
+            queued_cancelled = manager.cancel(queued_id)
+            queued_job = store.get_job(queued_id)
+            self.check('batch_jobs', "queued job cancelled before it runs",
+                       queued_cancelled and queued_job['status'] == 'cancelled', queued_job)
+            
+            manager.cancel(running_id)
+            release_first_chunk.set()
+            running_job = wait_for_status(store, running_id)
+            self.check('batch_jobs', "running job stops after its current chunk",
+                       running_job['status'] == 'cancelled' and running_job['processed'] == 2
+                       and len(store.get_results(running_id)) == 2, running_job)
+            self.check('batch_jobs', "cancelled jobs run no further chunks", chunks_run == [['a', 'b']], chunks_run)
+            self.check('batch_jobs', "unknown job not cancellable", manager.cancel('batch_missing') is False)
+            manager.shutdown()
+            
+            # A failing chunk fails the job and keeps the earlier results
+            store = InMemoryJobStore()
+            
+            def failing_chunk(texts, tasks, language):
+                if 'bad' in texts:
+                    raise RuntimeError("model crashed")
+                return [{} for _ in texts]
+            
+            manager = BatchJobManager(store, failing_chunk, chunk_size=2, max_workers=1)
+            job_id = manager.submit(['a', 'b', 'bad', 'c'], ['entities'])
+            job = wait_for_status(store, job_id)
+            self.check('batch_jobs', "failing chunk fails the job",
+                       job['status'] == 'failed' and job['error_message'] == 'model crashed'
+                       and job['processed'] == 2 and len(store.get_results(job_id)) == 2, job)
+            
+            # Classification of a chunk makes one batched NER call
+            classifier = DataClassificationPipeline(config={'backend': 'pytorch'})
+            ner_batches = []
+            
+            def classify_entities_batch(texts):
+                ner_batches.append(len(texts))
+                return [[{'word': 'ACME', 'entity_group': 'ORG', 'score': 0.9, 'start': 0, 'end': 4}] for _ in texts]
+            
+            classifier.entity_classifier.classify_entities_batch = classify_entities_batch
+            chunk = ["ACME invoice total: $100", "ACME contract agreement", "ACME report summary"]
+            classifications = classifier.classify_data_batch(chunk)
+            self.check('batch_jobs', "one NER call per chunk", ner_batches == [3], ner_batches)
+            self.check('batch_jobs', "batched entities used per text",
+                       all(c['classification_tasks']['entities'][0]['word'] == 'ACME' for c in classifications),
+                       classifications[0])
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'batch_jobs',
+                'error': str(e),
+                'success': False
+            })
+        finally:
+            if manager is not None:
+                manager.shutdown()
+        
+        print()
+    
+    def test_dataframe_extraction(self):
+        """Test that vectorized DataFrame extraction matches extracting row by row."""
+        print("Testing DataFrame Extraction")
+        print("-" * 30)
+        
+        texts = [
+            "John Smith lives at 123 Main Street, New York. Email: john.smith@example.com, Phone: (555) 123-4567.",
+            "Invoice from Microsoft Corporation dated 01/15/2024, total $1,500.00 or 1200 EUR.",
+            "Invalid date 13/45/2023 next to a valid 2024-02-29 and March 3, 2024.",
+            "Jane Doe paid $75 on Friday; code AB1234 refers to order 555.987.6543.",
+            "John Smith lives at 123 Main Street, New York. Email: john.smith@example.com, Phone: (555) 123-4567.",
+            "Nothing to see here."
+        ]
+        
+        try:
+            extractor = self.blank_extractor(languages=['en'])
+            extractor.add_custom_pattern('PRODUCT_CODE', r'[A-Z]{2}\d{4}')
+            df = pd.DataFrame({'id': range(len(texts)), 'text': texts}, index=range(100, 100 + len(texts)))
+            
+            # Row-by-row reference, as extract_from_dataframe used to build it
+            # (dates and amounts keep the matched string in 'original_text')
+            rows = []
+            for _, row in df.iterrows():
+                entities = extractor.extract_all_entities(str(row['text']), 'en')
+                result_row = row.to_dict()
+                for entity_type, entity_list in entities.items():
+                    result_row[f'{entity_type}_count'] = len(entity_list)
+                    result_row[f'{entity_type}_text'] = ', '.join(
+                        [e.get('original_text', e.get('text')) for e in entity_list]
+                    )
+                rows.append(result_row)
+            expected = pd.DataFrame(rows)
+            
+            result = extractor.extract_from_dataframe(df, 'text', language='en', chunk_size=4)
+            self.check('dataframe_extraction', "same columns in the same order",
+                       list(result.columns) == list(expected.columns), list(result.columns))
+            self.check('dataframe_extraction', "input index kept", list(result.index) == list(df.index))
+            for column in expected.columns:
+                self.check('dataframe_extraction', f"column {column} matches",
+                           list(result[column]) == list(expected[column]),
+                           (list(result[column]), list(expected[column])))
+            
+            # Blank texts get zero counts instead of missing values
+            blank = extractor.extract_from_dataframe(pd.DataFrame({'text': ['', '   ']}), 'text')
+            self.check('dataframe_extraction', "blank texts have no entities",
+                       all((blank[f'{category}_count'] == 0).all() and (blank[f'{category}_text'] == '').all()
+                           for category in extractor.ENTITY_CATEGORIES))
+            
+            empty = extractor.extract_from_dataframe(pd.DataFrame({'text': []}), 'text')
+            self.check('dataframe_extraction', "empty frame gets the entity columns",
+                       len(empty) == 0 and list(empty.columns) == list(expected.columns[1:]), list(empty.columns))
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'dataframe_extraction',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_normalization(self):
+        """Test the strict date fast path against dateparser and the normalization caches."""
+        print("Testing Normalization")
+        print("-" * 30)
+        
+        fast_path_dates = [
+            '2024-01-15', '2024/3/7', '01/15/2024', '1/5/24', '12-31-1999', '01/02/68', '01/02/69', '12/31/00',
+            'March 3, 2024', 'Sept 9 2021', '3 March 2024', '29 Feb 2024'
+        ]
+        
+        try:
+            for text in fast_path_dates:
+                parsed = parse_date_strict(text)
+                expected = dateparser.parse(text)
+                self.check('normalization', f"fast path '{text}' matches dateparser",
+                           parsed is not None and parsed == expected, (parsed, expected))
+            
+            # Two-digit years pivot at 69
+            self.check('normalization', "two-digit year 68 is 2068", parse_date_strict('01/02/68').year == 2068)
+            self.check('normalization', "two-digit year 69 is 1969", parse_date_strict('01/02/69').year == 1969)
+            
+            # Impossible dates and other formats are left to dateparser
+            for text in ['02/30/2024', 'Feb 29, 2023', '13/45/2023', 'Smarch 3, 2024', '2024/13/01', '15th of March 2024']:
+                self.check('normalization', f"'{text}' not parsed by the fast path", parse_date_strict(text) is None)
+            
+            normalizer = ValueNormalizer(cache_size=16)
+            results = {
+                text: normalizer.parse_date(text)
+                for text in ['01/15/2024', '02/30/2024', '2024/13/01', '15th of March 2024']
+            }
+            self.check('normalization', "invalid date is None", results['02/30/2024'] is None)
+            self.check('normalization', "dateparser fallback result kept",
+                       results['2024/13/01'] == dateparser.parse('2024/13/01')
+                       and results['15th of March 2024'] == dateparser.parse('15th of March 2024'), results)
+            
+            normalizer.parse_date('01/15/2024')
+            stats = normalizer.stats()['dates']
+            self.check('normalization', "fast path and fallback counted",
+                       stats['fast_path'] == 1 and stats['dateparser'] == 3, stats)
+            self.check('normalization', "repeated date is a cache hit", stats['cache_hits'] == 1, stats)
+            
+            amounts = [normalizer.normalize_amount(text) for text in ['$1,500.00', '1200 EUR', 'gbp 3,200.50', 'USD']]
+            self.check('normalization', "amounts normalized",
+                       amounts == [(1500.0, 'USD'), (1200.0, 'EUR'), (3200.5, 'GBP'), None], amounts)
+            
+            normalizer.clear()
+            stats = normalizer.stats()
+            self.check('normalization', "clear resets caches and counters",
+                       stats['dates']['cached'] == 0 and stats['dates']['fast_path'] == 0
+                       and stats['amounts']['cached'] == 0, stats)
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'normalization',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
+    def test_language_detection(self):
+        """Test the language detection cache and when detection is skipped."""
+        print("Testing Language Detection")
+        print("-" * 30)
+        
+        try:
+            detector = LanguageDetector(sample_chars=200)
+            english = "The quarterly report was delivered to the board of directors on time. " * 10
+            detected = detector.detect(english)
+            self.check('language_detection', "long text detected as English", detected == 'en', detected)
+            
+            # Only the first sample_chars characters are hashed, so a text with the same prefix is a hit
+            detector.detect(english + "An appendix with the detailed figures follows.")
+            stats = detector.stats()
+            self.check('language_detection', "same prefix is a cache hit",
+                       stats['detections'] == 1 and stats['cache_hits'] == 1, stats)
+            
+            # Texts shorter than the sample are hashed whole
+            short = "Bonjour, comment allez-vous aujourd'hui?"
+            first = detector.detect(short)
+            detector.detect(short)
+            detector.detect(short + " Très bien.")
+            stats = detector.stats()
+            self.check('language_detection', "short text detected", first == 'fr', first)
+            self.check('language_detection', "short text cached whole",
+                       stats['detections'] == 3 and stats['cache_hits'] == 2, stats)
+            
+            # Texts without letters cannot be detected and get the default language
+            self.check('language_detection', "undetectable text uses the default",
+                       detector.detect("12345 67890") == 'en')
+            
+            # A language hint skips detection
+            extractor = self.blank_extractor(languages=['en'])
+            entities, language = extractor.extract_all_entities_with_language("John Smith paid $40.", 'fr')
+            stats = extractor.language_detector.stats()
+            self.check('language_detection', "hint is used and not detected",
+                       language == 'fr' and stats['detections'] == 0 and stats['skipped_hint'] == 1, stats)
+            self.check('language_detection', "hinted text still extracted",
+                       [e['text'] for e in entities['persons']] == ['John Smith'], entities['persons'])
+            
+            # A configured language whose model is not installed uses the fallback model,
+            # so detection cannot change the model and is skipped
+            extractor = self.blank_extractor(languages=['en', 'xx'], spacy_models={'xx': 'xx_missing_model'})
+            _, language = extractor.extract_all_entities_with_language(short)
+            stats = extractor.language_detector.stats()
+            self.check('language_detection', "uninstalled model skips detection",
+                       language == 'en' and stats['detections'] == 0 and stats['skipped_single_model'] == 1, stats)
+            
+            # A second loaded model makes detection decide the model, and the detected language is reported
+            registry = ModelRegistry()
+            registry.register("spacy:fr_core_news_sm", lambda: spacy.blank('fr'))
+            registry.get("spacy:fr_core_news_sm")
+            extractor = self.blank_extractor(languages=['en', 'fr'], spacy_models={'fr': 'fr_core_news_sm'},
+                                             registry=registry)
+            _, language = extractor.extract_all_entities_with_language(short)
+            stats = extractor.language_detector.stats()
+            self.check('language_detection', "loaded model enables detection",
+                       language == 'fr' and stats['detections'] == 1, stats)
+            
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            self.test_results.append({
+                'test': 'language_detection',
+                'error': str(e),
+                'success': False
+            })
+        
+        print()
+    
     def run_all_tests(self):
         """Run all test suites."""
         print("=" * 60)
         print("NLP PROCESSING PIPELINE TEST SUITE")
         print("=" * 60)
         
-        if not self.setup():
-            print("Setup failed. Exiting.")
-            return
+        # Component tests use stand-in models and need no downloads
+        self.test_pattern_matcher()
+        self.test_model_registry()
+        self.test_micro_batching()
+        self.test_inference_backend()
+        self.test_ner_windows()
+        self.test_batch_jobs()
+        self.test_dataframe_extraction()
+        self.test_normalization()
+        self.test_language_detection()
         
-        # Run individual tests
-        self.test_entity_extraction()
-        self.test_date_extraction()
-        self.test_amount_extraction()
-        self.test_form_field_extraction()
-        self.test_classification()
-        self.test_custom_patterns()
+        if self.setup():
+            # Run individual tests
+            self.test_entity_extraction()
+            self.test_date_extraction()
+            self.test_amount_extraction()
+            self.test_form_field_extraction()
+            self.test_classification()
+            self.test_custom_patterns()
+        else:
+            print("Setup failed. Skipping tests that need pretrained models.\n")
         
         # Print summary
         self.print_summary()
+        
+        return all(result['success'] for result in self.test_results)
     
     def print_summary(self):
         """Print test results summary."""
@@ -424,7 +1119,8 @@ class NLPPipelineTester:
 def main():
     """Main test function."""
     tester = NLPPipelineTester()
-    tester.run_all_tests()
+    if not tester.run_all_tests():
+        sys.exit(1)
 
 
 if __name__ == "__main__":
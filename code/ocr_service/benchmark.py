@@ -0,0 +1,183 @@
+"""
+OCR Service Benchmarks
+
+Command-line benchmarks for performance-sensitive parts of the OCR service.
+
+Usage:
+    python benchmark.py engines [--images a.png b.png ...] [--pages 20]
+    python benchmark.py deskew [--images a.png b.png ...] [--pages 20] [--max-skew 4.0]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import List
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import OCRConfig
+from engines import PytesseractEngine, TesserocrEngine, TESSEROCR_AVAILABLE
+from preprocessing import DocumentPreprocessor
+
+
+SAMPLE_LINES = [
+    "INVOICE #10482 Date: 03/14/2024",
+    "Bill To: Acme Corporation",
+    "123 Main Street, Springfield",
+    "Item Qty Unit Price Amount",
+    "Consulting services 12 150.00 1800.00",
+    "Total amount due: $1,800.00",
+]
+
+
+def make_sample_pages(count: int) -> List[np.ndarray]:
+    """
+    Render synthetic single-column text pages.
+    
+    Args:
+        count: Number of pages
+        
+    Returns:
+        List of grayscale page images
+    """
+    pages = []
+    for page_num in range(count):
+        page = np.full((1400, 1000), 255, dtype=np.uint8)
+        for line_num, line in enumerate(SAMPLE_LINES * 3):
+            y = 80 + line_num * 70
+            cv2.putText(page, f"{line} ({page_num})", (60, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+        pages.append(page)
+    return pages
+
+
+def load_pages(image_paths: List[str]) -> List[np.ndarray]:
+    """Load benchmark pages from image files."""
+    pages = []
+    for path in image_paths:
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError(f"Could not load image: {path}")
+        pages.append(image)
+    return pages
+
+
+def benchmark_engines(args):
+    """Compare per-page latency of the available OCR engines."""
+    pages = load_pages(args.images) if args.images else make_sample_pages(args.pages)
+    tesseract_config = OCRConfig.get_tesseract_config(language=args.language)
+    
+    engines = [PytesseractEngine()]
+    if TESSEROCR_AVAILABLE:
+        engines.append(TesserocrEngine(pool_size=1))
+    else:
+        print("tesserocr is not installed; only benchmarking pytesseract")
+    
+    print(f"Benchmarking {len(pages)} pages, language '{args.language}', config '{tesseract_config}'")
+    print(f"{'engine':<14}{'first page (s)':>16}{'mean page (s)':>16}{'total (s)':>12}{'words':>8}")
+    
+    for engine in engines:
+        timings = []
+        words = 0
+        for page in pages:
+            start = time.perf_counter()
+            data = engine.image_to_data(page, args.language, tesseract_config)
+            timings.append(time.perf_counter() - start)
+            words += sum(1 for text in data['text'] if str(text).strip())
+        
+        # The first page includes model loading for persistent engines
+        steady = timings[1:] or timings
+        print(f"{engine.name:<14}{timings[0]:>16.3f}{np.mean(steady):>16.3f}{sum(timings):>12.2f}{words:>8}")
+        engine.close()
+
+
+def make_skewed_corpus(pages: List[np.ndarray], max_skew: float, seed: int = 0) -> List[tuple]:
+    """
+    Rotate straight pages by random known angles.
+    
+    Args:
+        pages: Unskewed grayscale pages
+        max_skew: Maximum absolute rotation in degrees
+        seed: Random seed
+        
+    Returns:
+        List of (skewed page, applied angle) tuples
+    """
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for page in pages:
+        angle = float(rng.uniform(-max_skew, max_skew))
+        rows, cols = page.shape
+        rotation_matrix = cv2.getRotationMatrix2D((cols / 2, rows / 2), angle, 1.0)
+        skewed = cv2.warpAffine(page, rotation_matrix, (cols, rows), borderValue=255)
+        corpus.append((skewed, angle))
+    return corpus
+
+
+def benchmark_deskew(args):
+    """Compare speed and accuracy of skew estimation settings on a skewed corpus."""
+    if args.images:
+        pages = load_pages(args.images)
+    else:
+        # Synthetic pages at 300 DPI letter size
+        pages = [cv2.resize(page, (2550, 3300), interpolation=cv2.INTER_LINEAR)
+                 for page in make_sample_pages(args.pages)]
+    corpus = make_skewed_corpus(pages, args.max_skew)
+    
+    settings = [
+        ('hough', 0),
+        ('hough', 1000),
+        ('projection', 0),
+        ('projection', 1000),
+        ('projection', 500),
+    ]
+    
+    print(f"Benchmarking {len(corpus)} pages skewed by up to {args.max_skew} degrees")
+    print(f"{'method':<12}{'max dim':>9}{'mean page (ms)':>16}{'mean error':>12}{'max error':>11}")
+    
+    for method, max_dim in settings:
+        preprocessor = DocumentPreprocessor(dict(
+            OCRConfig.PREPROCESSING,
+            deskew_method=method,
+            deskew_max_dim=max_dim,
+            deskew_max_angle=args.max_skew + 1
+        ))
+        
+        timings = []
+        errors = []
+        for page, applied_angle in corpus:
+            start = time.perf_counter()
+            estimated = preprocessor.estimate_skew_angle(page)
+            timings.append(time.perf_counter() - start)
+            # The correction angle undoes the applied rotation
+            errors.append(abs(estimated + applied_angle))
+        
+        label = max_dim or 'full'
+        print(f"{method:<12}{label:>9}{np.mean(timings) * 1000:>16.1f}{np.mean(errors):>12.2f}{max(errors):>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR service benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    engines_parser = subparsers.add_parser("engines", help="Compare OCR engine latency")
+    engines_parser.add_argument("--images", nargs="*", help="Page images to OCR (synthetic pages if omitted)")
+    engines_parser.add_argument("--pages", type=int, default=20, help="Number of synthetic pages")
+    engines_parser.add_argument("--language", default="eng", help="Tesseract language code")
+    engines_parser.set_defaults(func=benchmark_engines)
+    
+    deskew_parser = subparsers.add_parser("deskew", help="Compare skew estimation speed and accuracy")
+    deskew_parser.add_argument("--images", nargs="*", help="Unskewed page images (synthetic pages if omitted)")
+    deskew_parser.add_argument("--pages", type=int, default=20, help="Number of synthetic pages")
+    deskew_parser.add_argument("--max-skew", type=float, default=4.0, help="Maximum applied skew in degrees")
+    deskew_parser.set_defaults(func=benchmark_deskew)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
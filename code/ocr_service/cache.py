@@ -0,0 +1,336 @@
+"""
+OCR Result Cache Module
+
+This module provides a content-addressed cache for OCR results. Results are
+keyed by a hash of the file bytes together with every setting that affects
+the output (language, preprocessing flags and Tesseract configuration), with
+pluggable storage backends:
+- In-process LRU cache bounded by entry count and serialized size
+- On-disk store with TTL eviction
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Base class for OCR result cache backends."""
+    
+    name = "base"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached result.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached result, or None on a miss
+        """
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a result.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable result
+        """
+        raise NotImplementedError
+    
+    def clear(self):
+        """Remove all cached results."""
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by number of entries and total serialized size."""
+    
+    name = "memory"
+    
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize memory backend.
+        
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total JSON-serialized size of cached results
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Dict[str, Any]):
+        # Serialized size is a proxy for the memory a result holds on to
+        size = len(json.dumps(value, default=str))
+        
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            
+            if size > self.max_bytes:
+                logger.debug(f"OCR result of {size} bytes exceeds the memory cache budget, not cached")
+                return
+            
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+            
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(evicted_key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """On-disk cache storing one JSON file per result with TTL eviction."""
+    
+    name = "disk"
+    
+    def __init__(self, cache_dir: str, ttl: int = 86400, purge_interval: int = 100):
+        """
+        Initialize disk backend.
+        
+        Args:
+            cache_dir: Directory to store cached results in
+            ttl: Time to live of a cached result in seconds
+            purge_interval: Purge expired entries every N writes
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _path(self, key: str) -> str:
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _is_expired(self, path: str) -> bool:
+        """Check whether a cache file is older than the TTL."""
+        return time.time() - os.path.getmtime(path) > self.ttl
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        
+        try:
+            if self._is_expired(path):
+                os.remove(path)
+                return None
+            
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read OCR cache entry {key}: {str(e)}")
+            return None
+    
+    def set(self, key: str, value: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Write atomically so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, default=str)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.purge_interval == 0
+        
+        if purge:
+            self.purge_expired()
+    
+    def purge_expired(self) -> int:
+        """
+        Remove expired cache files.
+        
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    if self._is_expired(path):
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        
+        if removed:
+            logger.debug(f"Purged {removed} expired OCR cache entries")
+        return removed
+    
+    def clear(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                try:
+                    os.remove(os.path.join(root, file_name))
+                except OSError:
+                    continue
+    
+    def __len__(self) -> int:
+        return sum(
+            1 for _, _, files in os.walk(self.cache_dir)
+            for file_name in files if file_name.endswith('.json')
+        )
+
+
+class OCRResultCache:
+    """Content-addressed OCR result cache with hit/miss accounting."""
+    
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            backend: Storage backend
+            enabled: Whether lookups and stores are performed
+        """
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> 'OCRResultCache':
+        """
+        Create a cache from the CACHE configuration section.
+        
+        Args:
+            cache_config: Cache configuration dictionary
+        
+        Returns:
+            Configured cache
+        """
+        backend_name = cache_config.get('backend', 'memory')
+        
+        if backend_name == 'disk':
+            backend = DiskCacheBackend(
+                cache_config.get('disk_dir', '/tmp/ocr_service/cache'),
+                ttl=cache_config.get('ttl', 86400)
+            )
+        elif backend_name == 'memory':
+            backend = MemoryCacheBackend(
+                cache_config.get('max_entries', 1000),
+                max_bytes=cache_config.get('max_bytes', 256 * 1024 * 1024)
+            )
+        else:
+            raise ValueError(f"Unsupported cache backend: {backend_name}")
+        
+        return cls(backend, enabled=cache_config.get('enabled', True))
+    
+    @staticmethod
+    def make_key(file_path: str, settings: Dict[str, Any], chunk_size: int = 1024 * 1024) -> str:
+        """
+        Compute the cache key for a file and the settings that affect its result.
+        
+        Args:
+            file_path: Path to the input file
+            settings: JSON-serializable settings (language, preprocessing, Tesseract config)
+            chunk_size: Read size used while hashing the file
+        
+        Returns:
+            Hex digest cache key
+        """
+        digest = hashlib.sha256()
+        
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result and record a hit or miss.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached result, or None on a miss
+        """
+        value = self.backend.get(key)
+        
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        return value
+    
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a result, logging instead of failing on backend errors.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable result
+        """
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"Failed to store OCR cache entry {key}: {str(e)}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Backend name, entry count and hit/miss counters
+        """
+        lookups = self.hits + self.misses
+        
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend.name,
+            'entries': len(self.backend),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
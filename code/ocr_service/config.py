@@ -30,6 +30,20 @@ class OCRConfig:
         'tessedit_pageseg_mode': 6,
     }
     
+    # OCR engine settings
+    OCR_ENGINE = {
+        'engine': os.getenv('OCR_ENGINE', 'tesserocr'),  # 'tesserocr' (persistent API pool), 'pytesseract' (CLI per call)
+        'pool_size': int(os.getenv('OCR_ENGINE_POOL_SIZE', 2)),  # API instances per language/configuration
+        'tessdata_path': os.getenv('TESSDATA_PREFIX'),
+    }
+    
+    # Layout-aware region OCR settings
+    LAYOUT = {
+        'region_ocr': os.getenv('OCR_REGION_OCR', 'False').lower() == 'true',  # Default when the request does not set it
+        'region_workers': int(os.getenv('OCR_REGION_WORKERS', 4)),  # Regions OCR'd in parallel per page
+        'max_regions': 200,  # Fall back to whole-page OCR for pages with more blocks than this
+    }
+    
     # Available languages for OCR (add more as needed)
     AVAILABLE_LANGUAGES = {
         'eng': 'English',
@@ -63,6 +77,9 @@ class OCRConfig:
         # Deskewing
         'deskew_angle_threshold': 0.5,  # Minimum angle to apply deskewing (degrees)
         'deskew_max_angle': 5.0,       # Maximum deskewing angle (degrees)
+        'deskew_method': 'projection', # 'projection' (accurate to deskew_angle_step) or 'hough' (1 degree)
+        'deskew_max_dim': 1000,        # Longest side of the decimated copy the angle is estimated on (0 = full resolution)
+        'deskew_angle_step': 0.1,      # Final angle resolution of the projection search (degrees)
         
         # Binarization
         'binarization_method': 'adaptive',  # 'simple', 'adaptive', 'otsu'
@@ -75,6 +92,19 @@ class OCRConfig:
             [0, -1, 0]
         ],  # Sharpening kernel
         
+        # Adaptive pipeline: analyze image quality and skip unneeded steps
+        'adaptive': os.getenv('OCR_ADAPTIVE_PREPROCESSING', 'True').lower() == 'true',
+        'analysis_max_dim': 1000,    # Longest side of the downscaled copy used for skew/contrast analysis
+        'analysis_crop_size': 1024,  # Full-resolution center crop used for noise/sharpness analysis
+        'noise_threshold': 3.0,      # Estimated noise sigma above which denoising runs
+        'min_contrast': 120,         # Mean ink/paper intensity difference below which contrast is enhanced
+        'blur_threshold': 100.0,     # Laplacian variance below which sharpening runs
+        
+        # Text block detection for region OCR
+        'region_dilate_kernel': (25, 15), # (width, height) merging glyphs and lines into blocks
+        'region_min_area': 200,           # Minimum ink area of a block in pixels
+        'region_padding': 4,              # Pixels of margin kept around each block
+        
         # Morphological operations
         'kernel_erode': (2, 2),
         'kernel_dilate': (2, 2),
@@ -96,6 +126,8 @@ class OCRConfig:
     BATCH_PROCESSING = {
         'max_batch_size': 10,
         'max_concurrent_jobs': 4,
+        'max_concurrent_files': int(os.getenv('OCR_MAX_CONCURRENT_FILES', 4)),  # Files OCR'd in parallel across all requests
+        'result_save_interval': int(os.getenv('OCR_BATCH_RESULT_SAVE_INTERVAL', 5)),  # Files between partial result saves
         'job_timeout': 600,  # 10 minutes
         'retry_attempts': 3,
         'retry_delay': 1,  # seconds
@@ -133,6 +165,25 @@ class OCRConfig:
         'cleanup_after_processing': True,
         'auto_cleanup_interval': 3600,  # 1 hour
         'max_temp_age': 86400,  # 24 hours
+        'upload_chunk_size': 1024 * 1024,  # Bytes copied per read when saving uploads
+    }
+    
+    # Batch job store settings
+    JOB_STORE = {
+        'backend': os.getenv('OCR_JOB_STORE', 'memory'),  # 'memory', 'sqlite'
+        'sqlite_path': os.getenv('OCR_JOB_STORE_PATH', '/tmp/ocr_service/jobs.db'),
+        'result_ttl': int(os.getenv('OCR_JOB_RESULT_TTL', 3600)),  # Keep finished jobs for 1 hour
+        'max_jobs': 100,  # Memory backend bound on finished jobs
+    }
+    
+    # OCR result cache settings
+    CACHE = {
+        'enabled': os.getenv('OCR_CACHE_ENABLED', 'True').lower() == 'true',
+        'backend': os.getenv('OCR_CACHE_BACKEND', 'memory'),  # 'memory', 'disk'
+        'max_entries': int(os.getenv('OCR_CACHE_MAX_ENTRIES', 1000)),  # Memory backend size bound
+        'max_bytes': int(os.getenv('OCR_CACHE_MAX_BYTES', 256 * 1024 * 1024)),  # Memory backend serialized size bound
+        'disk_dir': os.getenv('OCR_CACHE_DIR', '/tmp/ocr_service/cache'),
+        'ttl': int(os.getenv('OCR_CACHE_TTL', 86400)),  # Disk backend entry lifetime (seconds)
     }
     
     # Error handling settings
@@ -151,6 +202,18 @@ class OCRConfig:
         'dpi': 300,  # Image DPI for PDF conversion
         'image_format': 'png',  # 'png', 'jpeg', 'tiff'
         'image_quality': 95,  # JPEG quality (1-100)
+        'render_grayscale': True,  # Render pages in grayscale when preprocessing will convert anyway
+        # Documents with at least parallel_min_pages pages to OCR are fanned out
+        # across page_workers processes; all others (and every document when
+        # parallel_pages is off or page_workers is 1) are rendered and OCR'd
+        # one page at a time in-process, holding a single page in memory
+        'parallel_pages': os.getenv('OCR_PDF_PARALLEL_PAGES', 'True').lower() == 'true',
+        'page_workers': int(os.getenv('OCR_PDF_PAGE_WORKERS', os.cpu_count() or 1)),
+        'parallel_min_pages': int(os.getenv('OCR_PDF_PARALLEL_MIN_PAGES', '2')),
+        'use_text_layer': True,  # Use embedded text instead of OCR for born-digital pages
+        'text_layer_min_chars': 25,  # Minimum non-whitespace characters for a usable text layer
+        'text_layer_min_quality': 0.8,  # Minimum fraction of printable characters
+        'text_layer_max_image_coverage': 0.5,  # OCR pages whose images cover more, unless text covers half as much
     }
     
     @classmethod
@@ -268,6 +331,8 @@ class ProductionConfig(OCRConfig):
     BATCH_PROCESSING = {
         'max_batch_size': 20,
         'max_concurrent_jobs': 8,
+        'max_concurrent_files': 8,
+        'result_save_interval': 10,
         'job_timeout': 900,  # 15 minutes
         'retry_attempts': 5,
         'retry_delay': 2,
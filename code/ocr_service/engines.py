@@ -0,0 +1,264 @@
+"""
+OCR Engine Module
+
+This module provides the OCR engine abstraction used by the service:
+- PytesseractEngine: runs the tesseract CLI through pytesseract (one process per call)
+- TesserocrEngine: keeps a pool of long-lived Tesseract API instances per
+  language/configuration, so traineddata is loaded once instead of per page
+"""
+
+import os
+import re
+import queue
+import logging
+import threading
+import weakref
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Optional imports for the persistent engine
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+    tesserocr = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class OCREngine:
+    """Base class for OCR engines."""
+    
+    name = "base"
+    
+    def image_to_data(self, image: np.ndarray, language: str, tesseract_config: str) -> Dict[str, List[Any]]:
+        """
+        Run OCR on an image and return word-level data.
+        
+        Args:
+            image: Input image
+            language: Tesseract language code
+            tesseract_config: Tesseract configuration string (e.g. '--psm 6 --oem 3')
+        
+        Returns:
+            Dictionary of parallel lists in pytesseract's Output.DICT layout
+            ('text', 'conf', 'left', 'top', 'width', 'height')
+        """
+        raise NotImplementedError
+    
+    def version(self) -> str:
+        """
+        Get the version of the underlying OCR engine.
+        
+        Returns:
+            Version string, or 'unknown' if it cannot be determined
+        """
+        return "unknown"
+    
+    def close(self):
+        """Release engine resources."""
+        pass
+
+
+class PytesseractEngine(OCREngine):
+    """Engine that spawns the tesseract CLI for every call."""
+    
+    name = "pytesseract"
+    
+    def version(self) -> str:
+        if not hasattr(self, '_version'):
+            import pytesseract
+            
+            try:
+                self._version = str(pytesseract.get_tesseract_version())
+            except Exception:
+                self._version = "unknown"
+        return self._version
+    
+    def image_to_data(self, image: np.ndarray, language: str, tesseract_config: str) -> Dict[str, List[Any]]:
+        import pytesseract
+        
+        return pytesseract.image_to_data(
+            image, lang=language, config=tesseract_config, output_type=pytesseract.Output.DICT
+        )
+
+
+class TesserocrEngine(OCREngine):
+    """Engine backed by a pool of persistent Tesseract API instances."""
+    
+    name = "tesserocr"
+    
+    def __init__(self, pool_size: int = 2, tessdata_path: str = None):
+        """
+        Initialize the engine.
+        
+        Args:
+            pool_size: Maximum API instances per language/configuration
+            tessdata_path: Directory containing traineddata files
+        """
+        if not TESSEROCR_AVAILABLE:
+            raise ImportError("tesserocr is required for the tesserocr OCR engine")
+        
+        self.pool_size = max(1, pool_size)
+        self.tessdata_path = tessdata_path
+        self._pools = {}
+        self._created = {}
+        self._lock = threading.Lock()
+        
+        # A forked child must not share API instances with its parent, nor
+        # inherit the lock in whatever state another parent thread left it
+        def reset_in_child(engine_ref=weakref.ref(self)):
+            engine = engine_ref()
+            if engine is not None:
+                engine._reset_after_fork()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=reset_in_child)
+    
+    def version(self) -> str:
+        return f"{tesserocr.__version__}/{tesserocr.tesseract_version().splitlines()[0]}"
+    
+    def _reset_after_fork(self):
+        """Drop the parent's API instances and lock in a forked child."""
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._created = {}
+    
+    @staticmethod
+    def parse_config(tesseract_config: str) -> Tuple[int, int, Dict[str, str]]:
+        """
+        Parse a Tesseract CLI configuration string.
+        
+        Args:
+            tesseract_config: Configuration string
+        
+        Returns:
+            Tuple of (page segmentation mode, OCR engine mode, variables)
+        """
+        psm_match = re.search(r'--psm\s+(\d+)', tesseract_config or '')
+        oem_match = re.search(r'--oem\s+(\d+)', tesseract_config or '')
+        variables = dict(re.findall(r'-c\s+(\w+)=(\S+)', tesseract_config or ''))
+        
+        psm = int(psm_match.group(1)) if psm_match else 3
+        oem = int(oem_match.group(1)) if oem_match else 3
+        return psm, oem, variables
+    
+    def _create_api(self, language: str, oem: int, variables: Dict[str, str]):
+        """Create and initialize a Tesseract API instance."""
+        kwargs = {'lang': language, 'oem': tesserocr.OEM(oem)}
+        if self.tessdata_path:
+            kwargs['path'] = self.tessdata_path
+        
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        
+        logger.info(f"Loaded Tesseract API for language '{language}'")
+        return api
+    
+    def _acquire(self, key: Tuple, language: str, oem: int, variables: Dict[str, str]):
+        """Take an API instance from the pool, creating one if the pool is not full."""
+        with self._lock:
+            pool = self._pools.setdefault(key, queue.Queue())
+            try:
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
+            
+            create = self._created.get(key, 0) < self.pool_size
+            if create:
+                self._created[key] = self._created.get(key, 0) + 1
+        
+        if create:
+            try:
+                return self._create_api(language, oem, variables)
+            except Exception:
+                with self._lock:
+                    self._created[key] -= 1
+                raise
+        
+        # Pool is full, wait for an instance to be released
+        return pool.get()
+    
+    def _release(self, key: Tuple, api):
+        """Return an API instance to its pool."""
+        self._pools[key].put(api)
+    
+    def image_to_data(self, image: np.ndarray, language: str, tesseract_config: str) -> Dict[str, List[Any]]:
+        psm, oem, variables = self.parse_config(tesseract_config)
+        key = (language, oem, tuple(sorted(variables.items())))
+        
+        data = {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+        if image.ndim == 3:
+            # OpenCV images are BGR, PIL expects RGB
+            image = np.ascontiguousarray(image[:, :, ::-1])
+        
+        api = self._acquire(key, language, oem, variables)
+        
+        try:
+            api.SetPageSegMode(tesserocr.PSM(psm))
+            api.SetImage(Image.fromarray(image))
+            api.Recognize()
+            
+            iterator = api.GetIterator()
+            level = tesserocr.RIL.WORD
+            
+            for word in tesserocr.iterate_level(iterator, level):
+                text = word.GetUTF8Text(level)
+                if text is None:
+                    continue
+                
+                left, top, right, bottom = word.BoundingBox(level)
+                data['text'].append(text)
+                data['conf'].append(word.Confidence(level))
+                data['left'].append(left)
+                data['top'].append(top)
+                data['width'].append(right - left)
+                data['height'].append(bottom - top)
+            
+            return data
+        
+        finally:
+            api.Clear()
+            self._release(key, api)
+    
+    def close(self):
+        with self._lock:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    pool.get_nowait().End()
+            self._pools = {}
+            self._created = {}
+
+
+def create_engine(engine_config: Dict[str, Any]) -> OCREngine:
+    """
+    Create an OCR engine from the OCR_ENGINE configuration section.
+    
+    Falls back to pytesseract when the persistent engine is not installed.
+    
+    Args:
+        engine_config: Engine configuration dictionary
+    
+    Returns:
+        OCR engine instance
+    """
+    engine_name = engine_config.get('engine', 'pytesseract')
+    
+    if engine_name == 'tesserocr':
+        if TESSEROCR_AVAILABLE:
+            return TesserocrEngine(
+                pool_size=engine_config.get('pool_size', 2),
+                tessdata_path=engine_config.get('tessdata_path')
+            )
+        logger.warning("tesserocr is not installed. Falling back to pytesseract engine.")
+        return PytesseractEngine()
+    
+    if engine_name == 'pytesseract':
+        return PytesseractEngine()
+    
+    raise ValueError(f"Unsupported OCR engine: {engine_name}")
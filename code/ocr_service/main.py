@@ -8,11 +8,15 @@ batch processing, confidence scoring, and error handling.
 
 import os
 import io
+import sys
 import json
 import time
 import logging
 import uuid
 import traceback
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from pathlib import Path
@@ -25,11 +29,17 @@ from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, F
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-import uvicorn
 
 # Import local modules
 from config import OCRConfig
-from preprocessing import DocumentPreprocessor, PDFProcessor, SpreadsheetProcessor
+from preprocessing import SpreadsheetProcessor
+from cache import OCRResultCache
+from job_store import create_job_store
+from page_worker import (
+    document_preprocessor, pdf_processor, ocr_engine, init_page_worker, shutdown_region_executor,
+    preprocess_image_for_ocr, perform_ocr, perform_region_ocr, ocr_pdf_page_image, process_pdf_page,
+    render_grayscale
+)
 
 
 # Configure logging
@@ -52,6 +62,9 @@ class OCRRequest(BaseModel):
     output_format: str = Field(default="text", description="Output format (text, json)")
     confidence_threshold: int = Field(default=30, description="Minimum confidence threshold")
     include_coordinates: bool = Field(default=True, description="Include text coordinates")
+    use_text_layer: bool = Field(default=True, description="Use embedded PDF text instead of OCR where available")
+    bypass_cache: bool = Field(default=False, description="Skip the result cache lookup and refresh the entry")
+    region_ocr: Optional[bool] = Field(default=None, description="OCR detected text blocks separately (defaults to LAYOUT.region_ocr)")
 
 
 class OCRResponse(BaseModel):
@@ -88,16 +101,72 @@ class BatchOCRResponse(BaseModel):
     success: bool
 
 
+class BatchSubmitResponse(BaseModel):
+    """Response model for batch submission."""
+    batch_id: str
+    status: str
+    total_files: int
+    message: str
+
+
 class JobStatusResponse(BaseModel):
     """Response model for job status checking."""
     job_id: str
     status: str  # 'pending', 'processing', 'completed', 'failed'
     progress: int  # 0-100
+    processed_files: Optional[int] = None
+    successful_files: Optional[int] = None
+    failed_files: Optional[int] = None
     created_at: str
     completed_at: Optional[str] = None
     error_message: Optional[str] = None
 
 
+class RequestSizeLimitMiddleware:
+    """
+    Reject request bodies larger than ``max_request_size`` with 413.
+    
+    Starlette parses and spools a multipart body before the endpoint runs,
+    so the limit cannot be enforced while the uploads are saved. A declared
+    Content-Length over the limit is rejected before any of the body is
+    read; chunked bodies are counted as they arrive.
+    """
+    
+    def __init__(self, app, max_size: int):
+        self.app = app
+        self.max_size = max_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope['headers']).get(b'content-length', b'')
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            response = JSONResponse(
+                status_code=413,
+                content={"detail": f"Request exceeds the maximum size of {self.max_size} bytes"}
+            )
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > self.max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Request exceeds the maximum size of {self.max_size} bytes"
+                    )
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="OCR Service",
@@ -105,6 +174,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Reject oversized request bodies before they are parsed
+app.add_middleware(RequestSizeLimitMiddleware, max_size=OCRConfig.API['max_request_size'])
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -117,18 +189,92 @@ app.add_middleware(
 
 # Global variables
 config = OCRConfig()
-document_preprocessor = DocumentPreprocessor(config.PREPROCESSING)
-pdf_processor = PDFProcessor(config.PDF)
 spreadsheet_processor = SpreadsheetProcessor({})
+result_cache = OCRResultCache.from_config(config.CACHE)
 
 # Job tracking
-job_status = {}
-batch_jobs = {}
+job_store = create_job_store(config.JOB_STORE)
+
+# Process pool for page-parallel PDF OCR (created on first use)
+page_executor = None
+
+# Thread pool running file OCR off the event loop (created on first use)
+file_executor = None
+
+
+def get_page_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for page-parallel PDF OCR.
+    
+    Workers are started from a fork server (or spawned where that is not
+    available) rather than forked from this multi-threaded process, where a
+    child could inherit a lock held by another thread and deadlock. They run
+    page_worker.process_pdf_page and only import page_worker, not this
+    module with its app, log file, job store and cache.
+    
+    Returns:
+        Process pool bounded by the configured page worker count
+    """
+    global page_executor
+    
+    if page_executor is None:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            # The fork server imports the page worker module once instead of __main__
+            context.set_forkserver_preload(['page_worker'])
+        else:
+            context = multiprocessing.get_context('spawn')
+        page_executor = ProcessPoolExecutor(
+            max_workers=max(1, config.PDF['page_workers']),
+            mp_context=context,
+            initializer=init_page_worker
+        )
+        logger.info(f"Started PDF page worker pool with {config.PDF['page_workers']} workers")
+    
+    return page_executor
+
+
+def get_file_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool used to run file OCR off the event loop.
+    
+    Returns:
+        Thread pool bounded by the configured file concurrency
+    """
+    global file_executor
+    
+    if file_executor is None:
+        file_executor = ThreadPoolExecutor(
+            max_workers=max(1, config.BATCH_PROCESSING['max_concurrent_files']),
+            thread_name_prefix="ocr-file"
+        )
+    
+    return file_executor
 
 
-def save_uploaded_file(file: UploadFile, file_id: str) -> str:
+async def run_ocr_in_executor(file_path: str, ocr_request: OCRRequest) -> OCRResponse:
     """
-    Save uploaded file to temporary directory.
+    Run process_single_file in the file worker pool without blocking the event loop.
+    
+    Args:
+        file_path: Path to file
+        ocr_request: OCR request configuration
+        
+    Returns:
+        OCR response
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_file_executor(), process_single_file, file_path, ocr_request)
+
+
+async def save_uploaded_file(file: UploadFile, file_id: str) -> str:
+    """
+    Copy an uploaded file to the temporary directory in chunks.
+    
+    By the time the endpoint runs Starlette has already spooled the part
+    (in memory up to 1MB, on disk beyond), so this is a second copy; the
+    processors need a named path to open. The request size limit is
+    enforced earlier by ``RequestSizeLimitMiddleware``.
     
     Args:
         file: Uploaded file
@@ -138,11 +284,21 @@ def save_uploaded_file(file: UploadFile, file_id: str) -> str:
         Path to saved file
     """
     os.makedirs(config.TEMP['temp_dir'], exist_ok=True)
-    file_path = os.path.join(config.TEMP['temp_dir'], f"{file_id}_{file.filename}")
+    file_path = os.path.join(config.TEMP['temp_dir'], f"{file_id}_{os.path.basename(file.filename)}")
     
-    with open(file_path, 'wb') as f:
-        content = file.file.read()
-        f.write(content)
+    chunk_size = config.TEMP['upload_chunk_size']
+    
+    try:
+        with open(file_path, 'wb') as f:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+    
+    except Exception:
+        cleanup_temp_files([file_path])
+        raise
     
     return file_path
 
@@ -163,79 +319,52 @@ def cleanup_temp_files(file_paths: List[str]):
             logger.warning(f"Failed to clean up {file_path}: {str(e)}")
 
 
-def preprocess_image_for_ocr(image: np.ndarray, config_override: Dict[str, Any] = None) -> np.ndarray:
-    """
-    Preprocess image for optimal OCR results.
-    
-    Args:
-        image: Input image as numpy array
-        config_override: Optional configuration overrides
-        
-    Returns:
-        Preprocessed image
-    """
-    if config_override:
-        preprocessor = DocumentPreprocessor(config_override)
-        return preprocessor.preprocess_image(image)
-    else:
-        return document_preprocessor.preprocess_image(image)
+def use_region_ocr(ocr_request: OCRRequest) -> bool:
+    """Resolve whether region OCR is enabled for a request."""
+    if ocr_request.region_ocr is None:
+        return config.LAYOUT.get('region_ocr', False)
+    return ocr_request.region_ocr
 
 
-def perform_ocr(image: np.ndarray, language: str = "eng", config_override: str = None) -> Dict[str, Any]:
+def get_cache_settings(file_ext: str, ocr_request: OCRRequest) -> Dict[str, Any]:
     """
-    Perform OCR on image.
+    Collect every setting that affects the OCR result of a file.
     
     Args:
-        image: Input image
-        language: Language code
-        config_override: Custom Tesseract configuration
+        file_ext: File extension
+        ocr_request: OCR request configuration
         
     Returns:
-        OCR results including text, confidence, and metadata
+        Settings to include in the result cache key
     """
-    try:
-        # Configure Tesseract
-        tesseract_config = config_override or config.get_tesseract_config(language=language)
-        
-        # Perform OCR with detailed data
-        data = pytesseract.image_to_data(image, config=tesseract_config, output_type=pytesseract.Output.DICT)
-        
-        # Extract text and confidence
-        text_parts = []
-        confidences = []
-        
-        for i in range(len(data['text'])):
-            if int(data['conf'][i]) > 0:  # Valid text
-                text = data['text'][i].strip()
-                if text:
-                    text_parts.append(text)
-                    confidences.append(int(data['conf'][i]))
-        
-        full_text = ' '.join(text_parts)
-        avg_confidence = np.mean(confidences) if confidences else 0
-        
-        result = {
-            'text': full_text,
-            'confidence': avg_confidence,
-            'word_confidence': confidences,
-            'metadata': {
-                'language': language,
-                'word_count': len(text_parts),
-                'processing_timestamp': datetime.now().isoformat()
-            }
+    settings = {
+        'file_type': file_ext,
+        'engine': {'name': ocr_engine.name, 'version': ocr_engine.version()},
+        'language': ocr_request.language,
+        'preprocessing': config.PREPROCESSING if ocr_request.preprocessing else None,
+        'tesseract_config': config.get_tesseract_config(language=ocr_request.language),
+        'include_coordinates': ocr_request.include_coordinates,
+        'layout': config.LAYOUT if use_region_ocr(ocr_request) else None
+    }
+    
+    if file_ext in config.SUPPORTED_PDF_FORMATS:
+        settings['use_text_layer'] = ocr_request.use_text_layer
+        settings['pdf'] = {
+            key: config.PDF.get(key)
+            for key in ('dpi', 'render_grayscale', 'use_text_layer',
+                        'text_layer_min_chars', 'text_layer_min_quality', 'text_layer_max_image_coverage')
         }
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"OCR processing failed: {str(e)}")
-        raise
+    
+    return settings
 
 
 def process_single_file(file_path: str, ocr_request: OCRRequest) -> OCRResponse:
     """
     Process a single file with OCR.
     
+    Results are looked up in the content-addressed result cache first unless
+    ``bypass_cache`` is set; successful results are stored back.
+    
     Args:
         file_path: Path to file
         ocr_request: OCR request configuration
@@ -249,15 +378,38 @@ def process_single_file(file_path: str, ocr_request: OCRRequest) -> OCRResponse:
     try:
         file_ext = os.path.splitext(file_path)[1].lower()
         
-        # Handle different file types
-        if file_ext in config.SUPPORTED_IMAGE_FORMATS:
-            result = process_image_file(file_path, ocr_request)
-        elif file_ext in config.SUPPORTED_PDF_FORMATS:
-            result = process_pdf_file(file_path, ocr_request)
-        elif file_ext in config.SUPPORTED_SPREADSHEET_FORMATS:
-            result = process_spreadsheet_file(file_path)
+        cache_key = None
+        result = None
+        if result_cache.enabled:
+            cache_key = OCRResultCache.make_key(file_path, get_cache_settings(file_ext, ocr_request))
+            if not ocr_request.bypass_cache:
+                result = result_cache.get(cache_key)
+        
+        if result is None:
+            # Handle different file types
+            if file_ext in config.SUPPORTED_IMAGE_FORMATS:
+                result = process_image_file(file_path, ocr_request)
+            elif file_ext in config.SUPPORTED_PDF_FORMATS:
+                result = process_pdf_file(file_path, ocr_request)
+            elif file_ext in config.SUPPORTED_SPREADSHEET_FORMATS:
+                result = process_spreadsheet_file(file_path)
+            else:
+                raise ValueError(f"Unsupported file format: {file_ext}")
+            
+            if cache_key:
+                result_cache.set(cache_key, {
+                    'text': result['text'],
+                    'confidence': float(result['confidence']),
+                    'word_confidence': [float(c) for c in result.get('word_confidence', [])],
+                    'metadata': result.get('metadata', {})
+                })
+            cache_hit = False
         else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
+            cache_hit = True
+        
+        metadata = dict(result.get('metadata', {}))
+        if cache_key:
+            metadata['cache_hit'] = cache_hit
         
         processing_time = time.time() - start_time
         
@@ -270,24 +422,39 @@ def process_single_file(file_path: str, ocr_request: OCRRequest) -> OCRResponse:
             confidence=result['confidence'],
             word_confidence=result.get('word_confidence', []),
             success=True,
-            metadata=result.get('metadata', {})
+            metadata=metadata
         )
         
     except Exception as e:
         logger.error(f"Error processing file {file_path}: {str(e)}")
-        processing_time = time.time() - start_time
+        return failed_ocr_response(file_path, str(e), time.time() - start_time, request_id)
+
+
+def failed_ocr_response(file_path: str, error_message: str, processing_time: float,
+                        request_id: str = None) -> OCRResponse:
+    """
+    Build the response for a file that could not be processed.
+    
+    Args:
+        file_path: Path to file
+        error_message: Error description
+        processing_time: Time spent on the file
+        request_id: Request identifier (generated if None)
         
-        return OCRResponse(
-            request_id=request_id,
-            file_name=os.path.basename(file_path),
-            file_type=os.path.splitext(file_path)[1].lower(),
-            processing_time=processing_time,
-            text="",
-            confidence=0.0,
-            word_confidence=[],
-            success=False,
-            error_message=str(e)
-        )
+    Returns:
+        OCR response with success=False
+    """
+    return OCRResponse(
+        request_id=request_id or str(uuid.uuid4()),
+        file_name=os.path.basename(file_path),
+        file_type=os.path.splitext(file_path)[1].lower(),
+        processing_time=processing_time,
+        text="",
+        confidence=0.0,
+        word_confidence=[],
+        success=False,
+        error_message=error_message
+    )
 
 
 def process_image_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any]:
@@ -307,11 +474,21 @@ def process_image_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any
         raise ValueError(f"Could not load image: {file_path}")
     
     # Preprocess if requested
+    preprocessing_report = {}
     if ocr_request.preprocessing:
-        image = preprocess_image_for_ocr(image)
+        image = preprocess_image_for_ocr(image, report=preprocessing_report)
     
     # Perform OCR
-    result = perform_ocr(image, ocr_request.language)
+    if use_region_ocr(ocr_request):
+        result = perform_region_ocr(image, ocr_request.language)
+        if ocr_request.include_coordinates:
+            result['metadata']['words'] = result['words']
+            result['metadata']['regions'] = result.get('regions', [])
+    else:
+        result = perform_ocr(image, ocr_request.language)
+    
+    if preprocessing_report:
+        result['metadata']['preprocessing'] = preprocessing_report
     
     # Filter by confidence threshold
     if ocr_request.confidence_threshold > 0:
@@ -322,10 +499,46 @@ def process_image_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any
     return result
 
 
+def text_layer_result(text_layer: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """
+    Build a page result from an embedded PDF text layer.
+    
+    Args:
+        text_layer: Text layer from PDFProcessor.extract_page_text_layer
+        language: Language code
+        
+    Returns:
+        Page result in the same shape as perform_ocr output
+    """
+    words = text_layer['words']
+    
+    return {
+        'text': text_layer['text'],
+        'confidence': 100.0,  # Embedded text is exact
+        'word_confidence': [100] * len(words),
+        'words': words,
+        'metadata': {
+            'language': language,
+            'word_count': len(words),
+            'processing_timestamp': datetime.now().isoformat()
+        }
+    }
+
+
 def process_pdf_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any]:
     """
     Process PDF file with OCR.
     
+    Pages with a usable embedded text layer are read directly; only
+    image-only pages are rasterized and OCR'd. Documents with at least
+    ``parallel_min_pages`` such pages are fanned out page by page across the
+    page worker pool when ``parallel_pages`` is enabled and ``page_workers``
+    is above 1; results are reassembled in page order. Otherwise (parallel
+    pages disabled, a single page worker, or fewer OCR pages than
+    ``parallel_min_pages``) pages are rendered and OCR'd one at a time so
+    only one page is held in memory. Raise OCR_PDF_PARALLEL_MIN_PAGES to keep
+    short documents on the streaming path.
+    
     Args:
         file_path: Path to PDF file
         ocr_request: OCR request configuration
@@ -333,29 +546,74 @@ def process_pdf_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any]:
     Returns:
         OCR results from all pages
     """
-    # Extract images from PDF
-    images = pdf_processor.extract_images_from_pdf(file_path)
+    if ocr_request.use_text_layer and config.PDF.get('use_text_layer', True):
+        text_layers = pdf_processor.extract_text_layers(file_path)
+    else:
+        text_layers = [None] * pdf_processor.get_page_count(file_path)
+    
+    page_count = len(text_layers)
+    page_results = [
+        text_layer_result(text_layer, ocr_request.language) if text_layer else None
+        for text_layer in text_layers
+    ]
+    raster_pages = [page_num for page_num, text_layer in enumerate(text_layers) if text_layer is None]
+    
+    parallel = (
+        config.PDF.get('parallel_pages', False) and
+        config.PDF.get('page_workers', 1) > 1 and
+        len(raster_pages) >= config.PDF.get('parallel_min_pages', 2)
+    )
+    
+    region_ocr = use_region_ocr(ocr_request)
+    
+    if parallel:
+        executor = get_page_executor()
+        raster_results = executor.map(
+            process_pdf_page,
+            [file_path] * len(raster_pages),
+            raster_pages,
+            [ocr_request.language] * len(raster_pages),
+            [ocr_request.preprocessing] * len(raster_pages),
+            [region_ocr] * len(raster_pages)
+        )
+        for page_num, result in zip(raster_pages, raster_results):
+            page_results[page_num] = result
+    elif raster_pages:
+        pages = pdf_processor.iter_page_images(
+            file_path,
+            grayscale=render_grayscale(ocr_request.preprocessing),
+            page_numbers=raster_pages
+        )
+        for page_num, image in pages:
+            page_results[page_num] = ocr_pdf_page_image(
+                image, page_num, ocr_request.language, ocr_request.preprocessing, region_ocr
+            )
     
     all_text = []
     all_confidences = []
+    pages = []
     
-    for i, image in enumerate(images):
-        try:
-            # Preprocess if requested
-            if ocr_request.preprocessing:
-                image = preprocess_image_for_ocr(image)
-            
-            # Perform OCR
-            result = perform_ocr(image, ocr_request.language)
+    for page_num, result in enumerate(page_results):
+        page_info = {
+            'page': page_num + 1,
+            'method': 'ocr' if text_layers[page_num] is None else 'text_layer',
+            'success': result is not None
+        }
+        
+        if result:
+            page_info['word_count'] = len(result.get('word_confidence', []))
+            if ocr_request.include_coordinates and 'words' in result:
+                page_info['words'] = result['words']
+            if ocr_request.include_coordinates and 'regions' in result:
+                page_info['regions'] = result['regions']
+            if 'preprocessing' in result:
+                page_info['preprocessing'] = result['preprocessing']
             
             if result['text']:
                 all_text.append(result['text'])
                 all_confidences.extend(result.get('word_confidence', []))
-                logger.debug(f"OCR completed for PDF page {i + 1}")
-            
-        except Exception as e:
-            logger.error(f"Error processing PDF page {i + 1}: {str(e)}")
-            continue
+        
+        pages.append(page_info)
     
     # Combine results
     full_text = '\n'.join(all_text)
@@ -366,8 +624,12 @@ def process_pdf_file(file_path: str, ocr_request: OCRRequest) -> Dict[str, Any]:
         'confidence': avg_confidence,
         'word_confidence': all_confidences,
         'metadata': {
-            'pages_processed': len(images),
-            'language': ocr_request.language
+            'pages_processed': page_count,
+            'language': ocr_request.language,
+            'parallel_pages': parallel,
+            'text_layer_pages': page_count - len(raster_pages),
+            'ocr_pages': len(raster_pages),
+            'pages': pages
         }
     }
 
@@ -429,7 +691,10 @@ async def health_check():
             "host": config.API['host'],
             "port": config.API['port'],
             "debug": config.API['debug']
-        }
+        },
+        "cache": result_cache.get_stats(),
+        "job_store": job_store.name,
+        "ocr_engine": ocr_engine.name
     }
 
 
@@ -439,7 +704,10 @@ async def process_single_ocr(
     language: str = Form(default="eng"),
     preprocessing: bool = Form(default=True),
     output_format: str = Form(default="text"),
-    confidence_threshold: int = Form(default=30)
+    confidence_threshold: int = Form(default=30),
+    use_text_layer: bool = Form(default=True),
+    bypass_cache: bool = Form(default=False),
+    region_ocr: Optional[bool] = Form(default=None)
 ):
     """
     Process a single file with OCR.
@@ -450,6 +718,9 @@ async def process_single_ocr(
         preprocessing: Enable preprocessing
         output_format: Output format (text, json)
         confidence_threshold: Minimum confidence threshold
+        use_text_layer: Use embedded PDF text instead of OCR where available
+        bypass_cache: Skip the result cache lookup and refresh the entry
+        region_ocr: OCR detected text blocks separately (defaults to LAYOUT.region_ocr)
         
     Returns:
         OCR results
@@ -462,7 +733,7 @@ async def process_single_ocr(
     
     # Save uploaded file
     file_id = str(uuid.uuid4())
-    file_path = save_uploaded_file(file, file_id)
+    file_path = await save_uploaded_file(file, file_id)
     
     try:
         # Create OCR request
@@ -470,11 +741,14 @@ async def process_single_ocr(
             language=language,
             preprocessing=preprocessing,
             output_format=output_format,
-            confidence_threshold=confidence_threshold
+            confidence_threshold=confidence_threshold,
+            use_text_layer=use_text_layer,
+            bypass_cache=bypass_cache,
+            region_ocr=region_ocr
         )
         
         # Process file
-        result = process_single_file(file_path, ocr_request)
+        result = await run_ocr_in_executor(file_path, ocr_request)
         
         return result
         
@@ -483,7 +757,7 @@ async def process_single_ocr(
         cleanup_temp_files([file_path])
 
 
-@app.post("/ocr/batch", response_model=BatchOCRResponse)
+@app.post("/ocr/batch", response_model=BatchSubmitResponse)
 async def process_batch_ocr(
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
@@ -495,6 +769,10 @@ async def process_batch_ocr(
     """
     Process multiple files with OCR in batch.
     
+    The whole request has been received before this runs, so the files
+    are only copied to the temporary directory here and then OCR'd
+    concurrently in the file worker pool.
+    
     Args:
         files: List of files to process
         language: Language code
@@ -503,7 +781,7 @@ async def process_batch_ocr(
         confidence_threshold: Minimum confidence threshold
         
     Returns:
-        Batch processing results
+        Batch submission details
     """
     if len(files) > config.BATCH_PROCESSING['max_batch_size']:
         raise HTTPException(
@@ -521,127 +799,158 @@ async def process_batch_ocr(
     
     # Create batch job
     batch_id = str(uuid.uuid4())
-    job_status[batch_id] = {
+    start_time = time.time()
+    job_store.create_job(batch_id, {
         'status': 'pending',
         'progress': 0,
         'created_at': datetime.now().isoformat()
-    }
+    })
     
-    # Add background task
-    background_tasks.add_task(
-        process_batch_job,
-        batch_id=batch_id,
-        files=files,
+    ocr_request = OCRRequest(
         language=language,
         preprocessing=preprocessing,
         output_format=output_format,
         confidence_threshold=confidence_threshold
     )
     
+    file_paths = []
+    tasks = []
+    job_store.update_job(batch_id, status='processing')
+    
+    try:
+        for file in files:
+            file_id = str(uuid.uuid4())
+            file_path = await save_uploaded_file(file, file_id)
+            file_paths.append(file_path)
+            tasks.append(asyncio.ensure_future(run_ocr_in_executor(file_path, ocr_request)))
+    
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        cleanup_temp_files(file_paths)
+        
+        job_store.update_job(
+            batch_id,
+            status='failed',
+            error_message=str(e.detail if isinstance(e, HTTPException) else e),
+            completed_at=datetime.now().isoformat()
+        )
+        raise
+    
+    # Collect results in the background
+    background_tasks.add_task(
+        process_batch_job,
+        batch_id=batch_id,
+        tasks=tasks,
+        file_paths=file_paths,
+        start_time=start_time
+    )
+    
     return {
         "batch_id": batch_id,
         "status": "submitted",
+        "total_files": len(files),
         "message": "Batch processing started. Use /status/{batch_id} to check progress."
     }
 
 
 async def process_batch_job(
     batch_id: str,
-    files: List[UploadFile],
-    language: str,
-    preprocessing: bool,
-    output_format: str,
-    confidence_threshold: int
+    tasks: List[asyncio.Future],
+    file_paths: List[str],
+    start_time: float
 ):
     """
-    Background task to process batch OCR.
+    Background task collecting the results of a batch OCR job.
+    
+    Files are OCR'd concurrently in the file worker pool, bounded by
+    ``max_concurrent_files``. Progress counters are updated after each
+    file; the partial batch result is re-serialized only every
+    ``result_save_interval`` files and once at the end, so finished files
+    can be fetched from /result while the rest of the batch is running
+    without rewriting every result on every completion.
     
     Args:
         batch_id: Batch identifier
-        files: List of files to process
-        language: Language code
-        preprocessing: Enable preprocessing
-        output_format: Output format
-        confidence_threshold: Minimum confidence threshold
+        tasks: OCR tasks, one per file in submission order
+        file_paths: Paths of the saved files
+        start_time: Time the batch was submitted
     """
-    start_time = time.time()
-    
     try:
-        # Update status
-        job_status[batch_id]['status'] = 'processing'
-        job_status[batch_id]['progress'] = 0
-        
-        total_files = len(files)
+        total_files = len(tasks)
         processed_files = 0
         successful_files = 0
         failed_files = 0
-        results = []
-        
-        # Save all files first
-        file_paths = []
-        for file in files:
-            file_id = str(uuid.uuid4())
-            file_path = save_uploaded_file(file, file_id)
-            file_paths.append(file_path)
+        results = [None] * total_files
+        save_interval = max(1, config.BATCH_PROCESSING['result_save_interval'])
         
-        # Process each file
-        for i, file_path in enumerate(file_paths):
+        async def process_indexed(index: int, task: asyncio.Future):
             try:
-                ocr_request = OCRRequest(
-                    language=language,
-                    preprocessing=preprocessing,
-                    output_format=output_format,
-                    confidence_threshold=confidence_threshold
-                )
-                
-                result = process_single_file(file_path, ocr_request)
-                results.append(result)
-                
-                if result.success:
-                    successful_files += 1
-                else:
-                    failed_files += 1
-                
-                processed_files += 1
-                
-                # Update progress
-                progress = int((processed_files / total_files) * 100)
-                job_status[batch_id]['progress'] = progress
-                
+                return index, await task
             except Exception as e:
+                # Keep the file in the results as a failure instead of dropping it
                 logger.error(f"Error processing file in batch {batch_id}: {str(e)}")
-                failed_files += 1
-                processed_files += 1
+                return index, failed_ocr_response(file_paths[index], str(e), time.time() - start_time)
         
-        # Clean up temporary files
-        cleanup_temp_files(file_paths)
-        
-        # Calculate final results
-        processing_time = time.time() - start_time
-        
-        batch_jobs[batch_id] = BatchOCRResponse(
-            batch_id=batch_id,
-            total_files=total_files,
-            processed_files=processed_files,
-            successful_files=successful_files,
-            failed_files=failed_files,
-            results=results,
-            processing_time=processing_time,
-            success=True
-        )
+        # Record results in submission order as files complete
+        indexed_tasks = [process_indexed(i, task) for i, task in enumerate(tasks)]
+        for indexed_task in asyncio.as_completed(indexed_tasks):
+            index, result = await indexed_task
+            results[index] = result
+            
+            if result.success:
+                successful_files += 1
+            else:
+                failed_files += 1
+            
+            processed_files += 1
+            finished = processed_files == total_files
+            
+            if finished or processed_files % save_interval == 0:
+                batch_result = BatchOCRResponse(
+                    batch_id=batch_id,
+                    total_files=total_files,
+                    processed_files=processed_files,
+                    successful_files=successful_files,
+                    failed_files=failed_files,
+                    results=[result for result in results if result is not None],
+                    processing_time=time.time() - start_time,
+                    success=finished
+                )
+                job_store.save_result(batch_id, batch_result.dict())
+            
+            # Update progress
+            job_store.update_job(
+                batch_id,
+                progress=int((processed_files / total_files) * 100),
+                processed_files=processed_files,
+                successful_files=successful_files,
+                failed_files=failed_files
+            )
         
         # Update final status
-        job_status[batch_id]['status'] = 'completed'
-        job_status[batch_id]['completed_at'] = datetime.now().isoformat()
-        job_status[batch_id]['progress'] = 100
+        job_store.update_job(
+            batch_id,
+            status='completed',
+            completed_at=datetime.now().isoformat(),
+            progress=100
+        )
         
         logger.info(f"Batch job {batch_id} completed: {successful_files}/{total_files} successful")
         
     except Exception as e:
         logger.error(f"Batch job {batch_id} failed: {str(e)}")
-        job_status[batch_id]['status'] = 'failed'
-        job_status[batch_id]['error_message'] = str(e)
-        job_status[batch_id]['completed_at'] = datetime.now().isoformat()
+        job_store.update_job(
+            batch_id,
+            status='failed',
+            error_message=str(e),
+            completed_at=datetime.now().isoformat()
+        )
+        
+    finally:
+        # Clean up temporary files
+        cleanup_temp_files(file_paths)
 
 
 @app.get("/status/{batch_id}", response_model=JobStatusResponse)
@@ -655,16 +964,20 @@ async def get_job_status(batch_id: str):
     Returns:
         Job status information
     """
-    if batch_id not in job_status:
+    job = job_store.get_job(batch_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job_status[batch_id]
+    return job
 
 
 @app.get("/result/{batch_id}")
 async def get_batch_result(batch_id: str):
     """
-    Get results of a completed batch job.
+    Get results of a batch job.
+    
+    While the job is still running, responds with 202 and the results of
+    the files finished so far.
     
     Args:
         batch_id: Batch identifier
@@ -672,13 +985,22 @@ async def get_batch_result(batch_id: str):
     Returns:
         Batch processing results
     """
-    if batch_id not in batch_jobs:
-        if batch_id in job_status and job_status[batch_id]['status'] == 'processing':
-            raise HTTPException(status_code=202, detail="Job still processing")
-        else:
-            raise HTTPException(status_code=404, detail="Job not found")
+    job = job_store.get_job(batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    result = job_store.get_result(batch_id)
+    
+    if job['status'] in ('pending', 'processing'):
+        return JSONResponse(
+            status_code=202,
+            content=result or {"batch_id": batch_id, "status": job['status'], "results": []}
+        )
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    return batch_jobs[batch_id].dict()
+    return result
 
 
 @app.get("/languages")
@@ -733,7 +1055,7 @@ async def test_ocr_config(
     
     # Save and process file
     file_id = str(uuid.uuid4())
-    file_path = save_uploaded_file(file, file_id)
+    file_path = await save_uploaded_file(file, file_id)
     
     try:
         # Load image
@@ -773,6 +1095,17 @@ async def test_ocr_config(
         cleanup_temp_files([file_path])
 
 
+@app.on_event("shutdown")
+async def shutdown_page_executor():
+    """Shut down the worker pools and OCR engine."""
+    if page_executor is not None:
+        page_executor.shutdown(wait=False)
+    if file_executor is not None:
+        file_executor.shutdown(wait=False)
+    shutdown_region_executor()
+    ocr_engine.close()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
@@ -791,11 +1124,14 @@ if __name__ == "__main__":
     os.makedirs(config.TEMP['temp_dir'], exist_ok=True)
     os.makedirs(os.path.dirname(config.LOGGING['file']), exist_ok=True)
     
-    # Run server
-    uvicorn.run(
-        "main:app",
-        host=config.API['host'],
-        port=config.API['port'],
-        reload=config.API['debug'],
-        workers=1 if config.API['debug'] else config.API['workers']
-    )
+    # Run the server with uvicorn as the main module. Processes started by
+    # spawn or a fork server (PDF page workers) re-import the __main__ script,
+    # which would repeat this module's setup in every worker
+    args = [sys.executable, '-m', 'uvicorn', 'main:app',
+            '--app-dir', os.path.dirname(os.path.abspath(__file__)),
+            '--host', config.API['host'], '--port', str(config.API['port'])]
+    if config.API['debug']:
+        args.append('--reload')
+    else:
+        args += ['--workers', str(config.API['workers'])]
+    os.execv(sys.executable, args)
@@ -0,0 +1,326 @@
+"""
+OCR Service - Page Worker Module
+
+Page-level OCR shared by the API process and the PDF page worker pool:
+preprocessing, whole-page and region OCR, and rendering plus OCR of a single
+PDF page. Page workers are started from a fork server or spawned and import
+this module instead of main.py, so importing it has no side effects: no API
+app, log file handler, job store or cache directory is created.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from config import OCRConfig
+from preprocessing import DocumentPreprocessor, PDFProcessor
+from engines import create_engine
+
+
+logger = logging.getLogger(__name__)
+
+config = OCRConfig()
+document_preprocessor = DocumentPreprocessor(config.PREPROCESSING)
+pdf_processor = PDFProcessor(config.PDF)
+ocr_engine = create_engine(config.OCR_ENGINE)
+
+# Thread pool OCR'ing text regions of a page in parallel (created on first use,
+# per process)
+region_executor = None
+region_executor_lock = threading.Lock()
+
+
+def reset_region_executor():
+    """Drop the region pool (its threads do not survive a fork) and its lock in a forked child."""
+    global region_executor, region_executor_lock
+    region_executor = None
+    region_executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_region_executor)
+
+
+def get_region_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used to OCR the text regions of a page in parallel.
+    
+    Returns:
+        Thread pool bounded by the configured region worker count
+    """
+    global region_executor
+    
+    with region_executor_lock:
+        if region_executor is None:
+            region_executor = ThreadPoolExecutor(
+                max_workers=max(1, config.LAYOUT['region_workers']),
+                thread_name_prefix="ocr-region"
+            )
+    
+    return region_executor
+
+
+def shutdown_region_executor():
+    """Shut down the region pool of this process, if it was started."""
+    if region_executor is not None:
+        region_executor.shutdown(wait=False)
+
+
+def init_page_worker():
+    """
+    Initialize a PDF page worker process.
+    
+    Workers log to stderr; the service log file belongs to the API process.
+    """
+    logging.basicConfig(
+        level=getattr(logging, config.LOGGING['level']),
+        format=config.LOGGING['format']
+    )
+
+
+def preprocess_image_for_ocr(image: np.ndarray, config_override: Dict[str, Any] = None,
+                             report: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Preprocess image for optimal OCR results.
+    
+    Args:
+        image: Input image as numpy array
+        config_override: Optional configuration overrides
+        report: Optional dictionary filled with the steps run and their timings
+        
+    Returns:
+        Preprocessed image
+    """
+    if config_override:
+        preprocessor = DocumentPreprocessor(config_override)
+        return preprocessor.preprocess_image(image, report=report)
+    else:
+        return document_preprocessor.preprocess_image(image, report=report)
+
+
+def perform_ocr(image: np.ndarray, language: str = "eng", config_override: str = None,
+                include_words: bool = False) -> Dict[str, Any]:
+    """
+    Perform OCR on image using the configured OCR engine.
+    
+    Args:
+        image: Input image
+        language: Language code
+        config_override: Custom Tesseract configuration
+        include_words: Include word text, bounding boxes and confidences
+        
+    Returns:
+        OCR results including text, confidence, and metadata
+    """
+    try:
+        # Configure Tesseract
+        tesseract_config = config_override or config.get_tesseract_config(language=language)
+        
+        # Perform OCR with detailed data
+        data = ocr_engine.image_to_data(image, language, tesseract_config)
+        
+        # Extract text and confidence
+        text_parts = []
+        confidences = []
+        words = []
+        
+        for i in range(len(data['text'])):
+            if int(data['conf'][i]) > 0:  # Valid text
+                text = data['text'][i].strip()
+                if text:
+                    text_parts.append(text)
+                    confidences.append(int(data['conf'][i]))
+                    
+                    if include_words:
+                        left, top = int(data['left'][i]), int(data['top'][i])
+                        words.append({
+                            'text': text,
+                            'bbox': [left, top, left + int(data['width'][i]), top + int(data['height'][i])],
+                            'confidence': int(data['conf'][i])
+                        })
+        
+        full_text = ' '.join(text_parts)
+        avg_confidence = np.mean(confidences) if confidences else 0
+        
+        result = {
+            'text': full_text,
+            'confidence': avg_confidence,
+            'word_confidence': confidences,
+            'metadata': {
+                'language': language,
+                'engine': ocr_engine.name,
+                'word_count': len(text_parts),
+                'processing_timestamp': datetime.now().isoformat()
+            }
+        }
+        
+        if include_words:
+            result['words'] = words
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"OCR processing failed: {str(e)}")
+        raise
+
+
+def ocr_text_region(image: np.ndarray, region: tuple, language: str) -> Dict[str, Any]:
+    """
+    OCR a single text block with a page segmentation mode suited to its shape.
+    
+    Single-line blocks use PSM 7 (single text line), others PSM 6 (uniform
+    block of text). Word boxes are translated to page coordinates.
+    
+    Args:
+        image: Page image
+        region: (x, y, w, h) block bounding box
+        language: Language code
+        
+    Returns:
+        OCR results for the block, with 'words' and 'region' details
+    """
+    x, y, w, h = region
+    crop = document_preprocessor.crop_text_regions(image, [region])[0]
+    gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    psm = 7 if document_preprocessor.count_text_lines(gray) <= 1 else 6
+    
+    result = perform_ocr(
+        crop, language, config.get_tesseract_config(language=language, psm=psm), include_words=True
+    )
+    
+    for word in result['words']:
+        left, top, right, bottom = word['bbox']
+        word['bbox'] = [left + x, top + y, right + x, bottom + y]
+    
+    result['region'] = {
+        'bbox': [x, y, x + w, y + h],
+        'psm': psm,
+        'text': result['text'],
+        'confidence': float(result['confidence'])
+    }
+    return result
+
+
+def perform_region_ocr(image: np.ndarray, language: str = "eng") -> Dict[str, Any]:
+    """
+    Detect text blocks and OCR them in parallel, merging results in reading order.
+    
+    Sparse pages such as forms spend far less Tesseract time on blank space
+    this way. Pages where no blocks are found, or with more than
+    ``max_regions`` blocks, are OCR'd as a whole.
+    
+    Args:
+        image: Page image
+        language: Language code
+        
+    Returns:
+        OCR results including word bounding boxes and per-region details
+    """
+    regions = document_preprocessor.detect_text_blocks(image)
+    
+    if not regions or len(regions) > config.LAYOUT['max_regions']:
+        result = perform_ocr(image, language, include_words=True)
+        result['metadata']['region_ocr'] = False
+        return result
+    
+    region_results = list(get_region_executor().map(
+        lambda region: ocr_text_region(image, region, language), regions
+    ))
+    
+    text_parts = []
+    confidences = []
+    words = []
+    for region_result in region_results:
+        if region_result['text']:
+            text_parts.append(region_result['text'])
+        confidences.extend(region_result['word_confidence'])
+        words.extend(region_result['words'])
+    
+    return {
+        'text': '\n'.join(text_parts),
+        'confidence': np.mean(confidences) if confidences else 0,
+        'word_confidence': confidences,
+        'words': words,
+        'regions': [region_result['region'] for region_result in region_results],
+        'metadata': {
+            'language': language,
+            'engine': ocr_engine.name,
+            'word_count': len(words),
+            'region_ocr': True,
+            'region_count': len(regions),
+            'processing_timestamp': datetime.now().isoformat()
+        }
+    }
+
+
+def ocr_pdf_page_image(image: np.ndarray, page_num: int, language: str, preprocessing: bool,
+                       region_ocr: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Preprocess and OCR a rendered PDF page.
+    
+    Args:
+        image: Rendered page image
+        page_num: Zero-based page number
+        language: Language code
+        preprocessing: Enable preprocessing
+        region_ocr: OCR detected text blocks separately
+        
+    Returns:
+        OCR results for the page, or None if the page failed
+    """
+    try:
+        # Preprocess if requested
+        preprocessing_report = {}
+        if preprocessing:
+            image = preprocess_image_for_ocr(image, report=preprocessing_report)
+        
+        # Perform OCR
+        if region_ocr:
+            result = perform_region_ocr(image, language)
+        else:
+            result = perform_ocr(image, language)
+        if preprocessing_report:
+            result['preprocessing'] = preprocessing_report
+        logger.debug(f"OCR completed for PDF page {page_num + 1}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Error processing PDF page {page_num + 1}: {str(e)}")
+        return None
+
+
+def process_pdf_page(file_path: str, page_num: int, language: str, preprocessing: bool,
+                     region_ocr: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Rasterize, preprocess and OCR a single PDF page.
+    
+    Runs inside the page worker pool, so it only takes picklable arguments.
+    
+    Args:
+        file_path: Path to PDF file
+        page_num: Zero-based page number
+        language: Language code
+        preprocessing: Enable preprocessing
+        region_ocr: OCR detected text blocks separately
+        
+    Returns:
+        OCR results for the page, or None if the page failed
+    """
+    try:
+        image = pdf_processor.render_page(file_path, page_num, grayscale=render_grayscale(preprocessing))
+    except Exception as e:
+        logger.error(f"Error rendering PDF page {page_num + 1}: {str(e)}")
+        return None
+    
+    return ocr_pdf_page_image(image, page_num, language, preprocessing, region_ocr)
+
+
+def render_grayscale(preprocessing: bool) -> bool:
+    """Render PDF pages in grayscale when preprocessing converts to grayscale anyway."""
+    return preprocessing and config.PDF.get('render_grayscale', True)
@@ -13,7 +13,8 @@ This module handles all document preprocessing operations including:
 import cv2
 import numpy as np
 import logging
-from typing import Tuple, Optional, Dict, Any
+import time
+from typing import Tuple, Optional, Dict, Any, Iterator, List
 from PIL import Image, ImageEnhance, ImageFilter
 import math
 
@@ -24,6 +25,15 @@ logger = logging.getLogger(__name__)
 class DocumentPreprocessor:
     """Handles document preprocessing for OCR optimization."""
     
+    # Pipeline steps in execution order, mapped to the method implementing each
+    PIPELINE_STEPS = {
+        'remove_noise': 'remove_noise',
+        'deskew': 'deskew_image',
+        'enhance_contrast': 'enhance_contrast',
+        'sharpen': 'sharpen_image',
+        'binarize': 'binarize_image',
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize preprocessor with configuration.
@@ -34,35 +44,67 @@ class DocumentPreprocessor:
         self.config = config
         self.logger = logging.getLogger(__name__)
     
-    def preprocess_image(self, image: np.ndarray) -> np.ndarray:
+    def preprocess_image(self, image: np.ndarray, report: Optional[Dict[str, Any]] = None) -> np.ndarray:
         """
         Apply complete preprocessing pipeline to an image.
         
+        When ``adaptive`` is enabled, a cheap quality analysis decides which
+        steps the image actually needs; clean scans skip denoising, deskewing,
+        contrast enhancement and sharpening, and already bilevel images skip
+        binarization.
+        
         Args:
             image: Input image as numpy array
+            report: Optional dictionary filled with the image analysis, the
+                steps applied and skipped, and per-step timings in seconds
             
         Returns:
             Preprocessed image
         """
         try:
+            timings = {}
+            applied = []
+            skipped = []
+            
             # Ensure image is in grayscale for better OCR
             if len(image.shape) == 3:
+                step_start = time.perf_counter()
                 image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                timings['grayscale'] = time.perf_counter() - step_start
+            
+            adaptive = self.config.get('adaptive', False)
+            analysis = None
+            if adaptive:
+                step_start = time.perf_counter()
+                analysis = self.analyze_image(image)
+                timings['analysis'] = time.perf_counter() - step_start
+                run_steps = self.select_steps(analysis)
+            else:
+                run_steps = dict.fromkeys(self.PIPELINE_STEPS, True)
             
-            # Step 1: Noise reduction
-            image = self.remove_noise(image)
-            
-            # Step 2: Deskewing
-            image = self.deskew_image(image)
-            
-            # Step 3: Contrast enhancement
-            image = self.enhance_contrast(image)
-            
-            # Step 4: Sharpening
-            image = self.sharpen_image(image)
-            
-            # Step 5: Binarization
-            image = self.binarize_image(image)
+            for step in self.PIPELINE_STEPS:
+                if not run_steps[step]:
+                    skipped.append(step)
+                    continue
+                
+                step_start = time.perf_counter()
+                if step == 'deskew' and analysis is not None:
+                    # Reuse the angle estimated during analysis
+                    image = self.deskew_image(image, angle=analysis['skew_angle'])
+                else:
+                    image = getattr(self, self.PIPELINE_STEPS[step])(image)
+                timings[step] = time.perf_counter() - step_start
+                applied.append(step)
+            
+            if report is not None:
+                report.update({
+                    'adaptive': adaptive,
+                    'analysis': analysis,
+                    'steps_applied': applied,
+                    'steps_skipped': skipped,
+                    'timings': {step: round(seconds, 5) for step, seconds in timings.items()},
+                    'total_time': round(sum(timings.values()), 5)
+                })
             
             return image
             
@@ -70,6 +112,200 @@ class DocumentPreprocessor:
             self.logger.error(f"Error in preprocessing pipeline: {str(e)}")
             raise
     
+    def analyze_image(self, image: np.ndarray) -> Dict[str, Any]:
+        """
+        Estimate image quality to decide which preprocessing steps are needed.
+        
+        Noise and sharpness are measured on a full-resolution center crop
+        (downscaling would average the noise away); skew and contrast are
+        measured on a downscaled copy.
+        
+        Args:
+            image: Input grayscale image
+            
+        Returns:
+            Dictionary with noise_sigma, sharpness, contrast, skew_angle
+            and is_binary
+        """
+        rows, cols = image.shape[:2]
+        
+        # Full-resolution center crop
+        crop_size = self.config.get('analysis_crop_size', 1024)
+        top = max(0, (rows - crop_size) // 2)
+        left = max(0, (cols - crop_size) // 2)
+        crop = image[top:top + crop_size, left:left + crop_size]
+        
+        # Fast noise variance estimation (Immerkaer, 1996)
+        noise_kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        response = cv2.filter2D(crop, cv2.CV_32F, noise_kernel)
+        crop_rows, crop_cols = crop.shape[:2]
+        noise_sigma = float(
+            np.abs(response[1:-1, 1:-1]).sum() * math.sqrt(math.pi / 2) /
+            (6 * max(1, crop_rows - 2) * max(1, crop_cols - 2))
+        )
+        
+        # Variance of the Laplacian as a focus measure
+        sharpness = float(cv2.Laplacian(crop, cv2.CV_64F).var())
+        
+        # Bilevel check on the crop, since downscaling introduces gray levels
+        crop_hist = cv2.calcHist([crop], [0], None, [256], [0, 256]).ravel()
+        is_binary = int(np.count_nonzero(crop_hist)) <= 2
+        
+        # Downscaled copy for global measurements
+        max_dim = self.config.get('analysis_max_dim', 1000)
+        scale = min(1.0, max_dim / max(rows, cols))
+        small = image if scale >= 1.0 else cv2.resize(
+            image, (max(1, int(cols * scale)), max(1, int(rows * scale))), interpolation=cv2.INTER_AREA
+        )
+        
+        # Contrast as the distance between the mean ink and paper intensities,
+        # split at the Otsu threshold so sparse pages are not dominated by paper
+        threshold, _ = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        hist = cv2.calcHist([small], [0], None, [256], [0, 256]).ravel()
+        levels = np.arange(256)
+        split = int(threshold) + 1
+        dark_count = hist[:split].sum()
+        light_count = hist[split:].sum()
+        contrast = 0.0
+        if dark_count and light_count:
+            contrast = (
+                (hist[split:] * levels[split:]).sum() / light_count -
+                (hist[:split] * levels[:split]).sum() / dark_count
+            )
+        
+        return {
+            'noise_sigma': round(noise_sigma, 3),
+            'sharpness': round(sharpness, 1),
+            'contrast': round(float(contrast), 1),
+            'skew_angle': round(self.estimate_skew_angle(small), 3),
+            'is_binary': is_binary
+        }
+    
+    def select_steps(self, analysis: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Decide which preprocessing steps to run from an image analysis.
+        
+        Args:
+            analysis: Output of analyze_image
+            
+        Returns:
+            Mapping of pipeline step name to whether it should run
+        """
+        angle = abs(analysis['skew_angle'])
+        deskew = self.config.get('deskew_angle_threshold', 0.5) < angle < self.config.get('deskew_max_angle', 5.0)
+        
+        if analysis['is_binary']:
+            # Bilevel input (e.g. fax or already thresholded scans) only needs deskewing
+            return dict(dict.fromkeys(self.PIPELINE_STEPS, False), deskew=deskew)
+        
+        noisy = analysis['noise_sigma'] > self.config.get('noise_threshold', 3.0)
+        
+        return {
+            'remove_noise': noisy,
+            'deskew': deskew,
+            'enhance_contrast': analysis['contrast'] < self.config.get('min_contrast', 120),
+            # Sharpening amplifies noise, so only sharpen clean but soft images
+            'sharpen': not noisy and analysis['sharpness'] < self.config.get('blur_threshold', 100.0),
+            'binarize': True
+        }
+    
+    def estimate_skew_angle(self, image: np.ndarray, method: Optional[str] = None,
+                            max_dim: Optional[int] = None) -> float:
+        """
+        Estimate the skew angle of a grayscale image.
+        
+        The angle does not depend on resolution, so it is estimated on a copy
+        decimated to ``deskew_max_dim`` pixels on its longest side; only the
+        final rotation needs the full-resolution image. Two estimators are
+        available via ``deskew_method``:
+        - 'projection': angle maximizing the sharpness of the horizontal
+          projection profile of ink pixels, searched coarse-to-fine down to
+          ``deskew_angle_step`` degrees
+        - 'hough': median angle of near-horizontal Hough lines (1 degree
+          resolution)
+        
+        Args:
+            image: Input grayscale image
+            method: Estimation method (defaults to ``deskew_method``)
+            max_dim: Longest side of the decimated copy, 0 for full resolution
+                (defaults to ``deskew_max_dim``)
+            
+        Returns:
+            Angle in degrees to rotate the image by to correct the skew
+            (0.0 if no skew could be estimated)
+        """
+        method = method or self.config.get('deskew_method', 'projection')
+        max_dim = self.config.get('deskew_max_dim', 1000) if max_dim is None else max_dim
+        
+        rows, cols = image.shape[:2]
+        if max_dim and max(rows, cols) > max_dim:
+            scale = max_dim / max(rows, cols)
+            image = cv2.resize(
+                image, (max(1, int(cols * scale)), max(1, int(rows * scale))), interpolation=cv2.INTER_AREA
+            )
+        
+        if method == 'projection':
+            return self._estimate_skew_projection(image)
+        if method == 'hough':
+            return self._estimate_skew_hough(image)
+        
+        raise ValueError(f"Unsupported deskew method: {method}")
+    
+    def _estimate_skew_hough(self, image: np.ndarray) -> float:
+        """Estimate skew from the median angle of near-horizontal Hough lines."""
+        edges = cv2.Canny(image, 50, 150, apertureSize=3)
+        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
+        
+        if lines is None:
+            return 0.0
+        
+        angles = [theta * 180 / np.pi - 90 for rho, theta in lines[:, 0]]
+        angles = [angle for angle in angles if abs(angle) < 45]
+        
+        return float(np.median(angles)) if angles else 0.0
+    
+    def _estimate_skew_projection(self, image: np.ndarray, max_points: int = 200000) -> float:
+        """Estimate skew by maximizing the row-to-row variation of the ink projection profile."""
+        max_angle = self.config.get('deskew_max_angle', 5.0)
+        angle_step = self.config.get('deskew_angle_step', 0.1)
+        
+        _, ink = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        ys, xs = np.nonzero(ink)
+        if len(xs) < 2 or len(xs) > ink.size / 2:
+            # Blank page, or Otsu split the background rather than the text
+            return 0.0
+        
+        if len(xs) > max_points:
+            stride = len(xs) // max_points + 1
+            ys, xs = ys[::stride], xs[::stride]
+        
+        rows, cols = image.shape[:2]
+        xs = xs.astype(np.float32) - cols / 2
+        ys = ys.astype(np.float32) - rows / 2
+        
+        def score(angle: float) -> float:
+            # Row of each ink pixel after cv2.getRotationMatrix2D(center, angle) rotation
+            radians = math.radians(angle)
+            rotated_rows = np.round(ys * math.cos(radians) - xs * math.sin(radians)).astype(np.int64)
+            profile = np.bincount(rotated_rows - rotated_rows.min()).astype(np.float64)
+            return float(np.sum(np.diff(profile) ** 2))
+        
+        # Coarse-to-fine search around the best angle so far
+        best_angle = 0.0
+        step = min(1.0, max_angle)
+        low, high = -max_angle, max_angle
+        
+        while True:
+            candidates = np.arange(low, high + step / 2, step)
+            best_angle = float(max(candidates, key=score))
+            if step <= angle_step:
+                break
+            low = max(-max_angle, best_angle - step)
+            high = min(max_angle, best_angle + step)
+            step = max(angle_step, step / 5)
+        
+        return best_angle
+    
     def remove_noise(self, image: np.ndarray) -> np.ndarray:
         """
         Remove noise from the image.
@@ -98,46 +334,41 @@ class DocumentPreprocessor:
             self.logger.error(f"Error in noise removal: {str(e)}")
             return image
     
-    def deskew_image(self, image: np.ndarray) -> np.ndarray:
+    def deskew_image(self, image: np.ndarray, angle: Optional[float] = None) -> np.ndarray:
         """
         Correct skew in the image.
         
+        The skew angle is estimated on a decimated copy (see
+        estimate_skew_angle) and the rotation is applied at full resolution.
+        
         Args:
             image: Input grayscale image
+            angle: Previously estimated skew angle in degrees; estimated from
+                the image when not given
             
         Returns:
             Deskewed image
         """
         try:
-            # Detect skew angle using Hough transform
-            edges = cv2.Canny(image, 50, 150, apertureSize=3)
-            lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
-            
-            if lines is not None:
-                angles = []
-                for rho, theta in lines[0]:
-                    angle = theta * 180 / np.pi
-                    if 0 < angle < 180:
-                        angles.append(angle - 90)
+            if angle is None:
+                angle = self.estimate_skew_angle(image)
+            
+            angle_threshold = self.config.get('deskew_angle_threshold', 0.5)
+            max_angle = self.config.get('deskew_max_angle', 5.0)
+            
+            if abs(angle) > angle_threshold and abs(angle) < max_angle:
+                # Rotate image to correct skew
+                rows, cols = image.shape
+                rotation_matrix = cv2.getRotationMatrix2D(
+                    (cols / 2, rows / 2), angle, 1.0
+                )
+                deskewed = cv2.warpAffine(
+                    image, rotation_matrix, (cols, rows),
+                    flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+                )
                 
-                if angles:
-                    median_angle = np.median(angles)
-                    angle_threshold = self.config.get('deskew_angle_threshold', 0.5)
-                    max_angle = self.config.get('deskew_max_angle', 5.0)
-                    
-                    if abs(median_angle) > angle_threshold and abs(median_angle) < max_angle:
-                        # Rotate image to correct skew
-                        rows, cols = image.shape
-                        rotation_matrix = cv2.getRotationMatrix2D(
-                            (cols / 2, rows / 2), median_angle, 1.0
-                        )
-                        deskewed = cv2.warpAffine(
-                            image, rotation_matrix, (cols, rows),
-                            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
-                        )
-                        
-                        self.logger.debug(f"Image deskewed by {median_angle:.2f} degrees")
-                        return deskewed
+                self.logger.debug(f"Image deskewed by {angle:.2f} degrees")
+                return deskewed
             
             return image
             
@@ -401,6 +632,106 @@ class DocumentPreprocessor:
             self.logger.error(f"Error in text region extraction: {str(e)}")
             return []
     
+    def detect_text_blocks(self, image: np.ndarray) -> list:
+        """
+        Detect text blocks (paragraphs, form fields, table cells) in reading order.
+        
+        Ink is dilated with ``region_dilate_kernel`` so neighbouring glyphs
+        and lines merge into blocks; each block is then shrunk back to its ink
+        extent plus ``region_padding`` pixels.
+        
+        Args:
+            image: Input image
+            
+        Returns:
+            List of (x, y, w, h) block bounding boxes in reading order
+        """
+        try:
+            if len(image.shape) == 3:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            else:
+                gray = image
+            
+            _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+            if cv2.countNonZero(ink) > ink.size / 2:
+                # Blank page, or Otsu split the background rather than the text
+                return []
+            
+            kernel_width, kernel_height = self.config.get('region_dilate_kernel', (25, 15))
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_width, kernel_height))
+            merged = cv2.dilate(ink, kernel)
+            
+            contours, _ = cv2.findContours(merged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            
+            min_area = self.config.get('region_min_area', 200)
+            padding = self.config.get('region_padding', 4)
+            rows, cols = gray.shape[:2]
+            
+            blocks = []
+            for contour in contours:
+                x, y, w, h = cv2.boundingRect(contour)
+                
+                # Shrink the dilated box back to the ink it contains
+                ink_x, ink_y, ink_w, ink_h = cv2.boundingRect(ink[y:y+h, x:x+w])
+                if ink_w * ink_h < min_area:
+                    continue
+                
+                left = max(0, x + ink_x - padding)
+                top = max(0, y + ink_y - padding)
+                right = min(cols, x + ink_x + ink_w + padding)
+                bottom = min(rows, y + ink_y + ink_h + padding)
+                blocks.append((left, top, right - left, bottom - top))
+            
+            self.logger.debug(f"Detected {len(blocks)} text blocks")
+            return self.sort_reading_order(blocks)
+            
+        except Exception as e:
+            self.logger.error(f"Error in text block detection: {str(e)}")
+            return []
+    
+    def sort_reading_order(self, regions: list) -> list:
+        """
+        Sort regions top-to-bottom, and left-to-right within a band of
+        vertically overlapping regions.
+        
+        Args:
+            regions: List of (x, y, w, h) tuples
+            
+        Returns:
+            Regions in reading order
+        """
+        ordered = []
+        band = []
+        band_bottom = None
+        
+        for region in sorted(regions, key=lambda r: (r[1], r[0])):
+            x, y, w, h = region
+            if band and y >= band_bottom:
+                ordered.extend(sorted(band, key=lambda r: r[0]))
+                band = []
+            
+            band_bottom = y + h if not band else max(band_bottom, y + h)
+            band.append(region)
+        
+        ordered.extend(sorted(band, key=lambda r: r[0]))
+        return ordered
+    
+    def count_text_lines(self, image: np.ndarray) -> int:
+        """
+        Count text lines in a block from its horizontal ink projection.
+        
+        Args:
+            image: Grayscale block image
+            
+        Returns:
+            Number of runs of rows containing ink
+        """
+        _, ink = cv2.threshold(image, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        rows_with_ink = ink.any(axis=1).astype(np.int8)
+        
+        # Count starts of ink runs
+        return int(np.count_nonzero(np.diff(rows_with_ink, prepend=0) == 1))
+    
     def crop_text_regions(self, image: np.ndarray, regions: list) -> list:
         """
         Crop text regions from the image.
@@ -438,47 +769,239 @@ class PDFProcessor:
         self.config = config
         self.logger = logging.getLogger(__name__)
     
-    def extract_images_from_pdf(self, pdf_path: str) -> list:
+    def extract_images_from_pdf(self, pdf_path: str, grayscale: bool = False) -> list:
         """
         Extract images from PDF pages.
         
+        Materializes every page; prefer iter_page_images for large documents.
+        
         Args:
             pdf_path: Path to PDF file
+            grayscale: Render pages as single-channel grayscale
             
         Returns:
             List of extracted images
         """
+        # Pages yielded by the iterator borrow the pixmap buffer, so copy them
+        images = [image.copy() for _, image in self.iter_page_images(pdf_path, grayscale)]
+        self.logger.info(f"Extracted {len(images)} images from PDF")
+        return images
+    
+    def iter_page_images(self, pdf_path: str, grayscale: bool = False,
+                         page_numbers: Optional[List[int]] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Render PDF pages one at a time.
+        
+        Each image wraps the page pixmap's sample buffer directly and is only
+        valid until the next page is requested, so at most one rendered page
+        is held in memory. Callers that need to keep a page must copy it.
+        
+        Args:
+            pdf_path: Path to PDF file
+            grayscale: Render pages as single-channel grayscale
+            page_numbers: Zero-based pages to render (all pages if None)
+            
+        Yields:
+            Tuples of (zero-based page number, page image)
+        """
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            raise ImportError("PyMuPDF (fitz) is required for PDF processing")
+        
+        try:
+            with fitz.open(pdf_path) as doc:
+                if page_numbers is None:
+                    page_numbers = range(len(doc))
+                
+                for page_num in page_numbers:
+                    pix = self._render_pixmap(doc, page_num, grayscale)
+                    yield page_num, self._pixmap_to_array(pix)
+                    self.logger.debug(f"Rendered PDF page {page_num + 1}")
+                    
+                    # Release the page before rendering the next one
+                    del pix
+                    
+        except Exception as e:
+            self.logger.error(f"Error extracting images from PDF: {str(e)}")
+            raise
+    
+    def get_page_count(self, pdf_path: str) -> int:
+        """
+        Get the number of pages in a PDF.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            Number of pages
+        """
         try:
             import fitz  # PyMuPDF
             
-            doc = fitz.open(pdf_path)
-            images = []
+            with fitz.open(pdf_path) as doc:
+                return len(doc)
             
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Get page as image
-                mat = self.config.get('dpi', 300) / 72  # Convert DPI to matrix
-                pix = page.get_pixmap(matrix=fitz.Matrix(mat, mat))
-                
-                # Convert to numpy array
-                img_data = pix.tobytes("png")
-                img_array = np.frombuffer(img_data, np.uint8)
-                img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                
-                if img is not None:
-                    images.append(img)
-                    self.logger.debug(f"Extracted image from PDF page {page_num + 1}")
+        except ImportError:
+            raise ImportError("PyMuPDF (fitz) is required for PDF processing")
+    
+    def extract_text_layers(self, pdf_path: str) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract the embedded text layer of every PDF page.
+        
+        Args:
+            pdf_path: Path to PDF file
             
-            doc.close()
-            self.logger.info(f"Extracted {len(images)} images from PDF")
-            return images
+        Returns:
+            Per-page text layers, with None for pages that have no usable
+            text layer and need raster OCR
+        """
+        try:
+            import fitz  # PyMuPDF
+            
+            with fitz.open(pdf_path) as doc:
+                return [self.extract_page_text_layer(page) for page in doc]
             
         except ImportError:
             raise ImportError("PyMuPDF (fitz) is required for PDF processing")
+    
+    def extract_page_text_layer(self, page) -> Optional[Dict[str, Any]]:
+        """
+        Extract the embedded text of a page if it is usable.
+        
+        A text layer is usable when it has at least ``text_layer_min_chars``
+        characters and at least ``text_layer_min_quality`` of them are
+        printable (broken font encodings yield replacement characters).
+        Pages dominated by images are OCR'd even with a usable text layer, so
+        a scanned page with an OCR'd header or a stamp, or an image with a
+        caption, does not lose the text in its images: images must cover less
+        than ``text_layer_max_image_coverage`` of the page, or the text blocks
+        must cover at least half as much of the page as the images.
+        
+        Args:
+            page: PyMuPDF page
+            
+        Returns:
+            Dictionary with the page text and word boxes (in pixels at the
+            configured DPI), or None if the page needs raster OCR
+        """
+        try:
+            text = page.get_text("text", sort=True).strip()
+            
+            min_chars = self.config.get('text_layer_min_chars', 25)
+            visible = [c for c in text if not c.isspace()]
+            if len(visible) < min_chars:
+                return None
+            
+            printable = sum(1 for c in visible if c.isprintable() and c != '\ufffd')
+            if printable / len(visible) < self.config.get('text_layer_min_quality', 0.8):
+                return None
+            
+            image_coverage = self._page_coverage(page, [image['bbox'] for image in page.get_image_info()])
+            if image_coverage >= self.config.get('text_layer_max_image_coverage', 0.5):
+                text_coverage = self._page_coverage(
+                    page, [block[:4] for block in page.get_text("blocks") if block[6] == 0]
+                )
+                if text_coverage < image_coverage / 2:
+                    return None
+            
+            scale = self.config.get('dpi', 300) / 72
+            words = [
+                {
+                    'text': word[4],
+                    'bbox': [round(coord * scale) for coord in word[:4]]
+                }
+                for word in page.get_text("words", sort=True)
+            ]
+            
+            return {'text': text, 'words': words}
+            
         except Exception as e:
-            self.logger.error(f"Error extracting images from PDF: {str(e)}")
-            raise
+            self.logger.error(f"Error extracting text layer from PDF page {page.number + 1}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _page_coverage(page, rects: List, grid_size: int = 64) -> float:
+        """
+        Fraction of a page covered by the union of rectangles.
+        
+        Args:
+            page: PyMuPDF page
+            rects: Rectangles as (x0, y0, x1, y1) in page coordinates
+            grid_size: Resolution of the coverage grid per axis
+            
+        Returns:
+            Covered fraction of the page (0-1)
+        """
+        bounds = page.rect
+        if not rects or bounds.width <= 0 or bounds.height <= 0:
+            return 0.0
+        
+        covered = np.zeros((grid_size, grid_size), dtype=bool)
+        for x0, y0, x1, y1 in rects:
+            left = int(np.clip((x0 - bounds.x0) / bounds.width, 0, 1) * grid_size)
+            right = int(np.ceil(np.clip((x1 - bounds.x0) / bounds.width, 0, 1) * grid_size))
+            top = int(np.clip((y0 - bounds.y0) / bounds.height, 0, 1) * grid_size)
+            bottom = int(np.ceil(np.clip((y1 - bounds.y0) / bounds.height, 0, 1) * grid_size))
+            covered[top:bottom, left:right] = True
+        
+        return float(covered.mean())
+    
+    def render_page(self, pdf_path: str, page_num: int, grayscale: bool = False) -> np.ndarray:
+        """
+        Render a single PDF page to an image.
+        
+        Args:
+            pdf_path: Path to PDF file
+            page_num: Zero-based page number
+            grayscale: Render the page as single-channel grayscale
+            
+        Returns:
+            Page image as numpy array (owns its memory)
+        """
+        try:
+            import fitz  # PyMuPDF
+            
+            with fitz.open(pdf_path) as doc:
+                pix = self._render_pixmap(doc, page_num, grayscale)
+                return self._pixmap_to_array(pix, copy=True)
+            
+        except ImportError:
+            raise ImportError("PyMuPDF (fitz) is required for PDF processing")
+    
+    def _render_pixmap(self, doc, page_num: int, grayscale: bool = False):
+        """Render a page of an open document at the configured DPI."""
+        import fitz  # PyMuPDF
+        
+        page = doc.load_page(page_num)
+        mat = self.config.get('dpi', 300) / 72  # Convert DPI to matrix
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+        
+        return page.get_pixmap(matrix=fitz.Matrix(mat, mat), colorspace=colorspace, alpha=False)
+    
+    def _pixmap_to_array(self, pix, copy: bool = False) -> np.ndarray:
+        """
+        Convert a pixmap to a numpy array without a PNG encode/decode round-trip.
+        
+        Grayscale pixmaps are wrapped zero-copy unless ``copy`` is set; RGB
+        pixmaps are converted to OpenCV's BGR channel order.
+        
+        Args:
+            pix: Pixmap without alpha channel
+            copy: Copy the samples so the array outlives the pixmap
+            
+        Returns:
+            Grayscale (H, W) or BGR (H, W, 3) image
+        """
+        # samples_mv (newer PyMuPDF) is a memoryview; samples is a bytes copy
+        samples = pix.samples_mv if not copy and hasattr(pix, 'samples_mv') else pix.samples
+        rows = np.frombuffer(samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+        img = rows[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+        
+        if pix.n == 1:
+            return img[:, :, 0]
+        
+        return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
 
 
 class SpreadsheetProcessor:
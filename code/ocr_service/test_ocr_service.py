@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Test script for the OCR Service
+Checks the text layer, caching, job store and layout fast paths on synthetic
+documents. None of the checks needs the Tesseract binary.
+"""
+
+import sys
+import os
+import time
+import tempfile
+from typing import Any, Dict
+
+# Add the package to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the service log out of the working directory
+os.environ.setdefault('OCR_SERVICE_LOG_FILE', os.path.join(tempfile.gettempdir(), 'ocr_service_test.log'))
+
+try:
+    import cv2
+    import fitz  # PyMuPDF
+    import numpy as np
+    import main as ocr_main
+    from config import OCRConfig
+    from cache import MemoryCacheBackend, DiskCacheBackend, OCRResultCache
+    from job_store import InMemoryJobStore, SQLiteJobStore
+    from preprocessing import DocumentPreprocessor, PDFProcessor
+except ImportError as e:
+    raise ImportError(f"{e}. Please install required dependencies: pip install -r requirements.txt") from e
+
+
+BODY_TEXT = "Quarterly report. Revenue grew in every region and costs stayed flat. " * 3
+
+
+def make_text_page(rows: int = 1400, cols: int = 1000, ink: int = 0, paper: int = 255) -> np.ndarray:
+    """Grayscale page with a line of printed text every 45 pixels."""
+    image = np.full((rows, cols), paper, dtype=np.uint8)
+    for i, y in enumerate(range(80, rows - 60, 45)):
+        cv2.putText(image, f"Line {i:02d} the quick brown fox jumps over", (60, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, ink, 2, cv2.LINE_AA)
+    return image
+
+
+def rotate_page(image: np.ndarray, angle: float) -> np.ndarray:
+    """Rotate a page about its center by an angle in degrees, filling the corners with paper."""
+    rows, cols = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((cols / 2, rows / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (cols, rows), flags=cv2.INTER_LINEAR, borderValue=255)
+
+
+def make_scan_png() -> bytes:
+    """PNG of a gray scanned page, embedded as an image in test PDFs."""
+    scan = make_text_page(800, 600, paper=235)
+    return cv2.imencode('.png', scan)[1].tobytes()
+
+
+class StubEngine:
+    """OCR engine stand-in reporting a name and version without Tesseract."""
+
+    def __init__(self, name: str, version: str):
+        self.name = name
+        self._version = version
+
+    def version(self) -> str:
+        return self._version
+
+
+class OCRServiceTester:
+    """Test suite for OCR service components."""
+
+    def __init__(self):
+        self.test_results = []
+        self.temp_dir = tempfile.mkdtemp(prefix='ocr_service_test_')
+
+    def check(self, test: str, name: str, passed: bool, detail: str = ""):
+        """Record and print one check."""
+        print(f"  {'✓' if passed else '✗'} {name}{f': {detail}' if detail else ''}")
+        self.test_results.append({'test': test, 'check': name, 'detail': detail, 'success': bool(passed)})
+
+    def test_text_layer(self):
+        """Born-digital pages use their text layer; image-dominated pages still go to OCR."""
+        print("Testing PDF Text Layer")
+        print("-" * 30)
+
+        processor = PDFProcessor(dict(OCRConfig.PDF))
+        scan = make_scan_png()
+
+        try:
+            with fitz.open() as doc:
+                text_page = doc.new_page(width=612, height=792)
+                text_page.insert_textbox(fitz.Rect(72, 72, 540, 720), BODY_TEXT * 4, fontsize=11)
+
+                # Full-page scan with an OCR'd header line
+                scanned_page = doc.new_page(width=612, height=792)
+                scanned_page.insert_image(fitz.Rect(0, 0, 612, 792), stream=scan, keep_proportion=False)
+                scanned_page.insert_text((72, 40), "Scanned by ACME OCR - page header with enough characters",
+                                         fontsize=9)
+
+                logo_page = doc.new_page(width=612, height=792)
+                logo_page.insert_image(fitz.Rect(72, 72, 172, 172), stream=scan)
+                logo_page.insert_textbox(fitz.Rect(72, 200, 540, 720), BODY_TEXT * 4, fontsize=11)
+
+                # Image over the top half, text filling the bottom half
+                article_page = doc.new_page(width=612, height=792)
+                article_page.insert_image(fitz.Rect(0, 0, 612, 420), stream=scan, keep_proportion=False)
+                article_page.insert_textbox(fitz.Rect(36, 430, 576, 785), BODY_TEXT * 12, fontsize=10)
+
+                # Same image with only a caption
+                figure_page = doc.new_page(width=612, height=792)
+                figure_page.insert_image(fitz.Rect(0, 0, 612, 420), stream=scan, keep_proportion=False)
+                figure_page.insert_text((36, 440), "Figure 1: Revenue by region over the last four quarters",
+                                        fontsize=10)
+
+                short_page = doc.new_page(width=612, height=792)
+                short_page.insert_text((72, 72), "Page 6", fontsize=11)
+
+                layers = [processor.extract_page_text_layer(page) for page in doc]
+                text_page, scanned_page = doc[0], doc[1]
+
+                self.check('text_layer', "text page uses its text layer",
+                           layers[0] is not None and layers[0]['text'].startswith("Quarterly report."))
+                scale = OCRConfig.PDF['dpi'] / 72
+                first_word = text_page.get_text("words", sort=True)[0]
+                self.check('text_layer', "word boxes scaled to the render DPI",
+                           layers[0] is not None and layers[0]['words'][0] == {
+                               'text': first_word[4], 'bbox': [round(coord * scale) for coord in first_word[:4]]
+                           }, str(layers[0]['words'][0] if layers[0] else None))
+                self.check('text_layer', "scanned page with a text header goes to OCR", layers[1] is None)
+                self.check('text_layer', "small image does not force OCR", layers[2] is not None)
+                self.check('text_layer', "large image with text covering half as much uses the text layer",
+                           layers[3] is not None)
+                self.check('text_layer', "large image with only a caption goes to OCR", layers[4] is None)
+                self.check('text_layer', "too little text goes to OCR", layers[5] is None)
+
+                # Coverage is the union of the rectangles, clipped to the page
+                coverage = PDFProcessor._page_coverage
+                self.check('text_layer', "no rectangles cover nothing", coverage(text_page, []) == 0.0)
+                self.check('text_layer', "left half covers half",
+                           np.isclose(coverage(text_page, [(0, 0, 306, 792)]), 0.5))
+                self.check('text_layer', "overlapping rectangles counted once",
+                           np.isclose(coverage(text_page, [(0, 0, 306, 792), (0, 0, 306, 396), (153, 198, 306, 594)]),
+                                      0.5))
+                self.check('text_layer', "rectangles clipped to the page",
+                           np.isclose(coverage(text_page, [(-100, -100, 1000, 396)]), 0.5))
+                self.check('text_layer', "scanned page image coverage",
+                           np.isclose(coverage(scanned_page, [image['bbox'] for image in scanned_page.get_image_info()]),
+                                      1.0))
+
+        except Exception as e:
+            self.check('text_layer', "extract_page_text_layer", False, str(e))
+
+        print()
+
+    def test_result_cache(self):
+        """Cache keys cover the engine and its configuration; backends evict by size and age."""
+        print("Testing OCR Result Cache")
+        print("-" * 30)
+
+        original_engine = ocr_main.ocr_engine
+        original_tesseract_config = OCRConfig.TESSERACT_CONFIG
+
+        try:
+            file_path = os.path.join(self.temp_dir, 'page.png')
+            with open(file_path, 'wb') as f:
+                f.write(make_scan_png())
+
+            def key_for(file_ext: str = '.png', **request) -> str:
+                return OCRResultCache.make_key(file_path, ocr_main.get_cache_settings(file_ext, ocr_main.OCRRequest(**request)))
+
+            ocr_main.ocr_engine = StubEngine('pytesseract', '5.3.0')
+            base_key = key_for()
+            self.check('result_cache', "key is stable", key_for() == base_key)
+
+            ocr_main.ocr_engine = StubEngine('pytesseract', '5.4.1')
+            self.check('result_cache', "engine version changes the key", key_for() != base_key)
+
+            ocr_main.ocr_engine = StubEngine('tesserocr', '5.3.0')
+            self.check('result_cache', "engine changes the key", key_for() != base_key)
+
+            ocr_main.ocr_engine = StubEngine('pytesseract', '5.3.0')
+            OCRConfig.TESSERACT_CONFIG = dict(original_tesseract_config, config='--psm 4 --oem 1')
+            self.check('result_cache', "Tesseract config changes the key", key_for() != base_key)
+            OCRConfig.TESSERACT_CONFIG = original_tesseract_config
+
+            self.check('result_cache', "key restored with the original settings", key_for() == base_key)
+            self.check('result_cache', "language changes the key", key_for(language='deu') != base_key)
+            self.check('result_cache', "preprocessing changes the key", key_for(preprocessing=False) != base_key)
+            self.check('result_cache', "text layer setting only keys PDFs",
+                       key_for(use_text_layer=False) == base_key
+                       and key_for('.pdf', use_text_layer=False) != key_for('.pdf'))
+
+            with open(file_path, 'ab') as f:
+                f.write(b'\0')
+            self.check('result_cache', "file content changes the key", key_for() != base_key)
+
+            # Entries of 100 serialized bytes, 350 bytes allowed
+            def entry(i: int) -> Dict[str, Any]:
+                return {'text': f"{i:03d}".ljust(88, 'x')}
+
+            memory = MemoryCacheBackend(max_entries=100, max_bytes=350)
+            for i in range(3):
+                memory.set(f"key{i}", entry(i))
+            memory.get('key0')  # key1 is now least recently used
+            memory.set('key3', entry(3))
+            self.check('result_cache', "least recently used entry evicted over the byte budget",
+                       memory.get('key1') is None and all(memory.get(f"key{i}") == entry(i) for i in (0, 2, 3)))
+            self.check('result_cache', "byte total tracked", memory.total_bytes == 300 and len(memory) == 3,
+                       f"{memory.total_bytes} bytes in {len(memory)} entries")
+
+            memory.set('key0', {'text': 'short'})
+            self.check('result_cache', "replaced entry resized", memory.total_bytes == 200 + len('{"text": "short"}'))
+
+            memory.set('huge', {'text': 'x' * 1000})
+            self.check('result_cache', "entry over the budget not cached",
+                       memory.get('huge') is None and len(memory) == 3)
+
+            small = MemoryCacheBackend(max_entries=2, max_bytes=10000)
+            for i in range(3):
+                small.set(f"key{i}", entry(i))
+            self.check('result_cache', "entry count bounded", small.get('key0') is None and len(small) == 2)
+
+            disk = DiskCacheBackend(os.path.join(self.temp_dir, 'cache'), ttl=60, purge_interval=1000)
+            disk.set('ab' + '0' * 62, {'text': 'fresh'})
+            disk.set('cd' + '0' * 62, {'text': 'stale'})
+            disk.set('ef' + '0' * 62, {'text': 'stale too'})
+            self.check('result_cache', "disk entry read back", disk.get('ab' + '0' * 62) == {'text': 'fresh'})
+
+            stale_time = time.time() - 120
+            for key in ('cd' + '0' * 62, 'ef' + '0' * 62):
+                os.utime(disk._path(key), (stale_time, stale_time))
+
+            self.check('result_cache', "expired disk entry is a miss and removed",
+                       disk.get('cd' + '0' * 62) is None and not os.path.exists(disk._path('cd' + '0' * 62)))
+            removed = disk.purge_expired()
+            self.check('result_cache', "purge removes only expired entries", removed == 1 and len(disk) == 1,
+                       f"{removed} removed, {len(disk)} left")
+
+            cache = OCRResultCache(disk)
+            cache.get('ab' + '0' * 62)
+            cache.get('ff' + '0' * 62)
+            stats = cache.get_stats()
+            self.check('result_cache', "hits and misses counted", cache.hits == 1 and cache.misses == 1, str(stats))
+
+        except Exception as e:
+            self.check('result_cache', "result cache", False, str(e))
+        finally:
+            ocr_main.ocr_engine = original_engine
+            OCRConfig.TESSERACT_CONFIG = original_tesseract_config
+
+        print()
+
+    def test_job_store(self):
+        """Job status, result documents and appended results round-trip through both stores."""
+        print("Testing Job Store")
+        print("-" * 30)
+
+        db_path = os.path.join(self.temp_dir, 'jobs.db')
+        stores = [('memory', lambda: InMemoryJobStore()), ('sqlite', lambda: SQLiteJobStore(db_path))]
+
+        for name, make_store in stores:
+            try:
+                store = make_store()
+                store.create_job('job1', {'status': 'queued', 'total_files': 3})
+                store.update_job('job1', status='processing', processed_files=1)
+                job = store.get_job('job1')
+                self.check('job_store', f"{name}: status updated",
+                           job == {'status': 'processing', 'total_files': 3, 'processed_files': 1, 'job_id': 'job1'},
+                           str(job))
+
+                store.save_result('job1', {'results': [{'file_name': 'a.png', 'success': True}]})
+                store.save_result('job1', {'results': [{'file_name': 'a.png', 'success': True},
+                                                       {'file_name': 'b.pdf', 'success': False}]})
+                result = store.get_result('job1')
+                self.check('job_store', f"{name}: saved result replaced",
+                           result is not None and [r['file_name'] for r in result['results']] == ['a.png', 'b.pdf'],
+                           str(result))
+
+                store.append_results('job1', [{'index': 0}, {'index': 1}])
+                store.append_results('job1', [{'index': 2}])
+                self.check('job_store', f"{name}: appended results in order",
+                           store.get_results('job1') == [{'index': 0}, {'index': 1}, {'index': 2}])
+                self.check('job_store', f"{name}: results paged",
+                           store.get_results('job1', offset=1, limit=1) == [{'index': 1}]
+                           and store.get_results('job1', offset=2) == [{'index': 2}])
+
+                self.check('job_store', f"{name}: unknown job",
+                           store.get_job('missing') is None and store.get_result('missing') is None
+                           and store.get_results('missing') == [])
+
+                if name == 'sqlite':
+                    reopened = SQLiteJobStore(db_path)
+                    self.check('job_store', "sqlite: state survives reopening",
+                               reopened.get_job('job1') == job and reopened.get_result('job1') == result
+                               and len(reopened.get_results('job1')) == 3)
+
+                # Finished jobs are evicted after the TTL, running jobs are kept
+                store.result_ttl = 0
+                store.create_job('job2', {'status': 'processing'})
+                store.update_job('job1', status='completed')
+                time.sleep(0.01)
+                store.evict_expired()
+                self.check('job_store', f"{name}: finished job evicted after the TTL",
+                           store.get_job('job1') is None and store.get_results('job1') == []
+                           and store.get_job('job2') is not None)
+
+            except Exception as e:
+                self.check('job_store', f"{name} store", False, str(e))
+
+        print()
+
+    def test_adaptive_preprocessing(self):
+        """Clean scans skip the cleanup steps; each defect enables the step that fixes it."""
+        print("Testing Adaptive Preprocessing")
+        print("-" * 30)
+
+        preprocessor = DocumentPreprocessor(dict(OCRConfig.PREPROCESSING, adaptive=True))
+        clean = make_text_page()
+        rng = np.random.default_rng(0)
+        _, binary = cv2.threshold(clean, 127, 255, cv2.THRESH_BINARY)
+
+        pages = {
+            'clean': (clean, ['binarize']),
+            'noisy': (np.clip(clean + rng.normal(0, 20, clean.shape), 0, 255).astype(np.uint8),
+                      ['remove_noise', 'binarize']),
+            'low contrast': (make_text_page(ink=150, paper=200), ['enhance_contrast', 'binarize']),
+            'blurred': (cv2.GaussianBlur(clean, (9, 9), 3), ['sharpen', 'binarize']),
+            'skewed': (rotate_page(clean, 3.0), ['deskew', 'binarize']),
+            'bilevel': (binary, []),
+            'skewed bilevel': (rotate_page(binary, -2.0) > 127, ['deskew']),
+        }
+
+        try:
+            for name, (image, expected) in pages.items():
+                image = image.astype(np.uint8) * 255 if image.dtype == bool else image
+                analysis = preprocessor.analyze_image(image)
+                steps = [step for step, run in preprocessor.select_steps(analysis).items() if run]
+                self.check('adaptive_preprocessing', f"{name} page runs {expected or 'no steps'}", steps == expected,
+                           f"ran {steps} for {analysis}")
+
+            report = {}
+            preprocessor.preprocess_image(cv2.cvtColor(clean, cv2.COLOR_GRAY2BGR), report=report)
+            self.check('adaptive_preprocessing', "report lists applied and skipped steps",
+                       report['steps_applied'] == ['binarize']
+                       and report['steps_skipped'] == ['remove_noise', 'deskew', 'enhance_contrast', 'sharpen']
+                       and 'analysis' in report['timings'], str(report))
+
+            fixed = DocumentPreprocessor(dict(OCRConfig.PREPROCESSING, adaptive=False))
+            report = {}
+            fixed.preprocess_image(clean, report=report)
+            self.check('adaptive_preprocessing', "non-adaptive pipeline runs every step",
+                       report['steps_applied'] == list(DocumentPreprocessor.PIPELINE_STEPS), str(report['steps_applied']))
+
+        except Exception as e:
+            self.check('adaptive_preprocessing', "select_steps", False, str(e))
+
+        print()
+
+    def test_skew_estimation(self):
+        """The decimated skew estimate recovers known rotations like the full-resolution one."""
+        print("Testing Skew Estimation")
+        print("-" * 30)
+
+        preprocessor = DocumentPreprocessor(dict(OCRConfig.PREPROCESSING))
+        tolerance = OCRConfig.PREPROCESSING['deskew_angle_step'] * 2.5
+        page = cv2.resize(make_text_page(), (2000, 2800))
+
+        try:
+            for angle in (2.5, -3.0, 1.2, 0.0):
+                rotated = rotate_page(page, angle)
+
+                # The estimate is the rotation that undoes the skew
+                decimated = preprocessor.estimate_skew_angle(rotated)
+                full = preprocessor.estimate_skew_angle(rotated, max_dim=0)
+                hough = preprocessor.estimate_skew_angle(rotated, method='hough')
+                self.check('skew_estimation', f"{angle:+.1f} degrees recovered from the decimated page",
+                           abs(decimated + angle) <= tolerance, f"estimated {decimated:+.2f}")
+                self.check('skew_estimation', f"{angle:+.1f} degrees: decimated matches full resolution",
+                           abs(decimated - full) <= tolerance, f"{decimated:+.2f} vs {full:+.2f}")
+                self.check('skew_estimation', f"{angle:+.1f} degrees: Hough estimate within a degree",
+                           abs(hough + angle) <= 1.0, f"estimated {hough:+.2f}")
+
+            corrected = preprocessor.deskew_image(rotate_page(page, 2.5))
+            residual = preprocessor.estimate_skew_angle(corrected)
+            self.check('skew_estimation', "deskewed page is straight", abs(residual) <= tolerance,
+                       f"residual {residual:+.2f}")
+
+            self.check('skew_estimation', "blank page has no skew",
+                       preprocessor.estimate_skew_angle(np.full((1000, 800), 255, dtype=np.uint8)) == 0.0)
+
+        except Exception as e:
+            self.check('skew_estimation', "estimate_skew_angle", False, str(e))
+
+        print()
+
+    def test_reading_order(self):
+        """Regions are read in bands top to bottom and left to right within a band."""
+        print("Testing Reading Order")
+        print("-" * 30)
+
+        preprocessor = DocumentPreprocessor(dict(OCRConfig.PREPROCESSING))
+
+        try:
+            header = (50, 20, 900, 40)
+            left_column = (50, 100, 400, 600)
+            right_column = (520, 110, 400, 300)  # Starts lower but overlaps the left column
+            right_note = (520, 450, 400, 200)
+            footer = (50, 760, 900, 30)
+            regions = [footer, right_note, right_column, header, left_column]
+
+            self.check('reading_order', "columns read left to right within their band",
+                       preprocessor.sort_reading_order(regions) == [header, left_column, right_column, right_note, footer],
+                       str(preprocessor.sort_reading_order(regions)))
+
+            row = [(700, 12, 100, 30), (50, 10, 100, 30), (400, 8, 100, 30)]
+            self.check('reading_order', "regions on one line read left to right",
+                       preprocessor.sort_reading_order(row) == [row[1], row[2], row[0]])
+
+            stacked = [(300, 100, 200, 50), (50, 150, 200, 50)]
+            self.check('reading_order', "touching regions start a new band",
+                       preprocessor.sort_reading_order(stacked) == stacked)
+
+            self.check('reading_order', "no regions", preprocessor.sort_reading_order([]) == [])
+
+            # Two-column page: the header, both columns, then the footer
+            page = np.full((1200, 1000), 255, dtype=np.uint8)
+            cv2.putText(page, "ANNUAL REPORT", (300, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+            for x in (60, 560):
+                for y in range(250, 850, 32):
+                    cv2.putText(page, "column text line", (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+            cv2.putText(page, "page 1 of 1", (420, 1120), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+
+            blocks = preprocessor.detect_text_blocks(page)
+            lefts_and_tops = [(x // 100, y // 100) for x, y, _, _ in blocks]
+            self.check('reading_order', "detected blocks in reading order",
+                       lefts_and_tops == [(2, 0), (0, 2), (5, 2), (4, 10)], str(blocks))
+
+        except Exception as e:
+            self.check('reading_order', "sort_reading_order", False, str(e))
+
+        print()
+
+    def run_all_tests(self) -> bool:
+        """Run all tests and print the summary."""
+        print("OCR Service Test Suite")
+        print("=" * 60 + "\n")
+
+        self.test_text_layer()
+        self.test_result_cache()
+        self.test_job_store()
+        self.test_adaptive_preprocessing()
+        self.test_skew_estimation()
+        self.test_reading_order()
+
+        return self.print_summary()
+
+    def print_summary(self) -> bool:
+        """Print test results summary."""
+        print("=" * 60)
+        print("TEST SUMMARY")
+        print("=" * 60)
+
+        total_checks = len(self.test_results)
+        failed = [result for result in self.test_results if not result['success']]
+
+        print(f"Total checks: {total_checks}")
+        print(f"Successful: {total_checks - len(failed)}")
+        print(f"Failed: {len(failed)}")
+        for result in failed:
+            print(f"  ✗ {result['test']}: {result['check']} {result['detail']}")
+
+        print("=" * 60)
+        return not failed
+
+
+def main():
+    """Main test function."""
+    tester = OCRServiceTester()
+    sys.exit(0 if tester.run_all_tests() else 1)
+
+
+if __name__ == "__main__":
+    main()
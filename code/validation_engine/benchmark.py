@@ -0,0 +1,396 @@
+"""
+Validation Engine Benchmarks
+
+Command-line benchmarks for performance-sensitive parts of the validation engine.
+
+Usage:
+    python benchmark.py duplicates [--rows 10000 100000 1000000] [--duplicate-rate 0.05] [--legacy-max-rows 500]
+    python benchmark.py dataset [--rows 10000 100000 1000000] [--error-rate 0.05] [--records-max-rows 10000]
+    python benchmark.py shards [--rows 20000] [--workers 1 2 4 8] [--columnar]
+    python benchmark.py stream [--rows 1000000 10000000] [--format csv] [--chunk-size 100000]
+    python benchmark.py reference [--reference-rows 2000000] [--values 100000] [--calls 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from duplicate_detector import DuplicateDetector
+from main import ValidationEngine
+from consistency_checker import ConsistencyLevel, ReferenceDataValidator
+
+
+SYLLABLES = [
+    "al", "an", "ar", "be", "bo", "ca", "da", "de", "el", "en", "fa", "ga", "ha", "is", "ja", "ka",
+    "la", "le", "li", "lo", "ma", "mi", "na", "ne", "no", "or", "pa", "ra", "re", "ri", "ro", "sa",
+    "se", "ta", "te", "th", "to", "va", "wi", "za",
+]
+STREET_TYPES = ["St", "Ave", "Rd", "Dr", "Ln", "Blvd", "Way", "Ct"]
+
+
+def make_words(count: int, syllables: int, rng: np.random.Generator) -> pd.Series:
+    """Build capitalized pseudo-words from random syllables."""
+    words = pd.Series(rng.choice(SYLLABLES, count))
+    for _ in range(syllables - 1):
+        words = words + rng.choice(SYLLABLES, count)
+    return words.str.capitalize()
+
+
+def make_typo(value: str, rng: np.random.Generator) -> str:
+    """Apply one random character deletion, substitution or transposition."""
+    if len(value) < 3:
+        return value
+    
+    position = int(rng.integers(1, len(value) - 1))
+    operation = rng.integers(3)
+    if operation == 0:
+        return value[:position] + value[position + 1:]
+    if operation == 1:
+        return value[:position] + chr(int(rng.integers(97, 123))) + value[position + 1:]
+    return value[:position - 1] + value[position] + value[position - 1] + value[position + 1:]
+
+
+def make_customer_records(rows: int, duplicate_rate: float, seed: int = 0) -> Tuple[pd.DataFrame, Set[Tuple[int, int]]]:
+    """
+    Build synthetic customer records with injected near duplicates.
+    
+    Args:
+        rows: Number of records
+        duplicate_rate: Fraction of records that are typo copies of an earlier record
+        seed: Random seed
+    
+    Returns:
+        Records and the (original, copy) positions of the injected duplicates
+    """
+    rng = np.random.default_rng(seed)
+    first = make_words(rows, 2, rng)
+    last = make_words(rows, 3, rng)
+    cities = make_words(500, 3, rng)
+    
+    data = pd.DataFrame({
+        'name': first + ' ' + last,
+        'email': first.str.lower() + '.' + last.str.lower() + rng.integers(1, 100, rows).astype(str) + '@example.com',
+        'address': (pd.Series(rng.integers(1, 9999, rows).astype(str)) + ' ' + make_words(rows, 2, rng)
+                    + ' ' + rng.choice(STREET_TYPES, rows)),
+        'city': rng.choice(cities, rows)
+    })
+    
+    copies = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    copies = copies[copies > 0]
+    originals = (rng.random(len(copies)) * copies).astype(int)
+    
+    columns = {column: data[column].tolist() for column in data.columns}
+    for original, copy in zip(originals, copies):
+        for column in columns:
+            value = columns[column][original]
+            columns[column][copy] = make_typo(value, rng) if rng.random() < 0.5 else value
+    
+    return pd.DataFrame(columns), set(zip(originals.tolist(), copies.tolist()))
+
+
+def legacy_near_duplicates(data: pd.DataFrame, fields: List[str], threshold: float) -> List[Dict[str, Any]]:
+    """Pairwise near-duplicate scan as used before candidate generation (reference only)."""
+    pairs = []
+    
+    for i in range(len(data)):
+        for j in range(i + 1, len(data)):
+            similarities = []
+            for field in fields:
+                val1, val2 = str(data.iloc[i][field]), str(data.iloc[j][field])
+                if val1 == val2:
+                    similarities.append(1.0)
+                elif val1.lower() == val2.lower():
+                    similarities.append(0.8)
+                else:
+                    max_len = max(len(val1), len(val2))
+                    similarities.append(sum(1 for c1, c2 in zip(val1, val2) if c1 == c2) / max_len if max_len else 0.0)
+            similarity = np.mean(similarities)
+            if similarity >= threshold:
+                pairs.append({'index1': i, 'index2': j, 'similarity': similarity})
+    
+    return pairs
+
+
+def benchmark_duplicates(args):
+    """Measure near-duplicate detection time and recall of injected duplicates."""
+    detector = DuplicateDetector(similarity_threshold=args.threshold)
+    fields = ['name', 'email', 'address', 'city']
+    
+    print(f"{'rows':>10}{'legacy (s)':>12}{'indexed (s)':>13}{'rows/s':>10}"
+          f"{'candidates':>12}{'pairs':>9}{'recall':>8}")
+    
+    for rows in args.rows:
+        data, injected = make_customer_records(rows, args.duplicate_rate, args.seed)
+        
+        legacy = "-"
+        if rows <= args.legacy_max_rows:
+            start = time.perf_counter()
+            legacy_near_duplicates(data, fields, args.threshold)
+            legacy = f"{time.perf_counter() - start:.2f}"
+        
+        start = time.perf_counter()
+        result = detector.detect_near_duplicates(data, fields)
+        elapsed = time.perf_counter() - start
+        
+        found = {(pair['index1'], pair['index2']) for pair in result['pairs']}
+        recall = len(injected & found) / len(injected) if injected else 1.0
+        
+        print(f"{rows:>10}{legacy:>12}{elapsed:>13.2f}{rows / elapsed:>10.0f}"
+              f"{result['candidate_pairs']:>12}{result['count']:>9}{recall:>8.3f}")
+
+
+def make_form_records(rows: int, error_rate: float, seed: int = 0) -> pd.DataFrame:
+    """
+    Build synthetic form records with a fraction of malformed cells.
+    
+    Args:
+        rows: Number of records
+        error_rate: Probability of each typed cell being malformed or empty
+        seed: Random seed
+    
+    Returns:
+        Records with email, phone, signup_date, age and country columns
+    """
+    rng = np.random.default_rng(seed)
+    names = make_words(rows, 3, rng).str.lower()
+    
+    data = pd.DataFrame({
+        'email': names + rng.integers(1, 1000, rows).astype(str) + '@example.com',
+        'phone': '+1' + pd.Series(rng.integers(2000000000, 9999999999, rows).astype(str)),
+        'signup_date': pd.to_datetime(rng.integers(946684800, 1700000000, rows), unit='s').strftime('%Y-%m-%d'),
+        'age': rng.integers(18, 90, rows),
+        'country': rng.choice(['US', 'UK', 'DE', 'FR'], rows)
+    })
+    
+    malformed = {'email': 'not-an-email', 'phone': '12-ab', 'signup_date': '2023-13-45', 'age': -1}
+    for column, bad_value in malformed.items():
+        mask = rng.random(rows) < error_rate
+        data[column] = data[column].astype(object).where(~mask, bad_value)
+    
+    return data
+
+
+def make_form_engine(columnar: bool, dataset_stages: bool = False) -> ValidationEngine:
+    """Build an engine for form records, by default with the dataset-level stages disabled."""
+    engine = ValidationEngine({'validation_stages': {'anomaly': {'enabled': dataset_stages},
+                                                     'duplicate': {'enabled': dataset_stages}}})
+    engine.add_field_type('email', 'email')
+    engine.add_field_type('phone', 'phone')
+    engine.add_field_type('signup_date', 'date')
+    if columnar:
+        engine.add_business_rule(lambda df: (df['age'].between(0, 120), "Age must be between 0 and 120"),
+                                 "age_validation", ConsistencyLevel.HIGH, columnar=True)
+    else:
+        engine.add_business_rule(lambda record: (0 <= record['age'] <= 120, "Age must be between 0 and 120"),
+                                 "age_validation", ConsistencyLevel.HIGH)
+    return engine
+
+
+def same_summary(expected: Dict[str, Any], actual: Dict[str, Any]) -> bool:
+    """Compare summary statistics, allowing float noise in averages."""
+    return all(
+        np.isclose(value, actual[key]) if isinstance(value, float) else value == actual[key]
+        for key, value in expected.items()
+    )
+
+
+def benchmark_dataset(args):
+    """Compare record-by-record and columnar validate_dataset."""
+    print(f"{'rows':>10}{'records (s)':>13}{'columnar (s)':>14}{'rows/s':>11}{'issues':>9}{'match':>7}")
+    
+    for rows in args.rows:
+        data = make_form_records(rows, args.error_rate, args.seed)
+        
+        start = time.perf_counter()
+        columnar = make_form_engine(True).validate_dataset(data, columnar=True)
+        columnar_time = time.perf_counter() - start
+        
+        record_time = "-"
+        match = "-"
+        if rows <= args.records_max_rows:
+            start = time.perf_counter()
+            records = make_form_engine(False).validate_dataset(data)
+            record_time = f"{time.perf_counter() - start:.2f}"
+            match = "yes" if same_summary(records['summary'], columnar['summary']) else "NO"
+        
+        print(f"{rows:>10}{record_time:>13}{columnar_time:>14.2f}{rows / columnar_time:>11.0f}"
+              f"{columnar['summary']['total_issues']:>9}{match:>7}")
+
+
+def benchmark_shards(args):
+    """Measure sharded validate_dataset scaling from one worker to many."""
+    engine = make_form_engine(args.columnar)
+    mode = "columnar" if args.columnar else "records"
+    
+    print(f"{'rows':>10}{'mode':>10}{'workers':>9}{'time (s)':>10}{'rows/s':>10}{'speedup':>9}{'match':>7}")
+    
+    for rows in args.rows:
+        data = make_form_records(rows, args.error_rate, args.seed)
+        baseline = None
+        
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = engine.validate_dataset(data, columnar=args.columnar, workers=workers,
+                                             shard_size=args.shard_size)
+            elapsed = time.perf_counter() - start
+            
+            if baseline is None:
+                baseline = (elapsed, result['summary'])
+            match = "yes" if same_summary(baseline[1], result['summary']) else "NO"
+            
+            print(f"{rows:>10}{mode:>10}{workers:>9}{elapsed:>10.2f}{rows / elapsed:>10.0f}"
+                  f"{baseline[0] / elapsed:>9.2f}{match:>7}")
+
+
+def write_form_file(path: str, rows: int, file_format: str, error_rate: float, seed: int,
+                    chunk_size: int = 100000):
+    """Write synthetic form records to a CSV or JSONL file chunk by chunk."""
+    with open(path, 'w') as output:
+        for start in range(0, rows, chunk_size):
+            chunk = make_form_records(min(chunk_size, rows - start), error_rate, seed + start)
+            if file_format == 'csv':
+                chunk.to_csv(output, header=start == 0, index=False)
+            else:
+                chunk.to_json(output, orient='records', lines=True)
+
+
+def benchmark_stream(args):
+    """Measure streaming file validation throughput and peak memory."""
+    engine = make_form_engine(True, dataset_stages=True)
+    
+    print(f"{'rows':>10}{'file (MB)':>11}{'time (s)':>10}{'rows/s':>10}{'issues':>10}"
+          f"{'duplicates':>12}{'peak RSS (MB)':>15}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            input_path = os.path.join(directory, f"records.{args.format}")
+            issues_path = os.path.join(directory, "issues.jsonl")
+            write_form_file(input_path, rows, args.format, args.error_rate, args.seed)
+            
+            start = time.perf_counter()
+            result = engine.validate_file(input_path, issues_path, chunk_size=args.chunk_size,
+                                          expected_records=rows)
+            elapsed = time.perf_counter() - start
+            
+            # ru_maxrss is in kilobytes on Linux
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            duplicates = result['duplicates']['exact_duplicates']['count']
+            
+            print(f"{rows:>10}{os.path.getsize(input_path) / 2 ** 20:>11.0f}{elapsed:>10.2f}{rows / elapsed:>10.0f}"
+                  f"{result['issues_written']:>10}{duplicates:>12}{peak_rss:>15.0f}")
+
+
+def legacy_reference_check(values: pd.Series, reference: pd.Series) -> List[Any]:
+    """Reference lookup as used before lookup indexes: rebuild the value set on every call (reference only)."""
+    reference_values = set(reference.dropna().astype(str))
+    return [value for value in values
+            if not (pd.isna(value) or str(value).strip() == '') and str(value) not in reference_values]
+
+
+def benchmark_reference(args):
+    """Compare per-call reference sets with in-memory and memory-mapped lookup indexes."""
+    rng = np.random.default_rng(args.seed)
+    reference = pd.DataFrame({'sku': pd.Series(np.arange(args.reference_rows)).map('SKU-{:08d}'.format)})
+    # About one in eleven values is not in the reference data
+    values = pd.Series(rng.integers(0, args.reference_rows * 11 // 10, args.values)).map('SKU-{:08d}'.format)
+    
+    validator = ReferenceDataValidator()
+    start = time.perf_counter()
+    validator.add_reference_dataset('products', reference, 'sku')
+    build_time = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "products_sku.npy")
+        validator.get_reference_index('products').save(path)
+        
+        mapped = ReferenceDataValidator()
+        start = time.perf_counter()
+        mapped.add_reference_index('products', path)
+        load_time = time.perf_counter() - start
+        
+        print(f"{'lookup':>10}{'setup (s)':>11}{'per call (s)':>14}{'values/s':>12}{'invalid':>9}")
+        
+        runs = [
+            ("legacy", 0.0, lambda: len(legacy_reference_check(values, reference['sku']))),
+            ("hash", build_time, lambda: len(validator.validate_against_reference('sku', values, 'products')[0].positions)),
+            ("mmap", load_time, lambda: len(mapped.validate_against_reference('sku', values, 'products')[0].positions))
+        ]
+        for name, setup_time, run in runs:
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                invalid = run()
+            per_call = (time.perf_counter() - start) / args.calls
+            
+            print(f"{name:>10}{setup_time:>11.2f}{per_call:>14.3f}{args.values / per_call:>12.0f}{invalid:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation engine benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    duplicates_parser = subparsers.add_parser("duplicates", help="Measure near-duplicate detection scaling")
+    duplicates_parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000],
+                                   help="Dataset sizes to benchmark")
+    duplicates_parser.add_argument("--duplicate-rate", type=float, default=0.05,
+                                   help="Fraction of records injected as near duplicates")
+    duplicates_parser.add_argument("--threshold", type=float, default=0.85, help="Similarity threshold")
+    duplicates_parser.add_argument("--legacy-max-rows", type=int, default=500,
+                                   help="Largest size also run through the pairwise scan")
+    duplicates_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    duplicates_parser.set_defaults(func=benchmark_duplicates)
+    
+    dataset_parser = subparsers.add_parser("dataset", help="Compare record and columnar dataset validation")
+    dataset_parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000],
+                                help="Dataset sizes to benchmark")
+    dataset_parser.add_argument("--error-rate", type=float, default=0.05,
+                                help="Probability of each typed cell being malformed")
+    dataset_parser.add_argument("--records-max-rows", type=int, default=10000,
+                                help="Largest size also run record by record")
+    dataset_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    dataset_parser.set_defaults(func=benchmark_dataset)
+    
+    shards_parser = subparsers.add_parser("shards", help="Measure sharded dataset validation scaling")
+    shards_parser.add_argument("--rows", type=int, nargs="+", default=[20000], help="Dataset sizes to benchmark")
+    shards_parser.add_argument("--workers", type=int, nargs="+",
+                               default=[2 ** i for i in range((os.cpu_count() or 1).bit_length())],
+                               help="Worker counts to benchmark (the first is the baseline)")
+    shards_parser.add_argument("--shard-size", type=int, default=None,
+                               help="Records per shard (default: four shards per worker)")
+    shards_parser.add_argument("--columnar", action="store_true", help="Validate shards column by column")
+    shards_parser.add_argument("--error-rate", type=float, default=0.05,
+                               help="Probability of each typed cell being malformed")
+    shards_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    shards_parser.set_defaults(func=benchmark_shards)
+    
+    stream_parser = subparsers.add_parser("stream", help="Measure streaming file validation")
+    stream_parser.add_argument("--rows", type=int, nargs="+", default=[1000000, 10000000],
+                               help="File sizes to benchmark")
+    stream_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Input file format")
+    stream_parser.add_argument("--chunk-size", type=int, default=100000, help="Records per chunk")
+    stream_parser.add_argument("--error-rate", type=float, default=0.05,
+                               help="Probability of each typed cell being malformed")
+    stream_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    stream_parser.set_defaults(func=benchmark_stream)
+    
+    reference_parser = subparsers.add_parser("reference", help="Measure reference data lookups")
+    reference_parser.add_argument("--reference-rows", type=int, default=2000000, help="Reference dataset size")
+    reference_parser.add_argument("--values", type=int, default=100000, help="Values checked per call")
+    reference_parser.add_argument("--calls", type=int, default=5, help="Validation calls per lookup method")
+    reference_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    reference_parser.set_defaults(func=benchmark_reference)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
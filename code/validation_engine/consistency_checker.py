@@ -3,6 +3,7 @@ Cross-Dataset Consistency Validation Module
 Validates relationships and consistency between different datasets and fields.
 """
 
+import json
 import logging
 from typing import Dict, List, Tuple, Optional, Any, Set, Union
 from collections import defaultdict, Counter
@@ -23,11 +24,14 @@ class ConsistencyViolation:
     """Represents a consistency violation."""
     
     def __init__(self, level: ConsistencyLevel, message: str, 
-                 affected_fields: List[str], suggestion: str = None):
+                 affected_fields: List[str], suggestion: str = None,
+                 positions: Optional[np.ndarray] = None):
         self.level = level
         self.message = message
         self.affected_fields = affected_fields
         self.suggestion = suggestion
+        # Row positions of the violating records (column validation only)
+        self.positions = positions
         self.timestamp = pd.Timestamp.now()
         
     def to_dict(self) -> Dict[str, Any]:
@@ -41,28 +45,149 @@ class ConsistencyViolation:
         }
 
 
+class ReferenceIndex:
+    """
+    Lookup index over the values of one reference field.
+    
+    Values are compared as strings, optionally with surrounding whitespace
+    stripped and case folded. Built in memory the index is a hash table;
+    saved to disk it is a sorted fixed-width string array that loads
+    memory-mapped, so processes opening the same file share its pages.
+    """
+    
+    def __init__(self, values: Union[pd.Series, List[Any]], case_sensitive: bool = True,
+                 strip_whitespace: bool = False, field: Optional[str] = None):
+        values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        self.field = field if field is not None else values.name
+        self.case_sensitive = case_sensitive
+        self.strip_whitespace = strip_whitespace
+        self.path = None
+        
+        # Hash table in memory, sorted array when loaded from a file
+        self.index = pd.Index(self.normalize(values.dropna()).unique())
+        self.sorted_values = None
+        
+        # Build the index's hash table now instead of in the first validation
+        self.index.get_indexer(self.index[:1])
+        
+    def normalize(self, values: pd.Series) -> pd.Series:
+        """Convert values to the string keys stored in the index."""
+        keys = values.map(str)
+        if self.strip_whitespace:
+            keys = keys.str.strip()
+        if not self.case_sensitive:
+            keys = keys.str.lower()
+        return keys
+        
+    def isin(self, values: Union[pd.Series, List[Any]]) -> np.ndarray:
+        """Vectorized membership check of non-null values."""
+        values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        keys = self.normalize(values)
+        
+        if self.sorted_values is None:
+            # get_indexer reuses the hash table the index builds on first lookup
+            return self.index.get_indexer(keys) >= 0
+            
+        if len(self.sorted_values) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        keys = keys.to_numpy(dtype=str)
+        positions = np.minimum(np.searchsorted(self.sorted_values, keys), len(self.sorted_values) - 1)
+        return self.sorted_values[positions] == keys
+        
+    def __contains__(self, value: Any) -> bool:
+        return bool(self.isin([value])[0])
+        
+    def __len__(self) -> int:
+        return len(self.index) if self.sorted_values is None else len(self.sorted_values)
+        
+    def sample(self, count: int = 10) -> List[str]:
+        """First few values of the index, for messages."""
+        values = self.index if self.sorted_values is None else self.sorted_values
+        return [str(value) for value in values[:count]]
+        
+    def save(self, path: str):
+        """Save as a sorted .npy array, with the normalization options in '<path>.json'."""
+        values = self.index.to_numpy(dtype=str) if self.sorted_values is None else self.sorted_values
+        with open(path, 'wb') as f:
+            np.save(f, np.sort(values))
+        with open(f"{path}.json", 'w') as f:
+            json.dump({'field': self.field, 'case_sensitive': self.case_sensitive,
+                       'strip_whitespace': self.strip_whitespace}, f)
+            
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'ReferenceIndex':
+        """Load an index saved with save(), memory-mapped by default."""
+        with open(f"{path}.json") as f:
+            options = json.load(f)
+            
+        index = cls([], **options)
+        index.sorted_values = np.load(path, mmap_mode='r' if mmap else None)
+        index.path = path if mmap else None
+        return index
+        
+    def __getstate__(self):
+        # Memory-mapped indexes are sent to other processes by path and mapped there
+        if self.path is not None:
+            return {'path': self.path}
+        return self.__dict__
+        
+    def __setstate__(self, state):
+        if set(state) == {'path'}:
+            state = ReferenceIndex.load(state['path']).__dict__
+        self.__dict__.update(state)
+
+
 class ReferenceDataValidator:
     """Validates data against reference datasets."""
     
     def __init__(self):
         self.reference_datasets = {}
         self.reference_mappings = {}
+        self.reference_options = {}
+        # Lookup indexes by (dataset name, field)
+        self.reference_indexes = {}
         
     def add_reference_dataset(self, name: str, data: Union[pd.DataFrame, List, Dict], 
-                            key_field: str = None):
-        """Add reference dataset for validation."""
+                            key_field: str = None, case_sensitive: bool = True,
+                            strip_whitespace: bool = False):
+        """Add reference dataset for validation and index its key field."""
         if isinstance(data, (list, dict)):
             data = pd.DataFrame(data)
         self.reference_datasets[name] = data
+        self.reference_options[name] = {'case_sensitive': case_sensitive, 'strip_whitespace': strip_whitespace}
+        self.reference_indexes = {key: index for key, index in self.reference_indexes.items() if key[0] != name}
         if key_field:
             self.reference_mappings[name] = key_field
+            self.get_reference_index(name, key_field)
             
+    def add_reference_index(self, name: str, path: str, field: Optional[str] = None):
+        """Add a reference index saved with ReferenceIndex.save, memory-mapped so processes share it."""
+        index = ReferenceIndex.load(path)
+        field = field or index.field
+        self.reference_indexes[(name, field)] = index
+        self.reference_mappings.setdefault(name, field)
+        
+    def get_reference_index(self, name: str, field: Optional[str] = None) -> Optional[ReferenceIndex]:
+        """Get the lookup index of a reference field, building it on first use."""
+        if field is None:
+            field = self.reference_mappings.get(name)
+            
+        key = (name, field)
+        if key not in self.reference_indexes:
+            data = self.reference_datasets.get(name)
+            if data is None or field not in data.columns:
+                return None
+            self.reference_indexes[key] = ReferenceIndex(data[field], field=field, **self.reference_options[name])
+            
+        return self.reference_indexes[key]
+        
     def validate_against_reference(self, field_name: str, field_values: List[Any], 
                                  reference_name: str, reference_field: str = None) -> List[ConsistencyViolation]:
         """Validate field values against reference dataset."""
         violations = []
         
-        if reference_name not in self.reference_datasets:
+        if reference_name not in self.reference_datasets and \
+                not any(key[0] == reference_name for key in self.reference_indexes):
             violations.append(ConsistencyViolation(
                 ConsistencyLevel.CRITICAL,
                 f"Reference dataset '{reference_name}' not found",
@@ -71,12 +196,11 @@ class ReferenceDataValidator:
             ))
             return violations
             
-        ref_data = self.reference_datasets[reference_name]
-        
         if reference_field is None:
             reference_field = self.reference_mappings.get(reference_name)
             
-        if reference_field is None or reference_field not in ref_data.columns:
+        index = self.get_reference_index(reference_name, reference_field)
+        if index is None:
             violations.append(ConsistencyViolation(
                 ConsistencyLevel.CRITICAL,
                 f"Reference field '{reference_field}' not found in '{reference_name}'",
@@ -85,22 +209,18 @@ class ReferenceDataValidator:
             ))
             return violations
             
-        # Get reference values
-        ref_values = set(ref_data[reference_field].dropna().astype(str))
-        invalid_values = []
+        values = field_values if isinstance(field_values, pd.Series) else pd.Series(list(field_values), dtype=object)
+        present = values.notna().to_numpy() & (values.map(str).str.strip() != '').to_numpy()
+        invalid = present & ~index.isin(values)
         
-        for value in field_values:
-            if pd.isna(value) or str(value).strip() == '':
-                continue
-            if str(value) not in ref_values:
-                invalid_values.append(value)
-                
-        if invalid_values:
+        if invalid.any():
+            positions = np.flatnonzero(invalid)
             violations.append(ConsistencyViolation(
                 ConsistencyLevel.HIGH,
-                f"Found {len(invalid_values)} invalid values not in reference dataset",
+                f"Found {len(positions)} invalid values not in reference dataset",
                 [field_name],
-                f"Valid values: {list(ref_values)[:10]}..."  # Show first 10
+                f"Valid values: {index.sample(10)}...",  # Show first 10
+                positions=positions
             ))
             
         return violations
@@ -112,12 +232,20 @@ class BusinessRuleValidator:
     def __init__(self):
         self.rules = []
         
-    def add_rule(self, rule_func, rule_name: str, level: ConsistencyLevel = ConsistencyLevel.MEDIUM):
-        """Add custom business rule."""
+    def add_rule(self, rule_func, rule_name: str, level: ConsistencyLevel = ConsistencyLevel.MEDIUM,
+                 columnar: bool = False):
+        """
+        Add custom business rule.
+        
+        A record rule receives a record dict. A columnar rule receives a
+        DataFrame and returns a boolean Series (True where valid), optionally
+        as a (mask, message) tuple.
+        """
         self.rules.append({
             'func': rule_func,
             'name': rule_name,
-            'level': level
+            'level': level,
+            'columnar': columnar
         })
         
     def validate_rules(self, data: Dict[str, Any]) -> List[ConsistencyViolation]:
@@ -126,7 +254,15 @@ class BusinessRuleValidator:
         
         for rule in self.rules:
             try:
-                result = rule['func'](data)
+                if rule['columnar']:
+                    result = rule['func'](pd.DataFrame([data]))
+                    if isinstance(result, tuple):
+                        result = (bool(np.asarray(result[0])[0]), result[1])
+                    else:
+                        result = bool(np.asarray(result)[0])
+                else:
+                    result = rule['func'](data)
+                    
                 if isinstance(result, tuple):
                     is_valid, message = result
                 elif isinstance(result, bool):
@@ -150,6 +286,62 @@ class BusinessRuleValidator:
                 ))
                 
         return violations
+        
+    def validate_rules_columns(self, dataset: pd.DataFrame) -> List[ConsistencyViolation]:
+        """
+        Validate all records of a dataset against all business rules.
+        
+        Columnar rules are evaluated once for the whole dataset; record rules
+        are called per record. Violations carry the row positions of the
+        failing records.
+        """
+        violations = []
+        fields = list(dataset.columns)
+        records = None
+        
+        for rule in self.rules:
+            failures = defaultdict(list)
+            errors = defaultdict(list)
+            
+            if rule['columnar']:
+                try:
+                    result = rule['func'](dataset)
+                    message = f"Rule '{rule['name']}' failed"
+                    if isinstance(result, tuple):
+                        result, message = result
+                    failures[message] = np.flatnonzero(~np.asarray(result, dtype=bool))
+                except Exception as e:
+                    errors[f"Error evaluating rule '{rule['name']}': {str(e)}"] = np.arange(len(dataset))
+            else:
+                if records is None:
+                    records = dataset.to_dict('records')
+                for position, record in enumerate(records):
+                    try:
+                        result = rule['func'](record)
+                        if isinstance(result, tuple):
+                            is_valid, message = result
+                        elif isinstance(result, bool):
+                            is_valid, message = result, f"Rule '{rule['name']}' failed"
+                        else:
+                            continue
+                        if not is_valid:
+                            failures[message].append(position)
+                    except Exception as e:
+                        errors[f"Error evaluating rule '{rule['name']}': {str(e)}"].append(position)
+                        
+            for message, positions in failures.items():
+                if len(positions):
+                    violations.append(ConsistencyViolation(
+                        rule['level'], message, fields, f"Check rule: {rule['name']}",
+                        positions=np.asarray(positions, dtype=np.int64)
+                    ))
+            for message, positions in errors.items():
+                violations.append(ConsistencyViolation(
+                    ConsistencyLevel.MEDIUM, message, fields, "Check rule implementation",
+                    positions=np.asarray(positions, dtype=np.int64)
+                ))
+                
+        return violations
 
 
 class ReferentialIntegrityValidator:
@@ -218,6 +410,48 @@ class ReferentialIntegrityValidator:
                             ))
                             
         return violations
+        
+    def validate_referential_integrity_columns(self, dataset: pd.DataFrame) -> List[ConsistencyViolation]:
+        """Validate referential integrity of all records with column expressions."""
+        violations = []
+        
+        for relationship in self.relationships.values():
+            parent_field = relationship['parent']
+            child_field = relationship['child']
+            
+            if relationship['type'] == 'mandatory' and parent_field in dataset and child_field in dataset:
+                positions = np.flatnonzero(dataset[parent_field].isna() & dataset[child_field].notna())
+                if len(positions):
+                    violations.append(ConsistencyViolation(
+                        ConsistencyLevel.HIGH,
+                        f"Child field '{child_field}' has value but parent '{parent_field}' is empty",
+                        [parent_field, child_field],
+                        "Provide value for parent field",
+                        positions=positions
+                    ))
+                    
+        for condition_key, required_fields in self.conditional_rules.items():
+            condition_field, condition_value = condition_key.split('==')
+            
+            if condition_field not in dataset:
+                continue
+            condition_met = dataset[condition_field].map(str) == str(condition_value)
+            
+            for req_field in required_fields:
+                if req_field not in dataset:
+                    continue
+                values = dataset[req_field]
+                positions = np.flatnonzero(condition_met & (values.isna() | (values.map(str).str.strip() == '')))
+                if len(positions):
+                    violations.append(ConsistencyViolation(
+                        ConsistencyLevel.MEDIUM,
+                        f"Field '{req_field}' is required when '{condition_field}' is '{condition_value}'",
+                        [req_field],
+                        f"Provide value for {req_field}",
+                        positions=positions
+                    ))
+                    
+        return violations
 
 
 class DataTypeConsistencyValidator:
@@ -301,14 +535,19 @@ class ConsistencyChecker:
         self.logger = logging.getLogger(__name__)
         
     def add_reference_data(self, name: str, data: Union[pd.DataFrame, List, Dict], 
-                          key_field: str = None):
+                          key_field: str = None, case_sensitive: bool = True,
+                          strip_whitespace: bool = False):
         """Add reference dataset."""
-        self.reference_validator.add_reference_dataset(name, data, key_field)
+        self.reference_validator.add_reference_dataset(name, data, key_field, case_sensitive, strip_whitespace)
+        
+    def add_reference_index(self, name: str, path: str, field: Optional[str] = None):
+        """Add a saved, memory-mapped reference index."""
+        self.reference_validator.add_reference_index(name, path, field)
         
     def add_business_rule(self, rule_func, rule_name: str, 
-                         level: ConsistencyLevel = ConsistencyLevel.MEDIUM):
-        """Add business rule."""
-        self.business_validator.add_rule(rule_func, rule_name, level)
+                         level: ConsistencyLevel = ConsistencyLevel.MEDIUM, columnar: bool = False):
+        """Add business rule (columnar rules take a DataFrame and return a boolean Series)."""
+        self.business_validator.add_rule(rule_func, rule_name, level, columnar)
         
     def add_field_relationship(self, parent_field: str, child_field: str):
         """Add field relationship."""
@@ -331,6 +570,15 @@ class ConsistencyChecker:
         
         return all_violations
         
+    def validate_columns(self, dataset: pd.DataFrame) -> List[ConsistencyViolation]:
+        """Validate all records for consistency; violations carry the row positions of failing records."""
+        all_violations = []
+        
+        all_violations.extend(self.business_validator.validate_rules_columns(dataset))
+        all_violations.extend(self.referential_validator.validate_referential_integrity_columns(dataset))
+        
+        return all_violations
+        
     def validate_dataset_consistency(self, dataset: Union[pd.DataFrame, List[Dict]]) -> Dict[str, Any]:
         """Validate entire dataset for consistency."""
         if isinstance(dataset, list):
@@ -0,0 +1,381 @@
+"""
+Duplicate Detection Module
+Detects exact and near-duplicate records. Near-duplicate candidates are
+generated with MinHash/LSH over character shingles of the normalized records
+(plus optional exact blocking keys), and only candidate pairs are scored with
+a weighted per-field string similarity.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Optional fast string metrics
+try:
+    from rapidfuzz.distance import JaroWinkler, Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    JaroWinkler = None
+    Levenshtein = None
+
+
+def jaro_winkler_similarity(str1: str, str2: str, prefix_weight: float = 0.1) -> float:
+    """Calculate Jaro-Winkler similarity (0-1)."""
+    if str1 == str2:
+        return 1.0
+    if not str1 or not str2:
+        return 0.0
+    if RAPIDFUZZ_AVAILABLE:
+        return JaroWinkler.similarity(str1, str2, prefix_weight=prefix_weight)
+    
+    len1, len2 = len(str1), len(str2)
+    match_distance = max(0, max(len1, len2) // 2 - 1)
+    matched1 = [False] * len1
+    matched2 = [False] * len2
+    matches = 0
+    
+    for i, char in enumerate(str1):
+        for j in range(max(0, i - match_distance), min(len2, i + match_distance + 1)):
+            if not matched2[j] and str2[j] == char:
+                matched1[i] = matched2[j] = True
+                matches += 1
+                break
+    
+    if matches == 0:
+        return 0.0
+    
+    # Matched characters that appear in a different order
+    transpositions = 0
+    j = 0
+    for i in range(len1):
+        if matched1[i]:
+            while not matched2[j]:
+                j += 1
+            if str1[i] != str2[j]:
+                transpositions += 1
+            j += 1
+    
+    jaro = (matches / len1 + matches / len2 + (matches - transpositions // 2) / matches) / 3
+    if jaro <= 0.7:
+        return jaro
+    
+    prefix = 0
+    for char1, char2 in zip(str1[:4], str2[:4]):
+        if char1 != char2:
+            break
+        prefix += 1
+    
+    return jaro + prefix * prefix_weight * (1 - jaro)
+
+
+def levenshtein_similarity(str1: str, str2: str) -> float:
+    """Calculate similarity from Levenshtein edit distance (0-1)."""
+    if str1 == str2:
+        return 1.0
+    if not str1 or not str2:
+        return 0.0
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.normalized_similarity(str1, str2)
+    
+    if len(str1) < len(str2):
+        str1, str2 = str2, str1
+    
+    previous = list(range(len(str2) + 1))
+    for i, char1 in enumerate(str1, 1):
+        current = [i]
+        for j, char2 in enumerate(str2, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char1 != char2)
+            ))
+        previous = current
+    
+    return 1.0 - previous[-1] / len(str1)
+
+
+SIMILARITY_FUNCTIONS: Dict[str, Callable[[str, str], float]] = {
+    'jaro_winkler': jaro_winkler_similarity,
+    'levenshtein': levenshtein_similarity
+}
+
+
+class DuplicateDetector:
+    """Duplicate detection using multiple methods."""
+    
+    # SplitMix64 finalizer constants, folding the code points of a shingle into one hash
+    SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+    SPLITMIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+    BAND_KEY_PRIME = np.uint64(0x100000001B3)
+    
+    def __init__(self, similarity_threshold: float = 0.85, field_weights: Optional[Dict[str, float]] = None,
+                 similarity: str = 'jaro_winkler', blocking_fields: Optional[List[str]] = None,
+                 shingle_size: int = 3, num_bands: int = 24, band_rows: int = 6,
+                 max_shingle_frequency: float = 0.2, max_bucket_size: int = 50,
+                 chunk_size: int = 100000, seed: int = 0):
+        """
+        Initialize the duplicate detector.
+        
+        Args:
+            similarity_threshold: Minimum weighted similarity of a near-duplicate pair
+            field_weights: Weight per field in the record similarity (default 1.0, 0 ignores the field)
+            similarity: Field similarity, 'jaro_winkler' or 'levenshtein'
+            blocking_fields: Fields whose equal normalized values always make a candidate pair
+            shingle_size: Characters per MinHash shingle
+            num_bands: LSH bands; more bands find less similar candidates
+            band_rows: MinHash values per band; more rows find fewer, more similar candidates
+            max_shingle_frequency: Fraction of records above which a shingle is ignored by LSH
+            max_bucket_size: Records compared with each other within one LSH or blocking bucket;
+                larger buckets only compare records with their nearest neighbours in the bucket
+            chunk_size: Records hashed at a time (the first chunk is the sample for common shingles)
+            seed: Seed of the MinHash functions
+        """
+        if similarity not in SIMILARITY_FUNCTIONS:
+            raise ValueError(f"Unsupported similarity: {similarity}")
+        if shingle_size < 1:
+            raise ValueError(f"shingle_size must be at least 1, got {shingle_size}")
+        
+        self.similarity_threshold = similarity_threshold
+        self.field_weights = field_weights or {}
+        self.similarity = similarity
+        self.blocking_fields = blocking_fields or []
+        self.shingle_size = shingle_size
+        self.num_bands = num_bands
+        self.band_rows = band_rows
+        self.max_shingle_frequency = max_shingle_frequency
+        self.max_bucket_size = max_bucket_size
+        self.chunk_size = chunk_size
+        
+        rng = np.random.default_rng(seed)
+        num_hashes = num_bands * band_rows
+        self._hash_multipliers = rng.integers(1, 2 ** 63, size=num_hashes, dtype=np.uint64) | np.uint64(1)
+        self._hash_offsets = rng.integers(0, 2 ** 63, size=num_hashes, dtype=np.uint64)
+        
+        self.logger = logging.getLogger(__name__)
+        
+    def detect_exact_duplicates(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Detect exact duplicates."""
+        duplicate_mask = data.duplicated(keep='first')
+        duplicate_indices = data.index[duplicate_mask].tolist()
+        
+        return {
+            'type': 'exact_duplicates',
+            'count': len(duplicate_indices),
+            'indices': duplicate_indices,
+            'percentage': len(duplicate_indices) / len(data) * 100,
+            'severity': 'high' if len(duplicate_indices) / len(data) > 0.1 else 'medium'
+        }
+        
+    def detect_near_duplicates(self, data: pd.DataFrame, fields: List[str]) -> Dict[str, Any]:
+        """
+        Detect near duplicates using fuzzy matching.
+        
+        Only candidate pairs from LSH and blocking buckets are scored, so the
+        cost grows with the number of records rather than with the number of
+        record pairs. Pair indices are row positions.
+        """
+        fields = [field for field in fields if field in data.columns and self.field_weights.get(field, 1.0) > 0]
+        total_pairs = len(data) * (len(data) - 1) / 2
+        
+        near_duplicates = []
+        candidate_count = 0
+        
+        if fields and len(data) > 1:
+            normalized = {field: self._normalize(data[field]) for field in fields}
+            left, right = self._candidate_pairs(normalized, len(data))
+            similarity = self._score_pairs(normalized, left, right)
+            candidate_count = len(left)
+            
+            matches = similarity >= self.similarity_threshold
+            near_duplicates = [
+                {'index1': int(i), 'index2': int(j), 'similarity': float(score)}
+                for i, j, score in zip(left[matches], right[matches], similarity[matches])
+            ]
+        
+        return {
+            'type': 'near_duplicates',
+            'count': len(near_duplicates),
+            'pairs': near_duplicates,
+            'candidate_pairs': candidate_count,
+            'percentage': len(near_duplicates) / total_pairs * 100 if total_pairs else 0.0,
+            'severity': 'medium' if len(near_duplicates) > 0 else 'low'
+        }
+        
+    def _normalize(self, values: pd.Series) -> np.ndarray:
+        """Lowercase values and collapse punctuation and whitespace; missing values become ''."""
+        text = values.astype(str).str.lower().str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+        return text.where(values.notna(), '').to_numpy(dtype=object)
+        
+    def _candidate_pairs(self, normalized: Dict[str, np.ndarray], n_records: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get unique candidate pairs (left < right) from LSH and blocking buckets."""
+        pairs = []
+        
+        records = None
+        for values in normalized.values():
+            records = values if records is None else records + ' ' + values
+        records = pd.Series(records).str.strip().tolist()
+        
+        # The first chunk is the sample for common shingles, so every chunk drops the same ones
+        common_shingles = self._common_shingles(records[:self.chunk_size])
+        
+        signature_rows = []
+        band_keys = []
+        for start in range(0, n_records, self.chunk_size):
+            rows, keys = self._band_keys(records[start:start + self.chunk_size], common_shingles)
+            signature_rows.append(rows + start)
+            band_keys.append(keys)
+        signature_rows = np.concatenate(signature_rows)
+        band_keys = np.concatenate(band_keys)
+        
+        for band in range(self.num_bands):
+            pairs.extend(self._bucket_pairs(band_keys[:, band], signature_rows))
+        
+        for field in self.blocking_fields:
+            if field not in normalized:
+                continue
+            values = normalized[field]
+            rows = np.flatnonzero(values != '')
+            pairs.extend(self._bucket_pairs(pd.util.hash_array(values[rows]), rows))
+        
+        if not pairs:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        
+        first = np.concatenate([pair[0] for pair in pairs]).astype(np.int64)
+        second = np.concatenate([pair[1] for pair in pairs]).astype(np.int64)
+        codes = np.unique(np.minimum(first, second) * n_records + np.maximum(first, second))
+        
+        return codes // n_records, codes % n_records
+        
+    def _shingles(self, records: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the character shingles of records as 64-bit hashes, with the position of their record.
+        
+        Code points are folded in one at a time through the SplitMix64
+        finalizer, so any shingle size maps to a well spread 64-bit value
+        instead of overflowing a positional packing.
+        """
+        k = self.shingle_size
+        lengths = np.fromiter((len(record) for record in records), dtype=np.int64, count=len(records))
+        # Normalized records contain no NUL, so it separates records in one code point array
+        codes = np.frombuffer('\x00'.join(records).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        
+        if len(codes) < k:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+        
+        rows = np.repeat(np.arange(len(records)), lengths + 1)[:len(codes)]
+        n_shingles = len(codes) - k + 1
+        
+        shingles = self._splitmix64(codes[:n_shingles])
+        for offset in range(1, k):
+            shingles = self._splitmix64(shingles ^ codes[offset:offset + n_shingles])
+        
+        valid = (rows[:n_shingles] == rows[k - 1:]) & (codes[k - 1:] != 0)
+        return shingles[valid], rows[:n_shingles][valid]
+        
+    @classmethod
+    def _splitmix64(cls, values: np.ndarray) -> np.ndarray:
+        """Apply the SplitMix64 mixing step to uint64 values (arithmetic wraps modulo 2**64)."""
+        values = values + cls.SPLITMIX_GAMMA
+        values = (values ^ (values >> np.uint64(30))) * cls.SPLITMIX_MULTIPLIERS[0]
+        values = (values ^ (values >> np.uint64(27))) * cls.SPLITMIX_MULTIPLIERS[1]
+        return values ^ (values >> np.uint64(31))
+        
+    def _common_shingles(self, records: List[str]) -> np.ndarray:
+        """Get shingles found in more than max_shingle_frequency and max_bucket_size of the records."""
+        shingles, rows = self._shingles(records)
+        per_record = pd.DataFrame({'shingle': shingles, 'row': rows}).drop_duplicates()
+        counts = per_record['shingle'].value_counts()
+        limit = max(self.max_shingle_frequency * len(records), self.max_bucket_size)
+        return counts.index[counts > limit].to_numpy(dtype=np.uint64)
+        
+    def _band_keys(self, records: List[str], common_shingles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hash records into one LSH key per band.
+        
+        Common shingles are left out, since they would make records that only
+        share boilerplate collide. Returns the positions of records with at
+        least one remaining shingle and their band keys; other records are
+        left to the blocking keys.
+        """
+        shingles, shingle_rows = self._shingles(records)
+        keep = ~np.isin(shingles, common_shingles)
+        shingles, shingle_rows = shingles[keep], shingle_rows[keep]
+        
+        if not len(shingles):
+            return np.empty(0, dtype=np.int64), np.empty((0, self.num_bands), dtype=np.uint64)
+        
+        # Shingles are ordered by record, so each record is one contiguous segment
+        starts = np.flatnonzero(np.r_[True, shingle_rows[1:] != shingle_rows[:-1]])
+        keys = np.zeros((len(starts), self.num_bands), dtype=np.uint64)
+        
+        for band in range(self.num_bands):
+            for row in range(band * self.band_rows, (band + 1) * self.band_rows):
+                # Multiply-shift hashing, one function per MinHash value
+                hashes = (shingles * self._hash_multipliers[row] + self._hash_offsets[row]) >> np.uint64(32)
+                keys[:, band] = keys[:, band] * self.BAND_KEY_PRIME ^ np.minimum.reduceat(hashes, starts)
+        
+        return shingle_rows[starts], keys
+        
+    def _bucket_pairs(self, keys: np.ndarray, rows: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Pair records sharing a key, each with at most max_bucket_size - 1 following records."""
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+        
+        same = keys[1:] == keys[:-1]
+        bucketed = np.zeros(len(keys), dtype=bool)
+        bucketed[1:] |= same
+        bucketed[:-1] |= same
+        keys, rows = keys[bucketed], rows[bucketed]
+        
+        pairs = []
+        for distance in range(1, self.max_bucket_size):
+            match = keys[distance:] == keys[:-distance]
+            if not match.any():
+                break
+            pairs.append((rows[:-distance][match], rows[distance:][match]))
+        
+        return pairs
+        
+    def _score_pairs(self, normalized: Dict[str, np.ndarray], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Calculate the weighted field similarity of candidate pairs.
+        
+        Fields missing in both records do not count. Fields are scored from
+        the highest weight down, and pairs that cannot reach the threshold any
+        more are not scored on the remaining fields.
+        """
+        similarity_fn = SIMILARITY_FUNCTIONS[self.similarity]
+        fields = sorted(normalized, key=lambda field: -self.field_weights.get(field, 1.0))
+        remaining_weight = sum(self.field_weights.get(field, 1.0) for field in fields)
+        
+        score = np.zeros(len(left))
+        total_weight = np.zeros(len(left))
+        active = np.arange(len(left))
+        
+        for field in fields:
+            weight = self.field_weights.get(field, 1.0)
+            values1 = normalized[field][left[active]]
+            values2 = normalized[field][right[active]]
+            
+            present = (values1 != '') | (values2 != '')
+            similarity = (values1 == values2).astype(float)
+            compare = np.flatnonzero((similarity < 1.0) & (values1 != '') & (values2 != ''))
+            similarity[compare] = [similarity_fn(value1, value2)
+                                   for value1, value2 in zip(values1[compare], values2[compare])]
+            
+            score[active] += weight * similarity * present
+            total_weight[active] += weight * present
+            remaining_weight -= weight
+            
+            if remaining_weight > 0:
+                # Best case: every remaining field matches exactly
+                best = (score[active] + remaining_weight) / (total_weight[active] + remaining_weight)
+                active = active[best >= self.similarity_threshold]
+        
+        result = np.zeros(len(left))
+        result[active] = np.divide(score[active], total_weight[active],
+                                   out=np.zeros(len(active)), where=total_weight[active] > 0)
+        return result
@@ -3,8 +3,13 @@ Main Validation Engine
 Unified interface for multi-stage data validation with configurable rules and scoring.
 """
 
+import os
 import logging
 import json
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 import pandas as pd
@@ -15,6 +20,8 @@ from enum import Enum
 from syntax_validator import SyntaxValidator, ValidationLevel
 from consistency_checker import ConsistencyChecker, ConsistencyLevel, ConsistencyViolation
 from anomaly_detector import AnomalyDetector, AnomalyScore
+from duplicate_detector import DuplicateDetector
+from streaming import ColumnSketch, ExactDuplicateCounter, IssueSink, RecordSample, read_chunks
 
 
 class ValidationStage(Enum):
@@ -86,83 +93,6 @@ class ValidationResult:
         return {**data, **{"validation_summary": self.validation_summary}}
 
 
-class DuplicateDetector:
-    """Duplicate detection using multiple methods."""
-    
-    def __init__(self, similarity_threshold: float = 0.85):
-        self.similarity_threshold = similarity_threshold
-        
-    def detect_exact_duplicates(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Detect exact duplicates."""
-        duplicate_mask = data.duplicated(keep='first')
-        duplicate_indices = data.index[duplicate_mask].tolist()
-        
-        return {
-            'type': 'exact_duplicates',
-            'count': len(duplicate_indices),
-            'indices': duplicate_indices,
-            'percentage': len(duplicate_indices) / len(data) * 100,
-            'severity': 'high' if len(duplicate_indices) / len(data) > 0.1 else 'medium'
-        }
-        
-    def detect_near_duplicates(self, data: pd.DataFrame, fields: List[str]) -> Dict[str, Any]:
-        """Detect near duplicates using fuzzy matching."""
-        # Simple implementation - in practice, use libraries like fuzzywuzzy
-        near_duplicates = []
-        
-        for i in range(len(data)):
-            for j in range(i + 1, len(data)):
-                similarity = self._calculate_similarity(data.iloc[i], data.iloc[j], fields)
-                if similarity >= self.similarity_threshold:
-                    near_duplicates.append({
-                        'index1': i,
-                        'index2': j,
-                        'similarity': similarity
-                    })
-                    
-        return {
-            'type': 'near_duplicates',
-            'count': len(near_duplicates),
-            'pairs': near_duplicates,
-            'percentage': len(near_duplicates) / (len(data) * (len(data) - 1) / 2) * 100,
-            'severity': 'medium' if len(near_duplicates) > 0 else 'low'
-        }
-        
-    def _calculate_similarity(self, row1: pd.Series, row2: pd.Series, fields: List[str]) -> float:
-        """Calculate similarity between two rows."""
-        if not fields:
-            return 0.0
-            
-        similarities = []
-        
-        for field in fields:
-            if field in row1.index and field in row2.index:
-                val1, val2 = str(row1[field]), str(row2[field])
-                if val1 == val2:
-                    similarities.append(1.0)
-                elif val1.lower() == val2.lower():
-                    similarities.append(0.8)
-                else:
-                    # Simple character-based similarity
-                    similarity = self._character_similarity(val1, val2)
-                    similarities.append(similarity)
-                    
-        return np.mean(similarities) if similarities else 0.0
-        
-    def _character_similarity(self, str1: str, str2: str) -> float:
-        """Calculate character-based similarity."""
-        if not str1 or not str2:
-            return 0.0
-            
-        # Simple Levenshtein-like distance
-        max_len = max(len(str1), len(str2))
-        if max_len == 0:
-            return 1.0
-            
-        matches = sum(1 for c1, c2 in zip(str1, str2) if c1 == c2)
-        return matches / max_len
-
-
 class DataQualityScorer:
     """Calculate overall data quality scores."""
     
@@ -239,6 +169,11 @@ class DataQualityScorer:
         return max(0.0, min(1.0, score))
 
 
+# Summary statistics that are averages over records (all others are counts)
+AVERAGED_SUMMARY_STATS = ('average_quality_score', 'completeness', 'validity', 'consistency',
+                          'uniqueness', 'anomaly_score')
+
+
 class ValidationEngine:
     """Main validation engine orchestrator."""
     
@@ -247,7 +182,6 @@ class ValidationEngine:
         self.syntax_validator = SyntaxValidator()
         self.consistency_checker = ConsistencyChecker()
         self.anomaly_detector = AnomalyDetector()
-        self.duplicate_detector = DuplicateDetector()
         self.quality_scorer = DataQualityScorer()
         
         self.rules = []
@@ -260,6 +194,11 @@ class ValidationEngine:
         # Load default configuration
         self._load_default_config()
         
+        self.duplicate_detector = DuplicateDetector(
+            similarity_threshold=self.config['thresholds']['duplicate_threshold'],
+            **self.config['duplicates']
+        )
+        
     def _load_default_config(self):
         """Load default validation configuration."""
         default_config = {
@@ -283,6 +222,11 @@ class ValidationEngine:
                 'anomaly_score': 0.8,
                 'duplicate_threshold': 0.85,
                 'quality_threshold': 0.7
+            },
+            'duplicates': {
+                'field_weights': {},
+                'similarity': 'jaro_winkler',
+                'blocking_fields': []
             }
         }
         
@@ -301,17 +245,24 @@ class ValidationEngine:
         """Add field type mapping."""
         self.field_types[field] = field_type
         
-    def add_reference_data(self, name: str, data: Union[pd.DataFrame, List, Dict], key_field: str = None):
-        """Add reference dataset."""
+    def add_reference_data(self, name: str, data: Union[pd.DataFrame, List, Dict], key_field: str = None,
+                           case_sensitive: bool = True, strip_whitespace: bool = False):
+        """Add reference dataset (values of key_field are indexed once for lookups)."""
         if isinstance(data, (list, dict)):
             data = pd.DataFrame(data)
         self.reference_datasets[name] = {'data': data, 'key_field': key_field}
-        self.consistency_checker.add_reference_data(name, data, key_field)
+        self.consistency_checker.add_reference_data(name, data, key_field, case_sensitive, strip_whitespace)
+        
+    def add_reference_index(self, name: str, path: str, field: Optional[str] = None):
+        """Add a reference index saved with ReferenceIndex.save, memory-mapped and shared across processes."""
+        self.reference_datasets[name] = {'path': path, 'key_field': field}
+        self.consistency_checker.add_reference_index(name, path, field)
         
-    def add_business_rule(self, rule_func, rule_name: str, level: ConsistencyLevel = ConsistencyLevel.MEDIUM):
-        """Add business rule."""
-        self.business_rules.append((rule_func, rule_name, level))
-        self.consistency_checker.add_business_rule(rule_func, rule_name, level)
+    def add_business_rule(self, rule_func, rule_name: str, level: ConsistencyLevel = ConsistencyLevel.MEDIUM,
+                          columnar: bool = False):
+        """Add business rule (columnar rules take a DataFrame and return a boolean Series)."""
+        self.business_rules.append((rule_func, rule_name, level, columnar))
+        self.consistency_checker.add_business_rule(rule_func, rule_name, level, columnar)
         
     def validate_single_record(self, record: Dict[str, Any], record_id: Optional[str] = None) -> ValidationResult:
         """Validate a single record."""
@@ -453,11 +404,45 @@ class ValidationEngine:
             timestamp=timestamp
         )
         
-    def validate_dataset(self, data: Union[pd.DataFrame, List[Dict]], batch_size: int = 1000) -> Dict[str, Any]:
-        """Validate entire dataset."""
+    def validate_dataset(self, data: Union[pd.DataFrame, List[Dict]], batch_size: int = 1000,
+                         columnar: bool = False, workers: Optional[int] = 1,
+                         shard_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Validate entire dataset.
+        
+        With columnar=True the stages run column by column instead of record
+        by record, and the results hold the issues of failing cells ('issues')
+        instead of a full result per record ('records').
+        
+        With workers > 1 (None for one per CPU core) the dataset is split into
+        shards of shard_size records that are validated in a process pool; the
+        dataset-level stages still run once over the whole dataset. Workers
+        are forked where the platform supports it and inherit the engine as
+        is. Elsewhere (Windows) the engine is pickled to each worker, so
+        rules must be picklable (module-level functions, no lambdas or
+        closures); if it cannot be pickled, validation runs in-process with
+        a warning.
+        """
         if isinstance(data, list):
             data = pd.DataFrame(data)
             
+        if workers is None:
+            workers = os.cpu_count() or 1
+            
+        if workers > 1 and len(data) > 0:
+            dataset_results = self._validate_dataset_sharded(data, batch_size, columnar, workers, shard_size)
+        elif columnar:
+            dataset_results = self._validate_dataset_columnar(data)
+        else:
+            dataset_results = self._validate_dataset_records(data, batch_size)
+            
+        # Add dataset-level results
+        self._add_dataset_level_results(dataset_results, data)
+            
+        return dataset_results
+        
+    def _validate_dataset_records(self, data: pd.DataFrame, batch_size: int) -> Dict[str, Any]:
+        """Validate dataset record by record."""
         timestamp = datetime.now()
         results = []
         summary_stats = {
@@ -499,20 +484,266 @@ class ValidationEngine:
             summary_stats['average_quality_score'] /= len(results)
             
         # Overall dataset validation results
-        dataset_results = {
+        return {
             'records': [r.to_dict() for r in results],
             'summary': summary_stats,
             'timestamp': timestamp.isoformat()
         }
         
-        # Add dataset-level results
+    def _validate_dataset_sharded(self, data: pd.DataFrame, batch_size: int, columnar: bool,
+                                  workers: int, shard_size: Optional[int]) -> Dict[str, Any]:
+        """Validate dataset shards in a process pool and merge their results in order."""
+        timestamp = datetime.now()
+        
+        if not shard_size:
+            # A few shards per worker keep the pool busy when shards finish unevenly
+            shard_size = -(-len(data) // (workers * 4))
+        shards = [data.iloc[i:i+shard_size] for i in range(0, len(data), shard_size)]
+        
+        # Forked workers inherit the engine from the parent, so nothing is
+        # shipped and rules need not be picklable
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            # Spawned workers receive the engine (rules, field types, reference
+            # data) pickled through initargs, once per worker
+            try:
+                pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                self.logger.warning(f"Validation engine cannot be pickled for worker processes ({e}); "
+                                    f"validating in-process")
+                if columnar:
+                    return self._validate_dataset_columnar(data)
+                return self._validate_dataset_records(data, batch_size)
+                
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=context,
+                                 initializer=_init_shard_worker, initargs=(self,)) as executor:
+            shard_results = list(executor.map(_validate_shard, shards, repeat(batch_size), repeat(columnar)))
+            
+        key = 'issues' if columnar else 'records'
+        return {
+            key: [item for result in shard_results for item in result[key]],
+            'summary': self.merge_summaries([result['summary'] for result in shard_results]),
+            'timestamp': timestamp.isoformat()
+        }
+        
+    @staticmethod
+    def merge_summaries(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge the summary statistics of disjoint parts of a dataset.
+        
+        Counts are added and averages are weighted by each part's record
+        count, so merging is associative and parts can be merged in any grouping.
+        """
+        merged = {}
+        total_records = sum(summary['total_records'] for summary in summaries)
+        
+        for summary in summaries:
+            for key, value in summary.items():
+                if isinstance(value, dict):
+                    counts = merged.setdefault(key, {})
+                    for name, count in value.items():
+                        counts[name] = counts.get(name, 0) + count
+                elif key in AVERAGED_SUMMARY_STATS:
+                    merged[key] = merged.get(key, 0.0) + value * summary['total_records']
+                else:
+                    merged[key] = merged.get(key, 0) + value
+                    
+        for key in AVERAGED_SUMMARY_STATS:
+            if key in merged:
+                merged[key] = merged[key] / total_records if total_records else 0.0
+                
+        return merged
+        
+    def _validate_dataset_columnar(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Validate dataset column by column and score records from column aggregates."""
+        timestamp = datetime.now()
+        stages = self.config['validation_stages']
+        n_records = len(data)
+        
+        # (rule_name, stage, severity, field, message, suggestion, confidence, row positions)
+        issue_groups = []
+        
+        # Stage 1: Syntax Validation
+        typed_fields = [field for field in self.field_types if field in data.columns]
+        validity = np.ones(n_records)
+        if stages['syntax']['enabled'] and typed_fields:
+            invalid_fields = np.zeros(n_records)
+            for field in typed_fields:
+                column_result = self.syntax_validator.validate_column(data[field], self.field_types[field])
+                invalid_fields += column_result.invalid_mask
+                
+                for message, positions in column_result.errors.items():
+                    issue_groups.append((f"syntax_validation_{field}", ValidationStage.SYNTAX, "high",
+                                         field, message, None, 1.0, positions))
+                for message, positions in column_result.warnings.items():
+                    issue_groups.append((f"syntax_validation_{field}", ValidationStage.SYNTAX, "medium",
+                                         field, message, None, 0.8, positions))
+                    
+            validity = 1.0 - invalid_fields / len(typed_fields)
+            
+        # Stage 2: Consistency Validation
+        consistency = np.ones(n_records)
+        if stages['consistency']['enabled']:
+            violation_counts = np.zeros(n_records)
+            for violation in self.consistency_checker.validate_columns(data):
+                violation_counts += np.bincount(violation.positions, minlength=n_records)
+                issue_groups.append((f"consistency_{violation.level.value}", ValidationStage.CONSISTENCY,
+                                     violation.level.value, ",".join(violation.affected_fields),
+                                     violation.message, violation.suggestion, 0.9, violation.positions))
+            consistency = np.clip(1.0 - violation_counts * 0.1, 0.0, 1.0)
+            
+        # Record-level anomaly and duplicate stages find nothing without dataset
+        # context (see validate_single_record), so they score 1.0
+        uniqueness = np.ones(n_records)
+        anomaly_score = np.ones(n_records)
+        
+        completeness = data.notna().sum(axis=1).to_numpy() / data.shape[1] if data.shape[1] else np.zeros(n_records)
+        weights = self.config['scoring']['weights']
+        quality_score = np.clip(
+            weights['completeness'] * completeness +
+            weights['validity'] * validity +
+            weights['consistency'] * consistency +
+            weights['uniqueness'] * uniqueness +
+            weights['anomaly_score'] * anomaly_score,
+            0.0, 1.0
+        )
+        
+        is_valid = np.ones(n_records, dtype=bool)
+        for group in issue_groups:
+            if group[2] == 'high':
+                is_valid[group[7]] = False
+                
+        summary_stats = {
+            'total_records': n_records,
+            'valid_records': int(is_valid.sum()),
+            'invalid_records': int(n_records - is_valid.sum()),
+            'average_quality_score': float(quality_score.mean()) if n_records else 0.0,
+            'total_issues': 0,
+            'issues_by_stage': {stage.value: 0 for stage in ValidationStage},
+            'issues_by_severity': {'high': 0, 'medium': 0, 'low': 0},
+            'completeness': float(completeness.mean()) if n_records else 0.0,
+            'validity': float(validity.mean()) if n_records else 1.0,
+            'consistency': float(consistency.mean()) if n_records else 1.0,
+            'uniqueness': 1.0,
+            'anomaly_score': 1.0
+        }
+        
+        # Emit issues only for failing cells
+        record_ids = data.index.astype(str).to_numpy()
+        timestamp_str = timestamp.isoformat()
+        issues = []
+        
+        for rule_name, stage, severity, field, message, suggestion, confidence, positions in issue_groups:
+            summary_stats['total_issues'] += len(positions)
+            summary_stats['issues_by_stage'][stage.value] += len(positions)
+            summary_stats['issues_by_severity'][severity] = (
+                summary_stats['issues_by_severity'].get(severity, 0) + len(positions)
+            )
+            
+            issues.extend(
+                {
+                    'rule_name': rule_name,
+                    'stage': stage.value,
+                    'severity': severity,
+                    'field': field,
+                    'message': message,
+                    'suggestion': suggestion,
+                    'confidence': confidence,
+                    'timestamp': timestamp_str,
+                    'record_id': record_id,
+                    'record_valid': record_valid,
+                    'record_quality_score': record_quality_score
+                }
+                for record_id, record_valid, record_quality_score in zip(
+                    record_ids[positions].tolist(), is_valid[positions].tolist(), quality_score[positions].tolist()
+                )
+            )
+            
+        return {
+            'issues': issues,
+            'summary': summary_stats,
+            'timestamp': timestamp_str
+        }
+        
+    def validate_file(self, input_path: str, issues_path: str, input_format: Optional[str] = None,
+                      issues_format: Optional[str] = None, chunk_size: int = 100000, columnar: bool = True,
+                      batch_size: int = 1000, sample_size: int = 10000, expected_records: int = 10000000,
+                      **read_kwargs) -> Dict[str, Any]:
+        """
+        Validate a CSV, JSONL or Parquet file chunk by chunk in bounded memory.
+        
+        Issues are written to issues_path (JSONL, CSV or Parquet) as each chunk
+        is validated, and the results hold only the merged summary and the
+        dataset-level state: exact duplicates are counted with a Bloom filter
+        sized for expected_records, columns are tracked with running sketches,
+        and dataset anomalies are detected on a uniform sample of sample_size
+        records. Near duplicates need the whole dataset and are not detected.
+        Record ids are row numbers in the file.
+        """
+        timestamp = datetime.now()
+        stages = self.config['validation_stages']
+        
+        summary = None
+        duplicate_counter = ExactDuplicateCounter(expected_records)
+        column_sketches = {}
+        sample = RecordSample(sample_size)
+        offset = 0
+        
+        with IssueSink(issues_path, issues_format) as sink:
+            for chunk in read_chunks(input_path, input_format, chunk_size, **read_kwargs):
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                
+                if columnar:
+                    chunk_results = self._validate_dataset_columnar(chunk)
+                else:
+                    chunk_results = self._validate_dataset_records(chunk, batch_size)
+                    
+                sink.write(self._collect_issues(chunk_results))
+                summary = chunk_results['summary'] if summary is None else \
+                    self.merge_summaries([summary, chunk_results['summary']])
+                
+                for column in chunk.columns:
+                    column_sketches.setdefault(column, ColumnSketch()).update(chunk[column])
+                if stages['duplicate']['enabled']:
+                    duplicate_counter.add(chunk)
+                if stages['anomaly']['enabled']:
+                    sample.add(chunk)
+                    
+            issues_written = sink.count
+            
+        if summary is None:
+            # An empty file gets the summary keys of the mode the chunks would have used
+            empty = pd.DataFrame()
+            summary = (self._validate_dataset_columnar(empty) if columnar
+                       else self._validate_dataset_records(empty, batch_size))['summary']
+            
+        results = {
+            'summary': summary,
+            'issues_path': issues_path,
+            'issues_written': issues_written,
+            'column_statistics': {column: sketch.to_dict() for column, sketch in column_sketches.items()},
+            'timestamp': timestamp.isoformat()
+        }
+        
+        if stages['anomaly']['enabled'] and sample.records is not None:
+            results['dataset_anomalies'] = self.anomaly_detector.detect_dataset_anomalies(sample.records)
+            results['dataset_anomalies']['sample_size'] = len(sample.records)
+            
+        if stages['duplicate']['enabled'] and offset:
+            results['duplicates'] = {'exact_duplicates': duplicate_counter.to_dict()}
+            
+        return results
+        
+    def _add_dataset_level_results(self, dataset_results: Dict[str, Any], data: pd.DataFrame):
+        """Add dataset-level anomaly and duplicate results."""
         if self.config['validation_stages']['anomaly']['enabled']:
             dataset_results['dataset_anomalies'] = self.anomaly_detector.detect_dataset_anomalies(data)
             
         if self.config['validation_stages']['duplicate']['enabled']:
             dataset_results['duplicates'] = self._detect_dataset_duplicates(data)
-            
-        return dataset_results
         
     def _detect_record_anomalies(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Detect anomalies for a single record."""
@@ -539,6 +770,21 @@ class ValidationEngine:
                 
         return results
         
+    def _collect_issues(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Flatten dataset results into one entry per issue with its record's id, validity and score."""
+        # Columnar results already hold one entry per failing cell
+        issues_data = list(results.get('issues', []))
+        
+        for record_result in results.get('records', []):
+            for issue in record_result['issues']:
+                issue_data = issue.copy()
+                issue_data['record_id'] = record_result['record_id']
+                issue_data['record_valid'] = record_result['is_valid']
+                issue_data['record_quality_score'] = record_result['quality_score']
+                issues_data.append(issue_data)
+                
+        return issues_data
+        
     def generate_report(self, results: Dict[str, Any], output_format: str = 'json') -> str:
         """Generate validation report."""
         if output_format.lower() == 'json':
@@ -573,16 +819,8 @@ Quality Dimensions:
             
     def export_issues(self, results: Dict[str, Any], file_path: str, format: str = 'csv'):
         """Export validation issues to file."""
-        issues_data = []
+        issues_data = self._collect_issues(results)
         
-        for record_result in results['records']:
-            for issue in record_result['issues']:
-                issue_data = issue.copy()
-                issue_data['record_id'] = record_result['record_id']
-                issue_data['record_valid'] = record_result['is_valid']
-                issue_data['record_quality_score'] = record_result['quality_score']
-                issues_data.append(issue_data)
-                
         if format.lower() == 'csv':
             df = pd.DataFrame(issues_data)
             df.to_csv(file_path, index=False)
@@ -593,6 +831,23 @@ Quality Dimensions:
             raise ValueError(f"Unsupported export format: {format}")
 
 
+# Engine of a sharded validation worker process, installed once per worker
+_shard_engine = None
+
+
+def _init_shard_worker(engine: ValidationEngine):
+    """Install the engine used by this worker process."""
+    global _shard_engine
+    _shard_engine = engine
+
+
+def _validate_shard(shard: pd.DataFrame, batch_size: int, columnar: bool) -> Dict[str, Any]:
+    """Validate one shard without the dataset-level stages."""
+    if columnar:
+        return _shard_engine._validate_dataset_columnar(shard)
+    return _shard_engine._validate_dataset_records(shard, batch_size)
+
+
 # Example usage and demonstration
 def demo_validation_engine():
     """Demonstration of validation engine usage."""
@@ -0,0 +1,358 @@
+"""
+Streaming Validation Module
+Building blocks for validating files larger than memory: chunked CSV, JSONL
+and Parquet readers, incremental issue sinks, and bounded-memory sketches that
+stand in for the dataset-level stages (a Bloom filter counting exact duplicate
+records, HyperLogLog distinct counts, running column moments and a uniform
+record sample).
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+
+# Optional Parquet support
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+
+SUPPORTED_FORMATS = ('csv', 'jsonl', 'parquet')
+FORMAT_ALIASES = {'ndjson': 'jsonl', 'json': 'jsonl', 'pq': 'parquet'}
+
+# Columns of a flattened issue, as produced by ValidationEngine.export_issues
+ISSUE_COLUMNS = [
+    'rule_name', 'stage', 'severity', 'field', 'message', 'suggestion', 'confidence',
+    'timestamp', 'record_id', 'record_valid', 'record_quality_score'
+]
+
+# Stands in for missing values in stable_strings, whatever the chunk's missing marker
+# (a Unicode noncharacter; NUL would hash like '' since pandas factorizes C strings)
+MISSING_MARKER = '\uffff'
+
+
+def resolve_format(path: str, file_format: Optional[str] = None) -> str:
+    """Resolve a file format from an explicit name or the file extension."""
+    file_format = (file_format or os.path.splitext(path)[1].lstrip('.')).lower()
+    file_format = FORMAT_ALIASES.get(file_format, file_format)
+    
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format: {file_format}")
+    if file_format == 'parquet' and not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet files")
+    return file_format
+
+
+def read_chunks(path: str, file_format: Optional[str] = None, chunk_size: int = 100000,
+                **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV, JSONL or Parquet file in chunks of at most chunk_size records.
+    
+    Extra keyword arguments are passed to the pandas reader (CSV, JSONL).
+    Chunk dtypes are inferred per chunk unless given (e.g. dtype=...).
+    """
+    file_format = resolve_format(path, file_format)
+    
+    if file_format == 'csv':
+        with pd.read_csv(path, chunksize=chunk_size, **read_kwargs) as reader:
+            yield from reader
+    elif file_format == 'jsonl':
+        with pd.read_json(path, lines=True, chunksize=chunk_size, **read_kwargs) as reader:
+            yield from reader
+    else:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def splitmix64(values: np.ndarray) -> np.ndarray:
+    """Mix 64-bit hashes into a second, independent-looking 64-bit hash."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def stable_strings(values: pd.Series) -> pd.Series:
+    """
+    Render a column chunk as strings that do not depend on its inferred dtype.
+    
+    Chunks of one column can be inferred differently: an integer column
+    becomes float64 in a chunk with missing values, so 1 reads as 1.0.
+    Integral floats are written as integers and missing values (NaN, None)
+    as one marker, so equal values get equal strings in every chunk.
+    """
+    text = values.map(str).to_numpy(dtype=object)
+    
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            integral = np.isfinite(numbers) & (numbers == np.floor(numbers)) & (np.abs(numbers) < 2 ** 63)
+        text[integral] = [str(number) for number in numbers[integral].astype(np.int64).tolist()]
+    
+    text[values.isna().to_numpy()] = MISSING_MARKER
+    return pd.Series(text, index=values.index, dtype=object)
+
+
+class IssueSink:
+    """Append flattened issues to a JSONL, CSV or Parquet file."""
+    
+    def __init__(self, path: str, file_format: Optional[str] = None):
+        self.path = path
+        self.format = resolve_format(path, file_format)
+        self.count = 0
+        
+        self._file = None
+        self._writer = None
+        
+        if self.format == 'parquet':
+            self._schema = pa.schema([
+                ('rule_name', pa.string()), ('stage', pa.string()), ('severity', pa.string()),
+                ('field', pa.string()), ('message', pa.string()), ('suggestion', pa.string()),
+                ('confidence', pa.float64()), ('timestamp', pa.string()), ('record_id', pa.string()),
+                ('record_valid', pa.bool_()), ('record_quality_score', pa.float64())
+            ])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, 'w', newline='' if self.format == 'csv' else None)
+            if self.format == 'csv':
+                pd.DataFrame(columns=ISSUE_COLUMNS).to_csv(self._file, index=False)
+        
+    def write(self, issues: List[Dict[str, Any]]):
+        """Append a batch of issues."""
+        if not issues:
+            return
+        
+        if self.format == 'jsonl':
+            self._file.write(''.join(json.dumps(issue, default=str) + '\n' for issue in issues))
+        elif self.format == 'csv':
+            pd.DataFrame(issues, columns=ISSUE_COLUMNS).to_csv(self._file, header=False, index=False)
+        else:
+            frame = pd.DataFrame(issues, columns=ISSUE_COLUMNS)
+            self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        
+        self.count += len(issues)
+        
+    def close(self):
+        """Flush and close the output file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ExactDuplicateCounter:
+    """
+    Count records whose values were already seen, using a Bloom filter.
+    
+    Memory is fixed by expected_records and false_positive_rate; beyond
+    expected_records the false positive rate grows. Expected false positives
+    are subtracted from the reported count.
+    """
+    
+    def __init__(self, expected_records: int = 10000000, false_positive_rate: float = 0.001):
+        expected_records = max(1, expected_records)
+        self.num_bits = int(np.ceil(-expected_records * np.log(false_positive_rate) / np.log(2) ** 2))
+        self.num_hashes = max(1, int(round(self.num_bits / expected_records * np.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        
+        self.bits_set = 0
+        
+        self.records = 0
+        self.flagged = 0
+        self.expected_false_positives = 0.0
+        
+    def add(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Add a chunk of records and return the mask of records seen before.
+        
+        Records are hashed from stable_strings forms, so a duplicate is found
+        even when its chunk inferred different column dtypes.
+        """
+        normalized = data.apply(stable_strings) if len(data.columns) else data
+        hashes = pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+        steps = splitmix64(hashes) | np.uint64(1)
+        
+        # Double hashing: bit i of a record is (h1 + i * h2) mod num_bits
+        positions = (hashes[:, None] + np.arange(self.num_hashes, dtype=np.uint64) * steps[:, None]) \
+            % np.uint64(self.num_bits)
+        
+        # Check the whole chunk before inserting it, so records repeated within
+        # the chunk are found by exact hash instead
+        fill_ratio = self.bits_set / self.num_bits
+        seen = self._is_set(positions).all(axis=1)
+        seen |= pd.Series(hashes).duplicated().to_numpy()
+        
+        new_positions = np.unique(positions)
+        new_positions = new_positions[~self._is_set(new_positions)]
+        np.bitwise_or.at(self.bits, (new_positions >> np.uint64(3)).astype(np.intp), self._bit_masks(new_positions))
+        self.bits_set += len(new_positions)
+        
+        self.records += len(data)
+        self.flagged += int(seen.sum())
+        # New records were reported as seen with the filter's false positive rate
+        false_positive_rate = fill_ratio ** self.num_hashes
+        self.expected_false_positives += (len(data) - seen.sum()) * false_positive_rate / (1 - false_positive_rate)
+        return seen
+        
+    def _bit_masks(self, positions: np.ndarray) -> np.ndarray:
+        """Masks selecting each bit position within its byte."""
+        return np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        
+    def _is_set(self, positions: np.ndarray) -> np.ndarray:
+        """Whether each bit position is set."""
+        return (self.bits[(positions >> np.uint64(3)).astype(np.intp)] & self._bit_masks(positions)) != 0
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize like DuplicateDetector.detect_exact_duplicates."""
+        count = max(0, int(round(self.flagged - self.expected_false_positives)))
+        percentage = count / self.records * 100 if self.records else 0.0
+        
+        return {
+            'type': 'exact_duplicates',
+            'count': count,
+            'percentage': percentage,
+            'severity': 'high' if percentage > 10 else 'medium',
+            'approximate': True,
+            'flagged_records': self.flagged
+        }
+
+
+class HyperLogLog:
+    """HyperLogLog sketch estimating the number of distinct 64-bit hashes."""
+    
+    def __init__(self, precision: int = 12):
+        if not 11 <= precision <= 18:
+            raise ValueError("precision must be between 11 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        
+    def add(self, hashes: np.ndarray):
+        """Add a batch of 64-bit hashes."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        remaining_bits = 64 - self.precision
+        
+        buckets = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Position of the leftmost set bit (at most 53 bits, so exact as float)
+        ranks = remaining_bits + 1 - np.frexp(rest.astype(np.float64))[1]
+        
+        np.maximum.at(self.registers, buckets, ranks.astype(np.uint8))
+        
+    def merge(self, other: 'HyperLogLog'):
+        """Merge another sketch of the same precision."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        
+    def count(self) -> float:
+        """Estimate the number of distinct hashes added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        
+        # Linear counting is more accurate for small cardinalities
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class ColumnSketch:
+    """Running statistics of one column: nulls, distinct values and numeric moments."""
+    
+    def __init__(self, distinct_precision: int = 12):
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog(distinct_precision)
+        
+        self.numeric_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        
+    def update(self, values: pd.Series):
+        """Add a chunk of the column."""
+        non_null = values.dropna()
+        self.count += len(values)
+        self.nulls += len(values) - len(non_null)
+        
+        if len(non_null) == 0:
+            return
+        
+        # Hash stable string forms so values keep their hash when chunk dtypes differ
+        self.distinct.add(pd.util.hash_pandas_object(stable_strings(non_null), index=False).to_numpy())
+        
+        if pd.api.types.is_numeric_dtype(non_null):
+            chunk = non_null.to_numpy(dtype=np.float64)
+            chunk_mean = chunk.mean()
+            total = self.numeric_count + len(chunk)
+            
+            # Chan et al. pairwise update of mean and sum of squared deviations
+            delta = chunk_mean - self.mean
+            self.m2 += ((chunk - chunk_mean) ** 2).sum() + delta ** 2 * self.numeric_count * len(chunk) / total
+            self.mean += delta * len(chunk) / total
+            self.numeric_count = total
+            
+            self.min = chunk.min() if self.min is None else min(self.min, chunk.min())
+            self.max = chunk.max() if self.max is None else max(self.max, chunk.max())
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        stats = {
+            'count': self.count,
+            'nulls': self.nulls,
+            'distinct_estimate': int(round(self.distinct.count()))
+        }
+        
+        if self.numeric_count:
+            stats.update({
+                'mean': float(self.mean),
+                'std': float(np.sqrt(self.m2 / (self.numeric_count - 1))) if self.numeric_count > 1 else 0.0,
+                'min': float(self.min),
+                'max': float(self.max)
+            })
+        
+        return stats
+
+
+class RecordSample:
+    """Uniform random sample of a stream of records (the records with the smallest random keys)."""
+    
+    def __init__(self, size: int = 10000, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.records = None
+        self.keys = np.empty(0)
+        
+    def add(self, data: pd.DataFrame):
+        """Offer a chunk of records to the sample."""
+        if self.size <= 0:
+            return
+        
+        keys = self.rng.random(len(data))
+        if self.records is not None:
+            data = pd.concat([self.records, data])
+            keys = np.concatenate([self.keys, keys])
+        
+        if len(keys) > self.size:
+            # Keep the smallest keys, in stream order
+            keep = np.sort(np.argpartition(keys, self.size - 1)[:self.size])
+            data = data.iloc[keep]
+            keys = keys[keep]
+        
+        self.records = data
+        self.keys = keys
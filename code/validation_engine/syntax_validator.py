@@ -6,8 +6,11 @@ Handles validation of common data formats including email, phone, date, and cust
 import re
 import logging
 from typing import Dict, List, Tuple, Optional, Any
+from collections import defaultdict
 from datetime import datetime
 from enum import Enum
+import numpy as np
+import pandas as pd
 
 # Optional imports for enhanced functionality
 try:
@@ -61,6 +64,51 @@ class SyntaxValidationResult:
         }
 
 
+class ColumnValidationResult:
+    """Result of syntax validation of a column, holding the row positions of failing cells."""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._errors = defaultdict(list)
+        self._warnings = defaultdict(list)
+        
+    def add_error(self, message: str, positions: np.ndarray):
+        """Add error for cells at the given row positions."""
+        if len(positions):
+            self._errors[message].append(np.asarray(positions, dtype=np.int64))
+            
+    def add_warning(self, message: str, positions: np.ndarray):
+        """Add warning for cells at the given row positions."""
+        if len(positions):
+            self._warnings[message].append(np.asarray(positions, dtype=np.int64))
+            
+    @property
+    def errors(self) -> Dict[str, np.ndarray]:
+        """Row positions per error message."""
+        return {message: np.concatenate(parts) for message, parts in self._errors.items()}
+        
+    @property
+    def warnings(self) -> Dict[str, np.ndarray]:
+        """Row positions per warning message."""
+        return {message: np.concatenate(parts) for message, parts in self._warnings.items()}
+        
+    @property
+    def invalid_mask(self) -> np.ndarray:
+        """Boolean mask of cells with at least one error."""
+        mask = np.zeros(self.size, dtype=bool)
+        for positions in self.errors.values():
+            mask[positions] = True
+        return mask
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary of counts."""
+        return {
+            'invalid_count': int(self.invalid_mask.sum()),
+            'errors': {message: len(positions) for message, positions in self.errors.items()},
+            'warnings': {message: len(positions) for message, positions in self.warnings.items()}
+        }
+
+
 class EmailValidator:
     """Email format validator."""
     
@@ -181,8 +229,7 @@ class PhoneValidator:
             if not re.match(r'^\+?[1-9]\d{1,14}$', clean_phone):
                 result.add_error(
                     "Invalid phone number format",
-                    "Phone numbers should contain only digits and optional + sign, 2-15 digits total",
-                    "Use format: +1234567890"
+                    "Phone numbers should contain only digits and optional + sign, 2-15 digits total"
                 )
                 
             if len(clean_phone) < 7:
@@ -331,6 +378,94 @@ class SyntaxValidator:
             
         return result
         
+    def validate_column(self, values: pd.Series, field_type: str, **kwargs) -> ColumnValidationResult:
+        """
+        Validate a whole column based on its type.
+        
+        Cells get the same errors and warnings as from validate_field. Email,
+        phone and date cells passing vectorized checks are accepted directly;
+        each remaining distinct value goes through validate_field once.
+        """
+        values = values.reset_index(drop=True)
+        result = ColumnValidationResult(len(values))
+        field_type = field_type.lower()
+        
+        # Like validate_field, only None and "" count as empty
+        missing = values.isna()
+        empty = values.eq('')
+        if missing.any():
+            empty[missing] |= values[missing].map(lambda value: value is None)
+        result.add_warning("Empty value provided", np.flatnonzero(empty))
+        
+        values = values[~empty]
+        
+        if field_type not in ('email', 'phone', 'date', 'datetime') and field_type not in self.custom_validators:
+            # Generic string validation
+            types = values.map(type)
+            for value_type in types.unique():
+                if value_type is not str:
+                    result.add_error(f"Expected string, got {value_type.__name__}",
+                                     types.index[types == value_type].to_numpy())
+            return result
+            
+        raw = values.map(str)
+        strings = raw.str.strip()
+        
+        if field_type == 'email':
+            accepted = self._accepted_emails(strings)
+        elif field_type == 'phone' and not PHONENUMBERS_AVAILABLE:
+            accepted = self._accepted_phones(strings)
+        elif field_type in ('date', 'datetime'):
+            accepted = self._accepted_dates(strings, kwargs.get('formats'))
+        else:
+            accepted = pd.Series(False, index=strings.index)
+            
+        remaining = raw[~accepted]
+        for value, positions in remaining.groupby(remaining, sort=False).indices.items():
+            cell_result = self.validate_field(value, field_type, **kwargs)
+            rows = remaining.index[positions].to_numpy()
+            for error in cell_result.errors:
+                result.add_error(error, rows)
+            for warning in cell_result.warnings:
+                result.add_warning(warning, rows)
+                
+        return result
+        
+    def _accepted_emails(self, emails: pd.Series) -> pd.Series:
+        """Mask of emails without any error or warning from EmailValidator."""
+        emails = emails.str.lower()
+        return (
+            emails.str.match(EmailValidator.EMAIL_PATTERN.pattern)
+            & (emails.str.len() <= 254)
+            & ~emails.str.startswith('.')
+            & ~emails.str.endswith('.')
+            & ~emails.str.contains('..', regex=False)
+            # The pattern allows a single '@', so this is the username length
+            & (emails.str.find('@') <= 64)
+        )
+        
+    def _accepted_phones(self, phones: pd.Series) -> pd.Series:
+        """Mask of phones without any error or warning from the PhoneValidator fallback."""
+        clean_phones = phones.str.replace(r'[^\d+]', '', regex=True)
+        return clean_phones.str.match(r'^\+?[1-9]\d{1,14}$') & (clean_phones.str.len() >= 7)
+        
+    def _accepted_dates(self, dates: pd.Series, formats: List[str] = None) -> pd.Series:
+        """Mask of dates without any error or warning from DateValidator."""
+        years = pd.Series(np.nan, index=dates.index)
+        pending = dates
+        
+        for fmt in formats or DateValidator.DATE_FORMATS:
+            if pending.empty:
+                break
+            parsed = pd.to_datetime(pending, format=fmt, errors='coerce')
+            parsed_mask = parsed.notna()
+            years[parsed.index[parsed_mask]] = parsed[parsed_mask].dt.year.to_numpy()
+            pending = pending[~parsed_mask]
+            
+        in_range = years.between(DateValidator.DATE_RANGE['min_year'], DateValidator.DATE_RANGE['max_year'])
+        century_issue = (years < 2000) & dates.str.contains('20', regex=False)
+        return in_range & ~century_issue
+        
     def validate_dataset(self, data: Dict[str, Any], field_types: Dict[str, str]) -> Dict[str, SyntaxValidationResult]:
         """Validate entire dataset."""
         results = {}
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Test script for the Validation Engine
+Checks that the fast paths agree with the paths they replace.
+"""
+
+import sys
+import os
+import json
+import multiprocessing
+import tempfile
+from collections import Counter
+from typing import Any, Dict, List
+
+# Add the package to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy as np
+    import pandas as pd
+    from main import ValidationEngine
+    from consistency_checker import ConsistencyLevel, ReferenceIndex
+    from duplicate_detector import DuplicateDetector
+except ImportError as e:
+    raise ImportError(f"{e}. Please install required dependencies: pip install -r requirements.txt") from e
+
+
+# Issue fields compared between modes (timestamps differ by construction)
+ISSUE_KEY_FIELDS = ('record_id', 'rule_name', 'stage', 'severity', 'field', 'message')
+
+
+def age_in_range(df: pd.DataFrame):
+    """Columnar business rule: ages must be between 0 and 120."""
+    return df['age'].between(0, 120), "Age must be between 0 and 120"
+
+
+def broken_rule(df: pd.DataFrame):
+    """Columnar business rule that always raises."""
+    return df['no_such_column'] > 0
+
+
+def make_engine(dataset_stages: bool = False) -> ValidationEngine:
+    """Build an engine with typed fields and columnar rules, one of which raises."""
+    engine = ValidationEngine({'validation_stages': {'anomaly': {'enabled': dataset_stages},
+                                                     'duplicate': {'enabled': dataset_stages}}})
+    engine.add_field_type('email', 'email')
+    engine.add_field_type('phone', 'phone')
+    engine.add_field_type('signup_date', 'date')
+    engine.add_business_rule(age_in_range, "age_validation", ConsistencyLevel.HIGH, columnar=True)
+    engine.add_business_rule(broken_rule, "broken_rule", ConsistencyLevel.LOW, columnar=True)
+    return engine
+
+
+def make_mixed_records() -> pd.DataFrame:
+    """Small frame with missing, non-string and out-of-range cells."""
+    return pd.DataFrame({
+        'email': ['ann@example.com', 'not-an-email', None, 42, 'bob@example.org', np.nan],
+        'phone': ['+12025550143', '12-ab', np.nan, 2025550143, '', '+442071838750'],
+        'signup_date': ['2023-01-15', '2023-13-45', None, 20230115, '1899-12-31', '2024-02-30'],
+        'age': [34, -1, np.nan, 150, 45.5, 0],
+        'country': ['US', 'UK', None, 7, 'DE', 'FR']
+    })
+
+
+def make_form_records() -> pd.DataFrame:
+    """
+    Frame whose columns keep one type in every chunk of a file, with repeated records.
+    
+    Rows 3, 13 and 23 are identical and have no id, so the id column reads
+    as float64 in their chunks and as int64 elsewhere.
+    """
+    base = pd.DataFrame({
+        'email': ['ann@example.com', 'not-an-email', 'cy@example.net', None, 'dee@example.com',
+                  'ed@', 'fay@example.org', 'gus@example.com', '', 'hal@example.com'],
+        'phone': ['+12025550143', '12-ab', '+442071838750', None, '+12025550188',
+                  '+12025550101', 'call me', '+12025550111', '+12025550122', '+12025550133'],
+        'signup_date': ['2023-01-15', '2023-13-45', '2022-06-01', None, '2021-11-30',
+                        '2020-02-29', '2023-02-30', '2019-07-04', '2018-01-01', '2017-05-05'],
+        'age': [34, -1, 52, np.nan, 150, 28, 61, 19, 45, 33]
+    })
+    data = pd.concat([base] * 3, ignore_index=True)
+    data.insert(0, 'id', np.arange(len(data), dtype=float))
+    data.loc[data.index % 10 == 3, 'id'] = np.nan
+    return data
+
+
+def issue_keys(issues: List[Dict[str, Any]]) -> Counter:
+    """Multiset of the compared fields of flattened issues."""
+    return Counter(tuple(str(issue[field]) for field in ISSUE_KEY_FIELDS) for issue in issues)
+
+
+def same_summary(expected: Dict[str, Any], actual: Dict[str, Any]) -> bool:
+    """Compare the summary statistics both modes report, allowing float noise in averages."""
+    return all(
+        np.isclose(value, actual[key]) if isinstance(value, float) else value == actual[key]
+        for key, value in expected.items()
+    )
+
+
+class ValidationEngineTester:
+    """Test suite for validation engine components."""
+    
+    def __init__(self):
+        self.test_results = []
+        
+    def check(self, test: str, name: str, passed: bool, detail: str = ""):
+        """Record and print one check."""
+        print(f"  {'✓' if passed else '✗'} {name}{f': {detail}' if detail else ''}")
+        self.test_results.append({'test': test, 'check': name, 'detail': detail, 'success': bool(passed)})
+        
+    def test_columnar_parity(self):
+        """Columnar and record validation must report the same summary and issues."""
+        print("Testing Columnar vs Record Validation")
+        print("-" * 30)
+        
+        data = make_mixed_records()
+        engine = make_engine()
+        
+        try:
+            records = engine.validate_dataset(data, columnar=False)
+            columnar = engine.validate_dataset(data, columnar=True)
+            
+            record_issues = issue_keys(engine._collect_issues(records))
+            columnar_issues = issue_keys(engine._collect_issues(columnar))
+            
+            self.check('columnar_parity', "summary", same_summary(records['summary'], columnar['summary']),
+                       f"{records['summary']['total_issues']} issues, "
+                       f"{records['summary']['invalid_records']} invalid records")
+            self.check('columnar_parity', "issues", record_issues == columnar_issues,
+                       f"{sum((record_issues - columnar_issues).values())} only in record mode, "
+                       f"{sum((columnar_issues - record_issues).values())} only in columnar mode")
+            self.check('columnar_parity', "raising rule reported for every record",
+                       sum(1 for key in columnar_issues.elements() if "Error evaluating rule 'broken_rule'" in key[5])
+                       == len(data))
+            
+            scores = {record['record_id']: record['quality_score'] for record in records['records']}
+            columnar_scores = {issue['record_id']: issue['record_quality_score'] for issue in columnar['issues']}
+            self.check('columnar_parity', "record quality scores",
+                       all(np.isclose(scores[record_id], score) for record_id, score in columnar_scores.items()))
+        
+        except Exception as e:
+            self.check('columnar_parity', "validate_dataset", False, str(e))
+        
+        print()
+        
+    def test_near_duplicate_recall(self):
+        """Near-duplicate detection must find injected one-character edits at any shingle size."""
+        print("Testing Near-Duplicate Recall")
+        print("-" * 30)
+        
+        rng = np.random.default_rng(0)
+        letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+        
+        def word():
+            return ''.join(rng.choice(letters, rng.integers(4, 10)))
+        
+        records = [f"{word()} {word()} {word()} {rng.integers(1, 999)} {word()} street" for _ in range(2000)]
+        injected = set()
+        for position in range(200):
+            edited = list(records[position])
+            edited[rng.integers(len(edited))] = rng.choice(letters)
+            records.append(''.join(edited))
+            injected.add((position, len(records) - 1))
+        data = pd.DataFrame({'address': records})
+        
+        for shingle_size in (3, 4, 5):
+            try:
+                result = DuplicateDetector(shingle_size=shingle_size).detect_near_duplicates(data, ['address'])
+                found = {(pair['index1'], pair['index2']) for pair in result['pairs']}
+                recall = len(found & injected) / len(injected)
+                self.check('near_duplicate_recall', f"shingle_size={shingle_size}", recall >= 0.95,
+                           f"recall {recall:.3f}, {result['candidate_pairs']} candidate pairs")
+            except Exception as e:
+                self.check('near_duplicate_recall', f"shingle_size={shingle_size}", False, str(e))
+        
+        try:
+            DuplicateDetector(shingle_size=0)
+            self.check('near_duplicate_recall', "shingle_size=0 rejected", False)
+        except ValueError:
+            self.check('near_duplicate_recall', "shingle_size=0 rejected", True)
+        
+        print()
+        
+    def test_sharded_parity(self):
+        """Sharded validation must match in-process validation, with and without fork."""
+        print("Testing Sharded Validation")
+        print("-" * 30)
+        
+        data = pd.concat([make_mixed_records()] * 8, ignore_index=True)
+        engine = make_engine()
+        expected = engine.validate_dataset(data, columnar=True)
+        expected_issues = issue_keys(engine._collect_issues(expected))
+        
+        def check_sharded(name: str, sharded_engine: ValidationEngine):
+            try:
+                result = sharded_engine.validate_dataset(data, columnar=True, workers=2, shard_size=10)
+                self.check('sharded_parity', f"{name} summary", same_summary(expected['summary'], result['summary']))
+                self.check('sharded_parity', f"{name} issues",
+                           issue_keys(sharded_engine._collect_issues(result)) == expected_issues)
+            except Exception as e:
+                self.check('sharded_parity', name, False, str(e))
+                
+        check_sharded("forked workers", engine)
+        
+        # Without fork the engine is pickled to the workers, or validated
+        # in-process when a rule cannot be pickled
+        get_all_start_methods = multiprocessing.get_all_start_methods
+        multiprocessing.get_all_start_methods = lambda: ['spawn']
+        try:
+            check_sharded("pickled engine", engine)
+            
+            unpicklable = make_engine()
+            unpicklable.add_business_rule(lambda df: df['age'].notna(), "age_present", ConsistencyLevel.LOW,
+                                          columnar=True)
+            expected = unpicklable.validate_dataset(data, columnar=True)
+            expected_issues = issue_keys(unpicklable._collect_issues(expected))
+            check_sharded("unpicklable rule falls back in-process", unpicklable)
+        finally:
+            multiprocessing.get_all_start_methods = get_all_start_methods
+        
+        print()
+        
+    def test_issue_sink_roundtrip(self):
+        """Issues streamed to JSONL and CSV must match in-memory validation and read back intact."""
+        print("Testing Streamed Issue Files")
+        print("-" * 30)
+        
+        data = make_form_records()
+        engine = make_engine(dataset_stages=True)
+        # Phone numbers like '+12025550143' would otherwise be read as integers in some chunks
+        text_columns = {'email': str, 'phone': str, 'signup_date': str}
+        expected_duplicates = int(data.duplicated().sum())
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for input_format in ('csv', 'jsonl'):
+                input_path = os.path.join(directory, f"records.{input_format}")
+                if input_format == 'csv':
+                    data.to_csv(input_path, index=False)
+                    read_kwargs = {'dtype': text_columns}
+                    whole = pd.read_csv(input_path, **read_kwargs)
+                else:
+                    data.to_json(input_path, orient='records', lines=True)
+                    read_kwargs = {}
+                    whole = pd.read_json(input_path, lines=True)
+                expected = issue_keys(engine._collect_issues(engine.validate_dataset(whole, columnar=True)))
+                
+                for issues_format in ('jsonl', 'csv'):
+                    name = f"{input_format} -> {issues_format}"
+                    issues_path = os.path.join(directory, f"issues.{issues_format}")
+                    try:
+                        result = engine.validate_file(input_path, issues_path, chunk_size=7, **read_kwargs)
+                        
+                        if issues_format == 'jsonl':
+                            with open(issues_path) as f:
+                                written = [json.loads(line) for line in f]
+                        else:
+                            written = pd.read_csv(issues_path, dtype=str, keep_default_na=False).to_dict('records')
+                        
+                        self.check('issue_sink_roundtrip', f"{name} issues", issue_keys(written) == expected,
+                                   f"{len(written)} written, {sum(expected.values())} expected")
+                        self.check('issue_sink_roundtrip', f"{name} count", result['issues_written'] == len(written))
+                        
+                        duplicates = result['duplicates']['exact_duplicates']['flagged_records']
+                        self.check('issue_sink_roundtrip', f"{name} exact duplicates across chunks",
+                                   duplicates == expected_duplicates,
+                                   f"{duplicates} flagged, {expected_duplicates} expected")
+                    except Exception as e:
+                        self.check('issue_sink_roundtrip', name, False, str(e))
+            
+            empty_path = os.path.join(directory, "empty.jsonl")
+            open(empty_path, 'w').close()
+            try:
+                summary = engine.validate_file(empty_path, os.path.join(directory, "empty_issues.jsonl"))['summary']
+                self.check('issue_sink_roundtrip', "empty file summary has quality dimensions",
+                           summary['total_records'] == 0 and 'completeness' in summary)
+            except Exception as e:
+                self.check('issue_sink_roundtrip', "empty file", False, str(e))
+        
+        print()
+        
+    def test_reference_index(self):
+        """In-memory and memory-mapped reference indexes must agree, including normalization."""
+        print("Testing Reference Index Lookups")
+        print("-" * 30)
+        
+        reference = pd.Series(['SKU-001', ' sku-002 ', 'Sku-003', None, 'SKU-004'], name='sku')
+        values = pd.Series(['sku-001', 'SKU-002', '  SKU-003', 'SKU-005', 'sku-004 ', 'SKU 001', 4])
+        expected = {
+            (True, False): [False, False, False, False, False, False, False],
+            (False, False): [True, False, False, False, False, False, False],
+            (True, True): [False, False, False, False, False, False, False],
+            (False, True): [True, True, True, False, True, False, False]
+        }
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for (case_sensitive, strip_whitespace), truth in expected.items():
+                name = f"case_sensitive={case_sensitive}, strip_whitespace={strip_whitespace}"
+                try:
+                    in_memory = ReferenceIndex(reference, case_sensitive, strip_whitespace)
+                    path = os.path.join(directory, f"sku_{case_sensitive}_{strip_whitespace}.npy")
+                    in_memory.save(path)
+                    mapped = ReferenceIndex.load(path)
+                    
+                    memory_result = in_memory.isin(values).tolist()
+                    mapped_result = mapped.isin(values).tolist()
+                    self.check('reference_index', name, memory_result == mapped_result == truth,
+                               f"memory {memory_result}, mmap {mapped_result}")
+                except Exception as e:
+                    self.check('reference_index', name, False, str(e))
+            
+            exact = ReferenceIndex(reference)
+            self.check('reference_index', "exact match without normalization",
+                       exact.isin(pd.Series(['SKU-001', ' sku-002 ', 'sku-002'])).tolist() == [True, True, False])
+        
+        print()
+        
+    def run_all_tests(self) -> bool:
+        """Run all tests and print the summary."""
+        print("Validation Engine Test Suite")
+        print("=" * 60 + "\n")
+        
+        self.test_columnar_parity()
+        self.test_near_duplicate_recall()
+        self.test_sharded_parity()
+        self.test_issue_sink_roundtrip()
+        self.test_reference_index()
+        
+        return self.print_summary()
+        
+    def print_summary(self) -> bool:
+        """Print test results summary."""
+        print("=" * 60)
+        print("TEST SUMMARY")
+        print("=" * 60)
+        
+        total_checks = len(self.test_results)
+        failed = [result for result in self.test_results if not result['success']]
+        
+        print(f"Total checks: {total_checks}")
+        print(f"Successful: {total_checks - len(failed)}")
+        print(f"Failed: {len(failed)}")
+        for result in failed:
+            print(f"  ✗ {result['test']}: {result['check']} {result['detail']}")
+        
+        print("=" * 60)
+        return not failed
+
+
+def main():
+    """Main test function."""
+    tester = ValidationEngineTester()
+    sys.exit(0 if tester.run_all_tests() else 1)
+
+
+if __name__ == "__main__":
+    main()